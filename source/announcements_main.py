@@ -1,8 +1,9 @@
 import os
+import asyncio
 from dotenv import load_dotenv
 from datetime import datetime, timedelta, timezone
 import pytz  # pip install pytz
-# from source.news_to_discord import gpt_news
+# from source.news_to_discord import gpt_news, harvest_news_daily
 from source.popo_bot_event_alerts import event_alerts
 from source.popo_bot_conference_date_alerts import conference_alerts
 from source.monday_alerts_end import monday_alerts_end
@@ -24,12 +25,15 @@ today_is_monday = today_et.weekday() == 0
 # today_is_monday = True
 
 # ------- Run ------
+# popo_bot runs the same sequence as its "announcements" scheduled job (CRON_ANNOUNCEMENTS)
+# when started with RUN_SCHEDULED_JOBS=1; drop this script from cron before turning that on.
 def main():
     # Run individual scripts
+    # harvest_news_daily()  # daily; feeds the Monday digest windows
     # gpt_news(today_is_monday, DISCORD_WEBHOOK_NEWS)
     event_alerts(today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS, DISCORD_WEBHOOK_GENERAL_EVENT)
-    conference_alerts(today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS)
-    monday_alerts_end(today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS)
+    asyncio.run(conference_alerts(today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS))
+    asyncio.run(monday_alerts_end(today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,159 @@
+"""
+In-process metrics for popo_bot, served in Prometheus text format.
+
+    METRICS_PORT=9108 python -m source.popo_bot
+    curl http://127.0.0.1:9108/metrics
+
+Counters and histograms are plain dict updates (no locks; everything runs on
+the bot's event loop), and gauges are callables evaluated only when scraped,
+so leaving collection on costs next to nothing.
+"""
+
+import math
+import time
+import logging
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, Tuple
+from aiohttp import web
+
+PREFIX = "popo_"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _labels(labels: dict) -> Tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: Tuple, extra: Tuple = ()) -> str:
+    items = labels + extra
+    if not items:
+        return ""
+    body = ",".join(f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+                    for k, v in items)
+    return "{" + body + "}"
+
+
+class Metrics:
+
+    def __init__(self, prefix: str = PREFIX):
+        self.prefix = prefix
+        self.help: Dict[str, Tuple[str, str]] = {}              # name -> (type, help)
+        self.counters = defaultdict(float)                       # (name, labels) -> value
+        self.histograms = {}                                     # (name, labels) -> [bucket counts, sum, count]
+        self.buckets: Dict[str, Tuple[float, ...]] = {}
+        self.gauges: Dict[str, Callable] = {}                    # name -> fn() -> value or {labels dict tuple: value}
+
+    # ---- registration ----
+    def counter(self, name: str, help: str):
+        self.help[name] = ("counter", help)
+
+    def histogram(self, name: str, help: str, buckets=DEFAULT_BUCKETS):
+        self.help[name] = ("histogram", help)
+        self.buckets[name] = tuple(buckets)
+
+    def gauge(self, name: str, help: str, fn: Callable):
+        """fn() returns a number, or a dict {(("label", value), ...): number} for labelled series."""
+        self.help[name] = ("gauge", help)
+        self.gauges[name] = fn
+
+    # ---- recording ----
+    def inc(self, name: str, amount: float = 1.0, **labels):
+        self.counters[(name, _labels(labels))] += amount
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _labels(labels))
+        entry = self.histograms.get(key)
+        if entry is None:
+            entry = self.histograms[key] = [[0] * len(self.buckets[name]), 0.0, 0]
+        i = bisect_left(self.buckets[name], value)
+        if i < len(entry[0]):
+            entry[0][i] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    # ---- exposition ----
+    def render(self) -> str:
+        lines = []
+        by_name = defaultdict(list)
+        for (name, labels), value in self.counters.items():
+            by_name[name].append((labels, value))
+        hist_by_name = defaultdict(list)
+        for (name, labels), entry in self.histograms.items():
+            hist_by_name[name].append((labels, entry))
+
+        for name, (kind, help) in self.help.items():
+            full = self.prefix + name
+            lines.append(f"# HELP {full} {help}")
+            lines.append(f"# TYPE {full} {kind}")
+            if kind == "counter":
+                for labels, value in by_name.get(name, []):
+                    lines.append(f"{full}{_format_labels(labels)} {value:g}")
+            elif kind == "histogram":
+                for labels, (counts, total, count) in hist_by_name.get(name, []):
+                    cumulative = 0
+                    for bound, n in zip(self.buckets[name], counts):
+                        cumulative += n
+                        lines.append(f"{full}_bucket{_format_labels(labels, (('le', f'{bound:g}'),))} {cumulative}")
+                    lines.append(f"{full}_bucket{_format_labels(labels, (('le', '+Inf'),))} {count}")
+                    lines.append(f"{full}_sum{_format_labels(labels)} {total:.6f}")
+                    lines.append(f"{full}_count{_format_labels(labels)} {count}")
+            else:
+                try:
+                    value = self.gauges[name]()
+                except Exception:
+                    continue
+                series = value.items() if isinstance(value, dict) else [((), value)]
+                for labels, v in series:
+                    if v is None or (isinstance(v, float) and math.isnan(v)):
+                        continue
+                    lines.append(f"{full}{_format_labels(tuple(labels))} {float(v):g}")
+        return "\n".join(lines) + "\n"
+
+
+class RateLimitLogCounter(logging.Handler):
+    """Counts discord.py's "We are being rate limited" warnings (it retries 429s internally)."""
+
+    def __init__(self, metrics: Metrics):
+        super().__init__(level=logging.WARNING)
+        self.metrics = metrics
+
+    def emit(self, record):
+        message = record.getMessage().lower()
+        if "rate limit" in message:
+            self.metrics.inc("rate_limit_hits_total", scope="global" if "global" in message else "route")
+
+
+def instrument_http(http, metrics: Metrics):
+    """Wrap discord.py's HTTPClient.request to count and time every REST call by route."""
+    original = http.request
+
+    async def request(route, **kwargs):
+        t0 = time.perf_counter()
+        name = f"{route.method} {route.path}"
+        try:
+            result = await original(route, **kwargs)
+            metrics.inc("rest_requests_total", route=name, outcome="ok")
+            return result
+        except Exception as e:
+            metrics.inc("rest_requests_total", route=name, outcome=str(getattr(e, "status", "error")))
+            raise
+        finally:
+            metrics.observe("rest_request_seconds", time.perf_counter() - t0, route=name)
+
+    http.request = request
+    logging.getLogger("discord.http").addHandler(RateLimitLogCounter(metrics))
+
+
+async def start_metrics_server(metrics: Metrics, port: int, host: str = "127.0.0.1"):
+    async def handle(request):
+        return web.Response(text=metrics.render(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    print(f"📈 Metrics on http://{host}:{port}/metrics")
+    return runner
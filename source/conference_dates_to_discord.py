@@ -1,5 +1,4 @@
 
-import difflib
 import time
 import json
 import requests
@@ -7,21 +6,72 @@ from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from datetime import datetime
 from dateutil import parser as dateparser
-from openai import OpenAI
-import glob
+from source import llm_gateway
+from source.snapshot_store import SnapshotStore
+from source.conference_store import ConferenceStore, conference_key
+from source.conference_extractor import extract_conference_fields
+from source.conference_format import split_message
 import os
-from dateutil.relativedelta import relativedelta
 import re
-from typing import List, Tuple
+import threading
+import urllib.parse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 
 
 # ---- Config ----
 load_dotenv()
 SNAPSHOT_DIR = "conference_url_snapshots"
-os.makedirs(SNAPSHOT_DIR, exist_ok=True)
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+snapshots = SnapshotStore(SNAPSHOT_DIR)
+conference_store = ConferenceStore()
+OPENAI_MODEL = "gpt-5-nano"
+GPT_MAX_CONCURRENCY = int(os.getenv("GPT_MAX_CONCURRENCY", llm_gateway.LLM_MAX_CONCURRENCY))  # conferences sent to GPT at once
 DISCORD_WEBHOOK_CONFERENCE_UPDATES = os.getenv("DISCORD_WEBHOOK_CONFERENCE_UPDATES")
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 " +
+                  "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
+}
+CRAWL_MAX_WORKERS = 16     # pages fetched at once overall
+CRAWL_PER_DOMAIN = 2       # pages fetched at once per domain
+CRAWL_DOMAIN_DELAY = 1.0   # seconds between request starts on the same domain
+
+# ---- Adaptive polling ----
+POLL_SCHEDULE_FILE = os.path.join(SNAPSHOT_DIR, "poll_schedule.json")
+POLL_MIN_DAYS = 1          # never poll a URL more often than this
+POLL_MAX_DAYS = 56         # ...or less often than this
+POLL_URGENCY_SHARE = 0.25  # poll at least 4 times in the time left before a deadline/start date
+POLL_UNKNOWN_MAX_DAYS = 7  # no future date known (e.g. an edition just ended): next one may be announced any time
+POLL_ALL = os.getenv("POLL_ALL") == "1"  # fetch every URL regardless of schedule
+
+# ---- Negative-result cache for dead (mostly next-year) URLs ----
+PROBE_CACHE_FILE = os.path.join(SNAPSHOT_DIR, "probe_cache.json")
+PROBE_TTL = 14             # days a 404 / redirect-to-homepage result is trusted
+DEAD_STATUS = (404, 410)
+
+# ---- Date / location context extraction ----
+CONTEXT_LINES = 2          # lines kept above and below each hit
+MAX_LINE_CHARS = 300       # long paragraphs are clipped
+MAX_CANDIDATE_CHARS = 6000 # cap on snippet text sent to GPT per conference
+RULE_MIN_CONFIDENCE = float(os.getenv("RULE_MIN_CONFIDENCE", "0.75"))  # below this, ask GPT
+
+_MONTHS = (r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|"
+           r"sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?")
+DATE_PATTERN = re.compile(
+    r"\b(?:"
+    r"\d{4}-\d{1,2}-\d{1,2}"                            # 2026-04-08
+    r"|\d{1,2}[/.]\d{1,2}[/.]\d{2,4}"                    # 4/8/2026, 08.04.2026
+    r"|" + _MONTHS + r"\s+\d{1,2}(?:st|nd|rd|th)?\b"     # April 8, Apr 8th
+    r"|\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?" + _MONTHS + r"\b"  # 8 April
+    r"|" + _MONTHS + r",?\s+\d{4}"                        # April 2026
+    r")",
+    re.IGNORECASE,
+)
+KEYWORD_PATTERN = re.compile(
+    r"\b(?:deadline|due|submission|submit|call for|proposals?|abstracts?|registration|"
+    r"venue|location|held (?:in|at)|hotel|convention cent(?:er|re)|university|campus|virtual|online)\b",
+    re.IGNORECASE,
+)
 
 
 def parse_date_safe(date_str):
@@ -55,39 +105,20 @@ def clean_past_dates(conference):
 
 def call_gpt(current_info, system_prompt, prompt):
     """Ask GPT to validate if candidate dates are relevant and update JSON."""
-    max_retries = 3
-    for attempt in range(1, max_retries + 1):
-        try:
-            resp = client.chat.completions.create(
-                model="gpt-5-nano",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                service_tier="flex",
-                # temperature=0
-            )
-            break  # success → exit loop
-        except Exception as e:
-            print(f"Attempt {attempt} failed: {e}")
-            if attempt < max_retries:
-                time.sleep(5)
-            else:
-                print("⚠️ GPT response error:", e)
-                return current_info
     try:
-        updated_json = json.loads(resp.choices[0].message.content)
+        content = llm_gateway.complete(
+            "conference_dates", OPENAI_MODEL, system_prompt, prompt, api="chat"
+        )
+    except Exception as e:
+        print("⚠️ GPT response error:", e)
+        return current_info
+    try:
+        updated_json = json.loads(content)
         return updated_json
     except Exception as e:
         print("⚠️ GPT response parse error:", e)
         return current_info
 
-def load_snapshot(filepath: str) -> str:
-    if os.path.exists(filepath):
-        with open(filepath, "r", encoding="utf-8") as f:
-            return f.read()
-    return None
-
 def expand_urls_years(urls, previous_year):
     """Expand URLs with {YEAR} placeholders."""
     expanded = []
@@ -108,15 +139,294 @@ def expand_urls_years(urls, previous_year):
     return years, expanded
 
 
-def scrape_and_update(conference):
+def find_dates_with_context(text, seen=None):
+    """
+    Return small snippets of `text` around lines mentioning dates, deadlines or venues.
+    Snippets already in `seen` (e.g. from another URL of the same conference) are skipped.
+    """
+    seen = set() if seen is None else seen
+    lines = [line[:MAX_LINE_CHARS] for line in text.splitlines() if line.strip()]
+    hits = [i for i, line in enumerate(lines) if DATE_PATTERN.search(line) or KEYWORD_PATTERN.search(line)]
+
+    # Merge overlapping windows around hits into ranges
+    ranges = []
+    for i in hits:
+        lo, hi = max(0, i - CONTEXT_LINES), min(len(lines), i + CONTEXT_LINES + 1)
+        if ranges and lo <= ranges[-1][1]:
+            ranges[-1][1] = max(ranges[-1][1], hi)
+        else:
+            ranges.append([lo, hi])
+
+    snippets = []
+    for lo, hi in ranges:
+        snippet = "\n".join(lines[lo:hi])
+        key = re.sub(r"\s+", " ", snippet.lower())
+        if key in seen:
+            continue
+        seen.add(key)
+        snippets.append(snippet)
+    return snippets
+
+
+def cap_candidates(snippets, max_chars=MAX_CANDIDATE_CHARS):
+    """Keep snippets in order until the total size reaches max_chars."""
+    kept, total = [], 0
+    for snippet in snippets:
+        if total + len(snippet) > max_chars:
+            remaining = max_chars - total
+            if remaining > 200:
+                kept.append(snippet[:remaining])
+            break
+        kept.append(snippet)
+        total += len(snippet)
+    return kept
+
+
+class DeadPage(Exception):
+    """The URL 404s or redirects to the site's homepage (e.g. next year's page not live yet)."""
+
+
+def is_homepage_redirect(url, final_url):
+    """True if a URL with a real path was redirected to the bare homepage."""
+    wanted = urllib.parse.urlsplit(url).path.strip("/")
+    landed = urllib.parse.urlsplit(final_url).path.strip("/")
+    # A page served directly at /index.html or /home is not a redirect
+    return bool(wanted) and landed != wanted and landed in ("", "index.html", "index.php", "home")
+
+
+def check_dead(url, resp):
+    if resp.status_code in DEAD_STATUS:
+        raise DeadPage(f"{resp.status_code} for {url}")
+    if resp.history and is_homepage_redirect(url, resp.url):
+        raise DeadPage(f"{url} redirects to homepage {resp.url}")
+
+
+def fetch_page_text(url):
+    """GET a page and return its visible text (newlines kept for formatting)."""
+    resp = requests.get(url, headers=HEADERS, timeout=15)
+    check_dead(url, resp)
+    resp.raise_for_status()
+    soup = BeautifulSoup(resp.text, "html.parser")
+    return soup.get_text("\n", strip=True)
+
+
+def probe_url(url):
+    """Cheap liveness check: HEAD, or a 1-byte range GET if the server rejects HEAD. Raises DeadPage."""
+    resp = requests.head(url, headers=HEADERS, allow_redirects=True, timeout=10)
+    if resp.status_code in (403, 405, 501):
+        resp = requests.get(url, headers={**HEADERS, "Range": "bytes=0-0"}, allow_redirects=True,
+                            timeout=10, stream=True)
+        resp.close()
+    check_dead(url, resp)
+
+
+class ProbeCache:
+    """Remembers dead URLs for PROBE_TTL days, so they are not fetched again until they may be live."""
+
+    def __init__(self, path=PROBE_CACHE_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.state = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=1, sort_keys=True)
+
+    def known_dead(self, url):
+        """'fresh' if a dead result is still within TTL, 'stale' if it expired, None if unknown."""
+        entry = self.state.get(url)
+        if not entry:
+            return None
+        age_days = (datetime.now() - datetime.fromisoformat(entry["checked"])).total_seconds() / 86400
+        return "fresh" if age_days < PROBE_TTL else "stale"
+
+    def mark_dead(self, url, reason):
+        with self.lock:
+            self.state[url] = {"reason": str(reason), "checked": datetime.now().isoformat(timespec="seconds")}
+
+    def mark_alive(self, url):
+        with self.lock:
+            self.state.pop(url, None)
+
+
+probe_cache = ProbeCache()
+
+
+class DomainThrottle:
+    """Per-domain concurrency limit plus a minimum delay between request starts."""
+
+    def __init__(self, per_domain=CRAWL_PER_DOMAIN, delay=CRAWL_DOMAIN_DELAY):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.slots = defaultdict(lambda: threading.BoundedSemaphore(per_domain))
+        self.next_start = defaultdict(float)
+
+    def run(self, url, fn):
+        domain = urllib.parse.urlsplit(url).hostname or ""
+        with self.lock:
+            slot = self.slots[domain]
+        with slot:
+            with self.lock:
+                now = time.monotonic()
+                start_at = max(now, self.next_start[domain])
+                self.next_start[domain] = start_at + self.delay
+            time.sleep(start_at - now)
+            return fn(url)
+
+
+def snapshot_key(conference, url):
+    return conference.get("abbreviation", []) + "_" + re.sub(r'\W+', '_', url)
+
+
+def days_to_next_date(conference, today=None):
+    """Days until the nearest future submission_deadline or start_date (None if neither is known)."""
+    today = today or datetime.today().date()
+    days = []
+    for field in ("submission_deadline", "start_date"):
+        try:
+            d = datetime.strptime(conference.get(field, ""), "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            continue
+        if d >= today:
+            days.append((d - today).days)
+    return min(days) if days else None
+
+
+class PollScheduler:
+    """
+    Per-URL polling interval: doubles after every unchanged check (bounded by what the
+    snapshot history says about how often the page really changes), resets on change,
+    and shrinks as the conference's next deadline or start date approaches. With no
+    future date known, it stays at most POLL_UNKNOWN_MAX_DAYS.
+    """
+
+    def __init__(self, path=POLL_SCHEDULE_FILE, store=None):
+        self.path = path
+        self.store = store or snapshots
+        self.state = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=1, sort_keys=True)
+
+    def learned_max_days(self, key):
+        """Half the mean time between observed changes, clamped to [POLL_MIN_DAYS, POLL_MAX_DAYS]."""
+        history = self.store.history(key)
+        if len(history) < 2:
+            return POLL_MAX_DAYS
+        span_days = (history[-1][1] - history[0][1]).total_seconds() / 86400
+        mean_change_days = span_days / (len(history) - 1)
+        return min(POLL_MAX_DAYS, max(POLL_MIN_DAYS, mean_change_days / 2))
+
+    def interval_days(self, key, conference):
+        entry = self.state.get(key, {})
+        interval = min(entry.get("backoff_days", POLL_MIN_DAYS), self.learned_max_days(key))
+        days_left = days_to_next_date(conference)
+        if days_left is None:
+            interval = min(interval, POLL_UNKNOWN_MAX_DAYS)
+        else:
+            interval = min(interval, max(POLL_MIN_DAYS, days_left * POLL_URGENCY_SHARE))
+        return interval
+
+    def is_due(self, key, conference, now=None):
+        if POLL_ALL or key not in self.state:
+            return True
+        now = now or datetime.now()
+        last = datetime.fromisoformat(self.state[key]["last_checked"])
+        # Small slack so a weekly cron does not miss a 7-day interval by a few minutes
+        return (now - last).total_seconds() / 86400 >= self.interval_days(key, conference) - 0.1
+
+    def record(self, key, changed, now=None):
+        now = now or datetime.now()
+        entry = self.state.setdefault(key, {"backoff_days": POLL_MIN_DAYS})
+        if changed:
+            entry["backoff_days"] = POLL_MIN_DAYS
+        else:
+            entry["backoff_days"] = min(POLL_MAX_DAYS, entry["backoff_days"] * 2)
+        entry["last_checked"] = now.isoformat(timespec="seconds")
+
+
+poll_scheduler = PollScheduler()
+
+
+def crawl_conference_pages(data):
+    """
+    Fetch every due expanded search URL of every conference up front, concurrently.
+    Returns {url: (text, error)}; text and error are both None for known-dead URLs.
+    URLs that are not due are left out.
+    """
+    urls = []
+    future_urls = set()  # future-year {YEAR}/{YR} expansions: probed before a full fetch
+    current_year = datetime.today().year
+    skipped = 0
+    for conferences in data.values():
+        for conference in conferences:
+            years, expanded = expand_urls_years(conference.get("search_urls", []), int(conference.get("previous_year", [])))
+            for y in years:
+                if y > current_year:
+                    future_urls.update(
+                        u.replace("{YEAR}", str(y)).replace("{YR}", str(y)[-2:])
+                        for u in conference.get("search_urls", [])
+                        if "{YEAR}" in u or "{YR}" in u
+                    )
+            for url in expanded:
+                if poll_scheduler.is_due(snapshot_key(conference, url), conference):
+                    urls.append(url)
+                else:
+                    skipped += 1
+    urls = list(dict.fromkeys(urls))  # dedupe, keep order
+    print(f"📅 {len(urls)} URL(s) due, {skipped} not due yet")
+
+    throttle = DomainThrottle()
+
+    def fetch(url):
+        dead = probe_cache.known_dead(url)
+        if dead == "fresh":
+            return url, (None, None)
+        try:
+            if dead == "stale" or url in future_urls:
+                throttle.run(url, probe_url)
+            text = throttle.run(url, fetch_page_text)
+            probe_cache.mark_alive(url)
+            return url, (text, None)
+        except DeadPage as e:
+            probe_cache.mark_dead(url, e)
+            return url, (None, None)
+        except Exception as e:
+            return url, (None, e)
+
+    t0 = time.time()
+    with ThreadPoolExecutor(max_workers=CRAWL_MAX_WORKERS) as pool:
+        pages = dict(pool.map(fetch, urls))
+    probe_cache.save()
+    n_dead = sum(1 for text, error in pages.values() if text is None and error is None)
+    print(f"🌐 Crawled {len(urls)} URLs in {time.time() - t0:.1f}s ({n_dead} known dead)")
+    return pages
+
+
+def prepare_update(conference, pages=None):
+    """
+    Clean past dates and run change detection for one conference.
+    Returns (updated, gpt_job); gpt_job is None when no page changed or the
+    rule-based extractor was confident, otherwise the (conference_small,
+    system_prompt, prompt) arguments for call_gpt.
+    """
     updated = clean_past_dates(conference)
-    abbreviation = updated.get("abbreviation", [])
     # Find year of next conference
     years, urls = expand_urls_years(updated.get("search_urls", []), int(updated.get("previous_year", [])))
     # previous_year = int(updated.get("previous_year", []))
     # next_conf_year = set([max(previous_year+1, current_year), next_year])
     # next_year = max(previous_year+1, current_year)
     candidates = []
+    seen_snippets = set()  # dedupe snippets across this conference's URLs
     # pattern_year = f"[^\d]{str(years[0])}[^\d]"
     # if len(years)==2:
     #     pattern_year = pattern_year + f"|[^\d]{str(years[1])}[^\d]"
@@ -124,40 +434,41 @@ def scrape_and_update(conference):
 
     for url in urls:
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 " +
-                              "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
-            }
-            resp = requests.get(url, headers=headers, timeout=15)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "html.parser")
-            text = soup.get_text("\n", strip=True)  # keep \n for formatting
+            # Use the page from the up-front crawl when there is one
+            if pages is not None:
+                if url not in pages:
+                    print(f"[NOT DUE] Skipping {url}")
+                    continue
+                text, error = pages[url]
+                if error is not None:
+                    raise error
+                if text is None:
+                    print(f"[DEAD] Skipping {url}")
+                    continue
+            else:
+                text = fetch_page_text(url)
 
             # --- change detection ---
-            url_filename = abbreviation + "_" + re.sub(r'\W+', '_', url) + ".txt"
-            snapshot_file = os.path.join(SNAPSHOT_DIR, url_filename)
-            old_text = load_snapshot(snapshot_file)
-
-            if old_text and old_text.strip() == text.strip():
+            key = snapshot_key(updated, url)
+            if snapshots.is_unchanged(key, text):
                 print(f"[NO CHANGE] Skipping {url}")
+                poll_scheduler.record(key, changed=False)
                 continue  # skip this URL, no change
             else:
                 print(f"[CHANGED] Updating snapshot for {url}")
-                with open(snapshot_file, "w", encoding="utf-8") as f:
-                    f.write(text)
+                snapshots.put(key, text)
+                poll_scheduler.record(key, changed=True)
 
             # --- proceed only if changed ---
-            # (your date regex / search_names logic here)
-            # cands = find_dates_with_context(text)
-            # candidates.extend(cands)
-            candidates.extend(text)
+            cands = find_dates_with_context(text, seen_snippets)
+            candidates.extend(cands)
 
         except Exception as e:
             print(f"Error scraping {url}: {e}")
 
     # Only call GPT if candidates exist
     if not candidates:
-        return updated
+        return updated, None
 
     # conference object for GPT
     conference_small = {
@@ -168,6 +479,14 @@ def scrape_and_update(conference):
         # "notes": conference.get("notes", ""),
     }
 
+    # Regular pages are handled by the rule-based extractor; GPT only sees the unclear ones
+    fields, confidence = extract_conference_fields(candidates, years, conference_small)
+    if confidence >= RULE_MIN_CONFIDENCE:
+        print(f"[RULES] {conference['name']} extracted locally (confidence {confidence:.2f})")
+        return {**conference, **fields}, None
+    print(f"[RULES] {conference['name']} confidence {confidence:.2f} → GPT")
+    candidates = cap_candidates(candidates)
+
     if len(years) == 1:
         years_text = str(years[0])
     else:
@@ -199,246 +518,169 @@ def scrape_and_update(conference):
     - Return only the updated JSON object (not explanations).
     """
 
-    # Call GPT
-    updated_conference_small = call_gpt(conference_small, system_prompt, prompt)
+    return updated, (conference_small, system_prompt, prompt)
 
-    # Merge back into full data
-    updated_conference = {**conference, **updated_conference_small}
-    return updated_conference
 
-
-def format_date_range(start_date: str, end_date: str) -> str:
+def run_gpt_jobs(gpt_jobs, max_workers=GPT_MAX_CONCURRENCY):
     """
-    Format two ISO date strings (YYYY-MM-DD) into a human-readable range.
-
-    Rules:
-    - If both are "unknown", return "Date unknown".
-    - If only one is known, return it in "Month D, YYYY" form.
-    - If both are known:
-      * Same month/year → "April 8–11, 2026"
-      * Same year, different months → "April 8 to May 2, 2026"
-      * Different years → "Dec 29, 2025 to Jan 3, 2026"
-    - If a date string is invalid, return it as-is.
+    Run call_gpt for many conferences at once with bounded concurrency.
+    `gpt_jobs` maps (category, index, name) → call_gpt arguments; returns the same keys → updated fields.
     """
+    if not gpt_jobs:
+        return {}
 
-    def parse_date(date_str):
-        if date_str in ("unknown", "", None):
-            return None
-        try:
-            return datetime.strptime(date_str, "%Y-%m-%d")
-        except Exception:
-            return None
+    def run(item):
+        key, job = item
+        t0 = time.time()
+        result = call_gpt(*job)
+        print(f"⏱️ GPT update for {key[2]} took {time.time() - t0:.1f}s")
+        return key, result
 
-    dt1, dt2 = parse_date(start_date), parse_date(end_date)
+    t0 = time.time()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = dict(pool.map(run, gpt_jobs.items()))
+    print(f"🤖 {len(gpt_jobs)} GPT update(s) finished in {time.time() - t0:.1f}s")
+    return results
 
-    # Case 1: both unknown
-    if not dt1 and not dt2:
-        return "Date unknown"
 
-    # Case 2: only one known
-    if dt1 and not dt2:
-        return dt1.strftime("%B %d, %Y")
-    if dt2 and not dt1:
-        return dt2.strftime("%B %d, %Y")
+# ---- Keyed diff between two conference_data versions ----
+DIFF_FIELDS = ["name", "url", "start_date", "end_date", "location", "submission_deadline"]
 
-    # Case 3: both known
-    if dt1.year == dt2.year and dt1.month == dt2.month:
-        return f"{dt1.strftime('%B')} {dt1.day}–{dt2.day}, {dt1.year}"
-    elif dt1.year == dt2.year:
-        return f"{dt1.strftime('%B %d')} to {dt2.strftime('%B %d')}, {dt1.year}"
-    else:
-        return f"{dt1.strftime('%B %d, %Y')} to {dt2.strftime('%B %d, %Y')}"
 
+def diff_conference_data(old_data, new_data):
+    """
+    Field-level diff of two {category: [conference, ...]} dicts, matched by conference_key.
+    Returns a list of (name, status, {field: (old, new)}) with status "added", "changed" or "removed",
+    in the order of new_data (removed ones last).
+    """
+    old_by_key = {}
+    for conferences in old_data.values():
+        for conf in conferences:
+            old_by_key[conference_key(conf)] = conf
 
-def replace_url_years(url, start_date):
-    """Replace {YEAR} and {YR} in URLs using start_date year."""
-    if start_date == "unknown":
-        start_date = (datetime.today() + relativedelta(years=1)).strftime("%Y-%m-%d")  # default start date to next year
-    try:
-        year_full = datetime.strptime(start_date, "%Y-%m-%d").year
-        year_short = str(year_full)[-2:]
-        url = url.replace("{YEAR}", str(year_full))
-        url = url.replace("{YR}", str(year_short))
-        return url
-    except Exception:
-        return url
+    changes = []
+    seen = set()
+    for conferences in new_data.values():
+        for conf in conferences:
+            key = conference_key(conf)
+            seen.add(key)
+            old = old_by_key.get(key)
+            if old is None:
+                fields = {f: (None, conf.get(f)) for f in DIFF_FIELDS if f != "name" and conf.get(f) is not None}
+                changes.append((conf.get("name", key), "added", fields))
+                continue
+            fields = {
+                f: (old.get(f), conf.get(f))
+                for f in DIFF_FIELDS
+                if old.get(f) != conf.get(f)
+            }
+            if fields:
+                changes.append((conf.get("name", key), "changed", fields))
 
+    for key, old in old_by_key.items():
+        if key not in seen:
+            changes.append((old.get("name", key), "removed", {}))
+    return changes
 
-def convert_to_discord_markdown(conference_data):
-    output_lines = []
 
-    for category, conferences in conference_data.items():
-        if category == 'Psychometrics / Measurement / Testing Conferences':
-            emoji = ":bar_chart:"
-        elif category == 'Education / Policy Conferences':
-            emoji = ":mortar_board:"
-        elif category == 'AI / Machine Learning Conferences':
-            emoji = ":robot:"
-        elif category == 'Psychology Conferences':
-            emoji = ":brain:"
+def format_conference_updates(changes):
+    """Discord message listing only the changed fields."""
+    message = f"📢 **Conference Updates Detected** ({datetime.today().strftime('%Y-%m-%d')})\n"
+    for name, status, fields in changes:
+        if status == "added":
+            message += f"\n**{name}** (new)\n"
+        elif status == "removed":
+            message += f"\n**{name}** (removed)\n"
+            continue
         else:
-            emoji = ""
-
-        output_lines.append(f"## {emoji} {category}")
-        for conf in conferences:
-            # Fix URL placeholders
-            url = replace_url_years(conf['url'], conf['start_date'])
-
-            # Title and URL
-            line1 = f"[**{conf['name']}**](<{url}>)"
-            output_lines.append(line1)
-
-            # Date + location
-            date_text = format_date_range(conf["start_date"], conf["end_date"])
-            location = conf.get("location", "Location unknown")
-            if location != "unknown":
-                line2 = f"* {date_text} -- {location}"
-            else:
-                line2 = f"* {date_text}"
-            output_lines.append(line2)
-
-            # Submission deadline
-            submission = conf.get("submission_deadline", "unknown")
-
-            if submission not in ("unknown", "Closed"):
-                try:
-                    # assume ISO format like YYYY-MM-DD
-                    dt = datetime.strptime(submission, "%Y-%m-%d")
-                    submission_fmt = dt.strftime("%B %d, %Y")  # e.g., "November 12, 2025"
-                except ValueError:
-                    # if not a valid date string, leave as is
-                    submission_fmt = submission
+            message += f"\n**{name}**\n"
+        for field, (old, new) in fields.items():
+            label = field.replace("_", " ").capitalize()
+            if old is None:
+                message += f"{label}: {new}\n"
             else:
-                submission_fmt = submission
+                message += f"{label}: {old} → {new}\n"
+    return message
 
-            line3 = f"* Submission Deadline: {submission_fmt}"
-            output_lines.append(line3)
 
-        output_lines.append("")  # blank line between categories
-
-    return "\n".join(output_lines)
-
-
-# ---- Parse file into list of conferences ----
-def parse_conferences(file_path):
-    conferences = []
-    current_conf = []
-    with open(file_path, encoding="utf-8") as f:
-        for line in f:
-            if line.startswith("[**"):  # conference heading
-                if current_conf:
-                    conferences.append(current_conf)
-                    current_conf = []
-            current_conf.append(line.rstrip("\n"))
-        if current_conf:
-            conferences.append(current_conf)
-    return conferences
-
-
-# ---- Compare two conference blocks ----
-def compare_conference_blocks(old_conf, new_conf):
-    diff = list(difflib.unified_diff(old_conf, new_conf, lineterm=""))
-    # keep only actual +/- lines, skip headers
-    return [line for line in diff if line.startswith(("+", "-")) and not line.startswith(("+++", "---"))]
-
-
-# ---- Compare full files ----
-def compare_files(old_file, new_file):
-    old_confs = parse_conferences(old_file)
-    new_confs = parse_conferences(new_file)
-
-    changes = {}
-
-    # Compare conference by conference (assumes same order)
-    for old_conf, new_conf in zip(old_confs, new_confs):
-        conf_name = new_conf[0]  # first line = heading
-        diff = compare_conference_blocks(old_conf, new_conf)
-        if diff:
-            changes[conf_name] = diff
-
-    return changes
+def load_latest_two_versions():
+    version = conference_store.current_version()
+    if version < 2:
+        return None, None
+    return conference_store.as_of(version - 1), conference_store.current()
 
 
 # ---- Notify Discord ----
-def notify_conference_updates():
-    # Find all markdown files
-    files = glob.glob("conference_discord/*.md")
-    if len(files) < 2:
-        print("Not enough files to compare.")
-        return
-
-    # Sort chronologically (YYYY_MM_DD.md naming guarantees order)
-    files.sort()
-    prev_file, latest_file = files[-2], files[-1]
-
-    # Get changes
-    changes = compare_files(prev_file, latest_file)
-
+def notify_conference_updates(old_data=None, new_data=None):
+    if old_data is None or new_data is None:
+        old_data, new_data = load_latest_two_versions()
+        if old_data is None:
+            print("Not enough versions to compare.")
+            return
+
+    changes = diff_conference_data(old_data, new_data)
     if not changes:
         print("✅ No changes detected.")
         return
 
-    # Build Discord message (plain text)
-    message = f"📢 **Conference Updates Detected** ({datetime.today().strftime('%Y-%m-%d')})\n"
-    for conf, lines in changes.items():
-        message += f"\n**{conf}**\n"
-        for l in lines:
-            if l.startswith("+"):
-                message += f"{l[1:].strip()}\n"
-            elif l.startswith("-"):
-                message += f"Removed: {l[1:].strip()}\n"
-
     # Send to Discord webhook
+    chunks = split_message(format_conference_updates(changes))
     try:
-        resp = requests.post(DISCORD_WEBHOOK_CONFERENCE_UPDATES, json={"content": message})
-        resp.raise_for_status()
-        print("✅ Sent grouped conference updates to Discord.")
+        for i, chunk in enumerate(chunks, 1):
+            resp = requests.post(DISCORD_WEBHOOK_CONFERENCE_UPDATES, json={"content": chunk}, timeout=10)
+            resp.raise_for_status()
+            if i < len(chunks):
+                time.sleep(1)
+        print(f"✅ Sent {len(changes)} conference update(s) to Discord in {len(chunks)} message(s).")
     except Exception as e:
         print("❌ Failed to send Discord update:", e)
 
 
 def main():
     # ---- Find Input Data ----
-    # Find all files starting with "conferences" and ending with ".json"
-    files = glob.glob("conference_data/20*.json")
-    if not files:
-        raise FileNotFoundError("No conference JSON files found!")
-    # Sort by filename (since your naming has YYYY-MM-DD it sorts chronologically)
-    files.sort()
-    # Take the last one as the most recent
-    INPUT_FILE = files[-1]
-    print("Using latest file:", INPUT_FILE)
-    with open(INPUT_FILE, "r") as f:
-        data = json.load(f)
+    # Current version from the store, after committing any new or hand-edited conference_data files
+    conference_store.import_files()
+    data = conference_store.current()
+    if not data:
+        raise FileNotFoundError("No conference data found!")
+    print(f"Using conference data version {conference_store.current_version()}")
+    # Fetch all pages concurrently, then process conferences in file order
+    pages = crawl_conference_pages(data)
     updated_data = {}
+    gpt_jobs = {}
     for category, conferences in data.items():
         updated_data[category] = []
-        for conference in conferences:
+        for i, conference in enumerate(conferences):
             print(f"🔎 Checking {conference['name']}...")
             # raise
-            updated_conf = scrape_and_update(conference)
+            updated_conf, gpt_job = prepare_update(conference, pages)
+            if gpt_job is not None:
+                # Keyed by position: two entries may share a name within a category
+                gpt_jobs[(category, i, conference["name"])] = gpt_job
             updated_data[category].append(updated_conf)
 
+    snapshots.save()
+    poll_scheduler.save()
+
+    # ---- Ask GPT about every changed conference in parallel ----
+    results = run_gpt_jobs(gpt_jobs)
+    for category, conferences in data.items():
+        for i, conference in enumerate(conferences):
+            updated_small = results.get((category, i, conference["name"]))
+            if updated_small is not None:
+                updated_data[category][i] = {**conference, **updated_small}
+
     # ---- Compare with last saved ----
     if updated_data == data:
         print("✅ No changes detected. Skipping save.")
         return
 
-    # ---- Save JSON ----
-    OUTPUT_FILE = "conference_data/" + f"{datetime.today().strftime('%Y_%m_%d')}.json"
-    with open(OUTPUT_FILE, "w") as f:
-        json.dump(updated_data, f, indent=2)
-    print(f"✅ Saved updated JSON to {OUTPUT_FILE}")
-
-    # ---- Save Markdown ----
-    markdown_text = convert_to_discord_markdown(updated_data)
-    OUTPUT_FILE2 = "conference_discord/" + f"{datetime.today().strftime('%Y_%m_%d')}.md"
-    with open(OUTPUT_FILE2, "w", encoding="utf-8") as f:
-        f.write(markdown_text)
-    print(f"✅ Saved updated Discord md to {OUTPUT_FILE2}")
+    # ---- Save new version ----
+    version = conference_store.commit(updated_data)
+    print(f"✅ Saved conference data version {version} to {conference_store.root}")
 
     # ---- Send Changes to Discord Private Channel ----
-    notify_conference_updates()
+    notify_conference_updates(data, updated_data)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,348 @@
+"""
+Rule-based extraction of conference dates, location and submission deadline.
+
+Works on the date/venue snippets from find_dates_with_context and returns the
+same fields the GPT prompt asks for, plus a confidence in [0, 1]:
+
+    dates     date-range grammars ("April 8–11, 2026", "28 April – 2 May 2026",
+              "Dec 29, 2025 – Jan 3, 2026", ISO ranges), limited to the expected
+              conference years and to ranges that have not ended yet
+    deadline  the dates closest to deadline keywords ("submission deadline",
+              "abstracts due", ...), ignoring registration/notification dates
+    location  "City, ST" / "City, State|Province" / "City, Country" against a
+              small gazetteer, or "Virtual"
+
+The overall confidence is the lowest of the three field confidences; callers
+fall back to GPT when it is below their threshold.
+"""
+
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+MAX_CONFERENCE_DAYS = 14   # longer "ranges" are submission windows, not meetings
+NEAR_CHARS = 250           # a location this close to the chosen dates belongs to them
+DEADLINE_WINDOW = 80       # chars after a deadline keyword searched for its date
+
+MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+
+_M = (r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|"
+      r"sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?")
+_D = r"(\d{1,2})(?:st|nd|rd|th)?\b"
+_Y = r"(\d{4})\b"
+_WD = r"(?:(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*\.?,?\s+)?"
+_SEP = r"\s*(?:-|–|—|to|through|thru|until)\s*"
+
+# Each pattern → (start (y, m, d), end (y, m, d)) from its groups
+RANGE_PATTERNS = [
+    # April 8–11, 2026 / April 28 – May 2, 2026 / Dec 29, 2025 – Jan 3, 2026
+    (re.compile(r"\b" + _WD + _M + r"\s+" + _D + r"(?:,?\s*" + _Y + r")?" + _SEP
+                + _WD + r"(?:" + _M + r"\s+)?" + _D + r",?\s*" + _Y, re.IGNORECASE),
+     lambda g: ((g[2] or g[5], g[0], g[1]), (g[5], g[3] or g[0], g[4]))),
+    # 8–11 April 2026 / 28 April – 2 May 2026 / 29 December 2025 – 3 January 2026
+    (re.compile(r"\b" + _WD + _D + r"(?:\s+(?:of\s+)?" + _M + r"(?:,?\s*" + _Y + r")?)?" + _SEP
+                + _WD + _D + r"\s+(?:of\s+)?" + _M + r",?\s*" + _Y, re.IGNORECASE),
+     lambda g: ((g[2] or g[5], g[1] or g[4], g[0]), (g[5], g[4], g[3]))),
+    # 2026-04-08 – 2026-04-11
+    (re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})" + _SEP + r"(\d{4})-(\d{1,2})-(\d{1,2})\b"),
+     lambda g: ((g[0], g[1], g[2]), (g[3], g[4], g[5]))),
+]
+
+# Single dates, year optional → (y or None, m, d)
+DATE_PATTERNS = [
+    (re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b"), lambda g: (g[0], g[1], g[2])),
+    (re.compile(r"\b" + _M + r"\s+" + _D + r"(?:,?\s*" + _Y + r")?", re.IGNORECASE),
+     lambda g: (g[2], g[0], g[1])),
+    (re.compile(r"\b" + _D + r"\s+(?:of\s+)?" + _M + r"(?:,?\s*" + _Y + r")?", re.IGNORECASE),
+     lambda g: (g[2], g[1], g[0])),
+]
+
+CONFERENCE_WORDS = re.compile(
+    r"\b(?:conference|annual meeting|congress|symposium|summit|convention|workshop|"
+    r"will be held|takes place|join us|save the date)\b", re.IGNORECASE)
+DEADLINE_WORDS = re.compile(
+    r"\b(?:(?:submission|abstract|proposal|paper|poster)s?\s+(?:deadline|due|close[sd]?)|"
+    r"deadline(?:\s+for\s+(?:submission|abstract|proposal|paper)s?)?|"
+    r"(?:submissions?|abstracts?|proposals?|papers?)\s+(?:are\s+|must\s+be\s+)?(?:due|accepted\s+until|submitted\s+by)|"
+    r"submit\s+by|call\s+for\s+(?:papers|abstracts|proposals)\s+closes)\b", re.IGNORECASE)
+STRONG_DEADLINE = re.compile(r"submission|abstract|proposal|paper|poster", re.IGNORECASE)
+NOT_SUBMISSION = re.compile(
+    r"registration|notification|acceptance|early[- ]bird|hotel|camera[- ]ready|refund|"
+    r"scholarship|award|travel grant|decision", re.IGNORECASE)
+VIRTUAL = re.compile(
+    r"\b(?:fully virtual|virtual (?:conference|meeting|event)|held (?:virtually|online)|online (?:only|conference|event))\b",
+    re.IGNORECASE)
+HYBRID = re.compile(r"\b(?:hybrid|in[- ]person)\b", re.IGNORECASE)
+
+# ---- Gazetteer ----
+US_STATES = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas", "CA": "California",
+    "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware", "DC": "District of Columbia",
+    "FL": "Florida", "GA": "Georgia", "HI": "Hawaii", "ID": "Idaho", "IL": "Illinois",
+    "IN": "Indiana", "IA": "Iowa", "KS": "Kansas", "KY": "Kentucky", "LA": "Louisiana",
+    "ME": "Maine", "MD": "Maryland", "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota",
+    "MS": "Mississippi", "MO": "Missouri", "MT": "Montana", "NE": "Nebraska", "NV": "Nevada",
+    "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico", "NY": "New York",
+    "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio", "OK": "Oklahoma", "OR": "Oregon",
+    "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina", "SD": "South Dakota",
+    "TN": "Tennessee", "TX": "Texas", "UT": "Utah", "VT": "Vermont", "VA": "Virginia",
+    "WA": "Washington", "WV": "West Virginia", "WI": "Wisconsin", "WY": "Wyoming",
+}
+CA_PROVINCES = {
+    "AB": "Alberta", "BC": "British Columbia", "MB": "Manitoba", "NB": "New Brunswick",
+    "NL": "Newfoundland and Labrador", "NS": "Nova Scotia", "ON": "Ontario",
+    "PE": "Prince Edward Island", "QC": "Quebec", "SK": "Saskatchewan",
+}
+COUNTRIES = {
+    "usa": "USA", "u.s.a.": "USA", "united states": "USA", "u.s.": "USA", "us": "USA",
+    "canada": "Canada", "mexico": "Mexico", "brazil": "Brazil", "argentina": "Argentina",
+    "chile": "Chile", "colombia": "Colombia", "peru": "Peru",
+    "uk": "United Kingdom", "united kingdom": "United Kingdom", "england": "United Kingdom",
+    "scotland": "United Kingdom", "wales": "United Kingdom", "ireland": "Ireland",
+    "france": "France", "germany": "Germany", "spain": "Spain", "portugal": "Portugal",
+    "italy": "Italy", "netherlands": "Netherlands", "the netherlands": "Netherlands",
+    "belgium": "Belgium", "switzerland": "Switzerland", "austria": "Austria", "denmark": "Denmark",
+    "sweden": "Sweden", "norway": "Norway", "finland": "Finland", "iceland": "Iceland",
+    "poland": "Poland", "czech republic": "Czech Republic", "czechia": "Czech Republic",
+    "hungary": "Hungary", "greece": "Greece", "turkey": "Turkey", "türkiye": "Turkey",
+    "israel": "Israel", "uae": "United Arab Emirates", "united arab emirates": "United Arab Emirates",
+    "south africa": "South Africa", "egypt": "Egypt", "kenya": "Kenya", "nigeria": "Nigeria",
+    "india": "India", "china": "China", "japan": "Japan", "taiwan": "Taiwan",
+    "south korea": "Republic of Korea", "korea": "Republic of Korea",
+    "republic of korea": "Republic of Korea", "singapore": "Singapore", "malaysia": "Malaysia",
+    "thailand": "Thailand", "vietnam": "Vietnam", "indonesia": "Indonesia",
+    "philippines": "Philippines", "hong kong": "Hong Kong", "australia": "Australia",
+    "new zealand": "New Zealand",
+}
+# Cities often named without a state/country on conference pages
+CITIES = {
+    "chicago": "Chicago, Illinois, USA", "new york city": "New York, New York, USA",
+    "boston": "Boston, Massachusetts, USA", "san francisco": "San Francisco, California, USA",
+    "los angeles": "Los Angeles, California, USA", "san diego": "San Diego, California, USA",
+    "seattle": "Seattle, Washington, USA", "denver": "Denver, Colorado, USA",
+    "atlanta": "Atlanta, Georgia, USA", "philadelphia": "Philadelphia, Pennsylvania, USA",
+    "new orleans": "New Orleans, Louisiana, USA", "las vegas": "Las Vegas, Nevada, USA",
+    "toronto": "Toronto, Ontario, Canada", "vancouver": "Vancouver, British Columbia, Canada",
+    "montreal": "Montreal, Quebec, Canada", "montréal": "Montreal, Quebec, Canada",
+    "london": "London, United Kingdom", "paris": "Paris, France", "berlin": "Berlin, Germany",
+    "amsterdam": "Amsterdam, Netherlands", "barcelona": "Barcelona, Spain",
+    "madrid": "Madrid, Spain", "lisbon": "Lisbon, Portugal", "vienna": "Vienna, Austria",
+    "prague": "Prague, Czech Republic", "copenhagen": "Copenhagen, Denmark",
+    "stockholm": "Stockholm, Sweden", "dublin": "Dublin, Ireland", "rome": "Rome, Italy",
+    "tokyo": "Tokyo, Japan", "kyoto": "Kyoto, Japan", "seoul": "Seoul, Republic of Korea",
+    "singapore": "Singapore", "hong kong": "Hong Kong", "sydney": "Sydney, Australia",
+    "melbourne": "Melbourne, Australia",
+}
+
+_CITY = r"((?:[A-Z][\w.'\-]+\s+){0,2}[A-Z][\w.'\-]+)"
+_STATE_NAMES = {name.lower(): name for name in US_STATES.values()}
+_PROVINCE_NAMES = {name.lower(): name for name in CA_PROVINCES.values()}
+_REGION = "|".join(sorted(
+    [re.escape(n) for n in list(US_STATES) + list(CA_PROVINCES)]
+    + [re.escape(n) for n in list(US_STATES.values()) + list(CA_PROVINCES.values())],
+    key=len, reverse=True))
+_COUNTRY = "|".join(re.escape(c) for c in sorted(COUNTRIES, key=len, reverse=True))
+REGION_PATTERN = re.compile(_CITY + r",\s*(" + _REGION + r")\b(?:,?\s*(" + _COUNTRY + r"))?")
+# Only the country is case-insensitive; the city must stay capitalized or it swallows "held in"
+COUNTRY_PATTERN = re.compile(_CITY + r",\s*((?i:" + _COUNTRY + r"))\b")
+CITY_PATTERN = re.compile(r"\b(" + "|".join(re.escape(c) for c in sorted(CITIES, key=len, reverse=True)) + r")\b",
+                          re.IGNORECASE)
+# "City" words that are really venue/organization words
+_NOT_CITY = re.compile(r"\b(?:university|college|hotel|center|centre|hall|institute|school|room|suite)\b",
+                       re.IGNORECASE)
+
+
+def _to_date(y, m, d) -> Optional[date]:
+    try:
+        month = int(m) if str(m).isdigit() else MONTHS[m[:3].lower()]
+        return date(int(y), month, int(d))
+    except (TypeError, ValueError, KeyError):
+        return None
+
+
+def find_ranges(text: str) -> List[Tuple[int, date, date]]:
+    """[(position, start, end), ...] for every date range in text."""
+    found = {}
+    for pattern, convert in RANGE_PATTERNS:
+        for m in pattern.finditer(text):
+            (y1, m1, d1), (y2, m2, d2) = convert(m.groups())
+            start, end = _to_date(y1, m1, d1), _to_date(y2, m2, d2)
+            if start and end and start <= end and (end - start).days < MAX_CONFERENCE_DAYS:
+                found.setdefault(m.start(), (m.start(), start, end))
+    return sorted(found.values(), key=lambda r: r[0])
+
+
+def find_dates(text: str) -> List[Tuple[int, Optional[int], int, int]]:
+    """[(position, year or None, month, day), ...] for single dates in text."""
+    found = {}
+    for pattern, convert in DATE_PATTERNS:
+        for m in pattern.finditer(text):
+            y, mo, d = convert(m.groups())
+            probe = _to_date(y or 2000, mo, d)  # 2000 is a leap year, so Feb 29 is allowed
+            if probe and m.start() not in found:
+                found[m.start()] = (m.start(), int(y) if y else None, probe.month, probe.day)
+    return sorted(found.values())
+
+
+def _near(text, pattern, pos, chars=NEAR_CHARS):
+    return bool(pattern.search(text, max(0, pos - chars), pos + chars))
+
+
+def extract_dates(text, years, today):
+    """((start, end), confidence) of the upcoming conference, or (None, 0.0)."""
+    scored = {}
+    for pos, start, end in find_ranges(text):
+        if start.year not in years or end < today:
+            continue
+        score = 1 if _near(text, CONFERENCE_WORDS, pos) else 0
+        score -= 1 if _near(text, DEADLINE_WORDS, pos, 60) else 0
+        best_score, count, first = scored.get((start, end), (score, 0, pos))
+        scored[(start, end)] = (max(best_score, score), count + 1, first)
+    if not scored:
+        return None, 0.0
+    ranked = sorted(scored.items(), key=lambda kv: (-kv[1][0], -kv[1][1], kv[1][2]))
+    if len(ranked) == 1:
+        return ranked[0][0], 0.9
+    (best, (s1, c1, _)), (_, (s2, c2, _)) = ranked[0], ranked[1]
+    return best, (0.8 if (s1, c1) > (s2, c2) else 0.4)
+
+
+def _infer_year(month, day, start: Optional[date], today: date) -> Optional[date]:
+    """Deadlines without a year fall within the year before the conference start."""
+    anchor = start or today
+    for y in (anchor.year, anchor.year - 1, anchor.year + 1):
+        d = _to_date(y, month, day)
+        if d and (start is None or (d <= start and (start - d).days < 366)):
+            if start is not None or d >= today.replace(year=today.year - 1):
+                return d
+    return None
+
+
+def extract_deadline(text, start: Optional[date], today):
+    """(deadline date or "Closed" or None, confidence)."""
+    hits = []
+    mentions = 0
+    dates = find_dates(text)
+    for m in DEADLINE_WORDS.finditer(text):
+        line_start = text.rfind("\n", 0, m.start()) + 1
+        line_end = text.find("\n", m.end())
+        line_end = len(text) if line_end == -1 else line_end
+        if NOT_SUBMISSION.search(text, line_start, m.end()):
+            continue
+        mentions += 1
+        strong = bool(STRONG_DEADLINE.search(m.group(0)))
+        window_end = min(line_end + 1 + DEADLINE_WINDOW, m.end() + DEADLINE_WINDOW)
+        nearest = [d for d in dates if m.end() <= d[0] < window_end]
+        if not nearest:
+            nearest = [d for d in dates if line_start <= d[0] < m.start()][-1:]
+        if not nearest:
+            continue
+        _, y, month, day = nearest[0]
+        deadline = _to_date(y, month, day) if y else _infer_year(month, day, start, today)
+        if deadline is None or (start and deadline > start):
+            continue
+        hits.append((not strong, deadline))
+
+    if not hits:
+        # No deadline on the page keeps the current value; a keyword without a date is unclear
+        return None, (0.5 if mentions else 0.8)
+    hits.sort()
+    preferred = [d for weak, d in hits if weak == hits[0][0]]
+    upcoming = sorted(d for d in preferred if d >= today)
+    confidence = 0.9 if len(set(preferred)) == 1 else 0.75 if not hits[0][0] else 0.5
+    if upcoming:
+        return upcoming[0], confidence
+    return "Closed", confidence
+
+
+def _canonical_city(city: str) -> Optional[str]:
+    city = city.strip()
+    # "Hyatt Regency Chicago, IL" → "Chicago"; venue words mean it is not a city
+    words = city.split()
+    if _NOT_CITY.search(city):
+        return None
+    if words and words[0].lower() in ("in", "at", "the"):
+        words = words[1:]
+    return " ".join(words) or None
+
+
+def find_locations(text) -> List[Tuple[int, str]]:
+    """[(position, "City, State, Country" / "City, Country" / "Virtual"), ...]."""
+    found = {}
+    for m in REGION_PATTERN.finditer(text):
+        city, region = _canonical_city(m.group(1)), m.group(2)
+        if not city:
+            continue
+        upper = region.upper()
+        if upper in US_STATES or region.lower() in _STATE_NAMES:
+            name = US_STATES.get(upper) or _STATE_NAMES[region.lower()]
+            found[m.start()] = (m.start(), f"{city}, {name}, USA")
+        else:
+            name = CA_PROVINCES.get(upper) or _PROVINCE_NAMES[region.lower()]
+            found[m.start()] = (m.start(), f"{city}, {name}, Canada")
+    for m in COUNTRY_PATTERN.finditer(text):
+        city = _canonical_city(m.group(1))
+        country = COUNTRIES[m.group(2).lower()]
+        if not city or m.start() in found or city.upper() in US_STATES:
+            continue
+        found[m.start()] = (m.start(), f"{city}, {country}")
+    for m in CITY_PATTERN.finditer(text):
+        if not any(p <= m.start() < p + len(loc) + 20 for p, loc in found.values()):
+            found.setdefault(m.start(), (m.start(), CITIES[m.group(1).lower()]))
+    if VIRTUAL.search(text) and not HYBRID.search(text):
+        m = VIRTUAL.search(text)
+        found[m.start()] = (m.start(), "Virtual")
+    return sorted(found.values())
+
+
+def extract_location(text, date_pos: Optional[int]):
+    """(location or None, confidence); places next to the conference dates win."""
+    locations = find_locations(text)
+    if not locations:
+        return None, 0.4
+    if date_pos is not None:
+        near = sorted((abs(p - date_pos), loc) for p, loc in locations if abs(p - date_pos) <= NEAR_CHARS)
+        if near:
+            return near[0][1], 0.9
+    distinct = {loc for _, loc in locations}
+    if len(distinct) == 1:
+        return locations[0][1], 0.7
+    return None, 0.4
+
+
+def extract_conference_fields(snippets: List[str], years, current: Dict[str, str],
+                              today: date = None) -> Tuple[Dict[str, str], float]:
+    """
+    Fields in the same shape as the GPT reply (start_date, end_date, location,
+    submission_deadline) plus an overall confidence. Fields that cannot be
+    found keep their current values.
+    """
+    today = today or datetime.today().date()
+    years = set(years)
+    text = "\n\n".join(snippets)
+    fields = dict(current)
+
+    dates, date_conf = extract_dates(text, years, today)
+    start = None
+    date_pos = None
+    if dates:
+        start, end = dates
+        fields["start_date"], fields["end_date"] = start.isoformat(), end.isoformat()
+        date_pos = next(p for p, s, e in find_ranges(text) if (s, e) == dates)
+        if (fields["start_date"], fields["end_date"]) == (current.get("start_date"), current.get("end_date")):
+            date_conf = 1.0
+
+    location, loc_conf = extract_location(text, date_pos)
+    if location:
+        fields["location"] = location
+    elif dates and date_conf == 1.0 and current.get("location", "unknown") != "unknown":
+        loc_conf = 0.8  # same meeting as before, so the known venue still holds
+
+    deadline, deadline_conf = extract_deadline(text, start, today)
+    if isinstance(deadline, date):
+        fields["submission_deadline"] = deadline.isoformat()
+    elif deadline:
+        fields["submission_deadline"] = deadline
+
+    return fields, min(date_conf, loc_conf, deadline_conf)
@@ -0,0 +1,138 @@
+"""
+Discord formatting of conference entries, shared by the crawler and the bot's
+posting jobs. Kept free of import-time side effects (no stores, caches or
+LLM client), so the always-running bot can import it cheaply.
+"""
+
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+
+DISCORD_MAX_LEN = 2000
+
+
+def format_date_range(start_date: str, end_date: str) -> str:
+    """
+    Format two ISO date strings (YYYY-MM-DD) into a human-readable range.
+
+    Rules:
+    - If both are "unknown", return "Date unknown".
+    - If only one is known, return it in "Month D, YYYY" form.
+    - If both are known:
+      * Same month/year → "April 8–11, 2026"
+      * Same year, different months → "April 8 to May 2, 2026"
+      * Different years → "Dec 29, 2025 to Jan 3, 2026"
+    - If a date string is invalid, return it as-is.
+    """
+
+    def parse_date(date_str):
+        if date_str in ("unknown", "", None):
+            return None
+        try:
+            return datetime.strptime(date_str, "%Y-%m-%d")
+        except Exception:
+            return None
+
+    dt1, dt2 = parse_date(start_date), parse_date(end_date)
+
+    # Case 1: both unknown
+    if not dt1 and not dt2:
+        return "Date unknown"
+
+    # Case 2: only one known
+    if dt1 and not dt2:
+        return dt1.strftime("%B %d, %Y")
+    if dt2 and not dt1:
+        return dt2.strftime("%B %d, %Y")
+
+    # Case 3: both known
+    if dt1.year == dt2.year and dt1.month == dt2.month:
+        return f"{dt1.strftime('%B')} {dt1.day}–{dt2.day}, {dt1.year}"
+    elif dt1.year == dt2.year:
+        return f"{dt1.strftime('%B %d')} to {dt2.strftime('%B %d')}, {dt1.year}"
+    else:
+        return f"{dt1.strftime('%B %d, %Y')} to {dt2.strftime('%B %d, %Y')}"
+
+
+def replace_url_years(url, start_date):
+    """Replace {YEAR} and {YR} in URLs using start_date year."""
+    if start_date == "unknown":
+        start_date = (datetime.today() + relativedelta(years=1)).strftime("%Y-%m-%d")  # default start date to next year
+    try:
+        year_full = datetime.strptime(start_date, "%Y-%m-%d").year
+        year_short = str(year_full)[-2:]
+        url = url.replace("{YEAR}", str(year_full))
+        url = url.replace("{YR}", str(year_short))
+        return url
+    except Exception:
+        return url
+
+
+def format_conference_lines(conf):
+    """Title/link, date + location, and submission deadline lines for one conference."""
+    # Fix URL placeholders
+    url = replace_url_years(conf['url'], conf['start_date'])
+
+    # Title and URL
+    line1 = f"[**{conf['name']}**](<{url}>)"
+
+    # Date + location
+    date_text = format_date_range(conf["start_date"], conf["end_date"])
+    location = conf.get("location", "Location unknown")
+    if location != "unknown":
+        line2 = f"* {date_text} -- {location}"
+    else:
+        line2 = f"* {date_text}"
+
+    # Submission deadline
+    submission = conf.get("submission_deadline", "unknown")
+
+    if submission not in ("unknown", "Closed"):
+        try:
+            # assume ISO format like YYYY-MM-DD
+            dt = datetime.strptime(submission, "%Y-%m-%d")
+            submission_fmt = dt.strftime("%B %d, %Y")  # e.g., "November 12, 2025"
+        except ValueError:
+            # if not a valid date string, leave as is
+            submission_fmt = submission
+    else:
+        submission_fmt = submission
+
+    line3 = f"* Submission Deadline: {submission_fmt}"
+    return [line1, line2, line3]
+
+
+def convert_to_discord_markdown(conference_data):
+    output_lines = []
+
+    for category, conferences in conference_data.items():
+        if category == 'Psychometrics / Measurement / Testing Conferences':
+            emoji = ":bar_chart:"
+        elif category == 'Education / Policy Conferences':
+            emoji = ":mortar_board:"
+        elif category == 'AI / Machine Learning Conferences':
+            emoji = ":robot:"
+        elif category == 'Psychology Conferences':
+            emoji = ":brain:"
+        else:
+            emoji = ""
+
+        output_lines.append(f"## {emoji} {category}")
+        for conf in conferences:
+            output_lines.extend(format_conference_lines(conf))
+
+        output_lines.append("")  # blank line between categories
+
+    return "\n".join(output_lines)
+
+
+def split_message(content, max_len=DISCORD_MAX_LEN):
+    """Split text into chunks under Discord's limit, breaking at newlines where possible."""
+    chunks = []
+    while len(content) > max_len:
+        split_at = content.rfind("\n", 0, max_len)
+        if split_at == -1:
+            split_at = max_len
+        chunks.append(content[:split_at])
+        content = content[split_at:].lstrip()
+    chunks.append(content)
+    return chunks
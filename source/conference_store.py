@@ -0,0 +1,266 @@
+"""
+Versioned store for the conference list.
+
+    conference_store/manifest.json      {"current": N, "versions": [{"version", "date", "created", "changes"}, ...]}
+    conference_store/current.json       {"version": N, "conferences": ...} materialized latest version (O(1) to read)
+    conference_store/changes.jsonl      append-only per-conference change records, tagged with their version
+    conference_store/checkpoint_N.json  full copy every CHECKPOINT_EVERY versions (and version 1)
+
+A past version is rebuilt from the nearest checkpoint at or before it plus the
+change records in between, so history never needs a full copy per run.
+
+To add or edit conferences by hand, never touch current.json (that bypasses
+changes.jsonl, so as_of() would disagree with current()). Instead:
+
+    python -m source.conference_store export      # writes conference_data/<today>.json
+    # edit that file
+    python -m source.conference_store import      # or just run conference_dates_to_discord
+
+Every conference_data/*.json that is new or changed since it was last imported
+is committed as a new version, oldest file name first.
+"""
+
+import os
+import sys
+import json
+import glob
+import hashlib
+from datetime import datetime
+
+STORE_DIR = "conference_store"
+LEGACY_GLOB = "conference_data/20*.json"
+CHECKPOINT_EVERY = 25
+
+
+def conference_key(conference):
+    """Stable identity of a conference across versions (abbreviation, else name)."""
+    return (conference.get("abbreviation") or conference.get("name") or "").strip().lower()
+
+
+def _file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _layout_and_items(data):
+    """{category: [key, ...]} plus {(category, key): conference}; duplicate keys get a #n suffix."""
+    layout, items = {}, {}
+    for category, conferences in data.items():
+        keys = []
+        for conf in conferences:
+            key = conference_key(conf)
+            n = 2
+            base = key
+            while key in keys:
+                key = f"{base}#{n}"
+                n += 1
+            keys.append(key)
+            items[(category, key)] = conf
+        layout[category] = keys
+    return layout, items
+
+
+def _build(layout, items):
+    return {category: [items[(category, key)] for key in keys] for category, keys in layout.items()}
+
+
+def diff_records(old_data, new_data):
+    """Change records that turn old_data into new_data."""
+    old_layout, old_items = _layout_and_items(old_data)
+    new_layout, new_items = _layout_and_items(new_data)
+    records = []
+    for (category, key), conf in new_items.items():
+        old = old_items.get((category, key))
+        if old is None:
+            records.append({"op": "put", "category": category, "key": key, "conference": conf})
+        elif old != conf:
+            fields = {f: v for f, v in conf.items() if old.get(f, object()) != v}
+            unset = [f for f in old if f not in conf]
+            records.append({"op": "patch", "category": category, "key": key, "fields": fields, "unset": unset})
+    for (category, key) in old_items:
+        if (category, key) not in new_items:
+            records.append({"op": "del", "category": category, "key": key})
+    if json.dumps(old_layout) != json.dumps(new_layout):
+        records.append({"op": "layout", "layout": new_layout})
+    return records
+
+
+def apply_records(data, records):
+    layout, items = _layout_and_items(data)
+    for rec in records:
+        op = rec["op"]
+        if op == "put":
+            items[(rec["category"], rec["key"])] = rec["conference"]
+        elif op == "patch":
+            conf = dict(items[(rec["category"], rec["key"])])
+            conf.update(rec["fields"])
+            for f in rec.get("unset", []):
+                conf.pop(f, None)
+            items[(rec["category"], rec["key"])] = conf
+        elif op == "del":
+            items.pop((rec["category"], rec["key"]), None)
+        elif op == "layout":
+            layout = rec["layout"]
+    return _build(layout, items)
+
+
+class ConferenceStore:
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self.manifest_file = os.path.join(root, "manifest.json")
+        self.current_file = os.path.join(root, "current.json")
+        self.changes_file = os.path.join(root, "changes.jsonl")
+
+    # ---- helpers ----
+    def _write_json(self, path, obj, indent=2):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=indent)
+        os.replace(tmp, path)
+
+    def _read_json(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _checkpoint_file(self, version):
+        return os.path.join(self.root, f"checkpoint_{version}.json")
+
+    # ---- reading ----
+    def exists(self):
+        return os.path.exists(self.manifest_file)
+
+    def manifest(self):
+        if not self.exists():
+            return {"current": 0, "versions": []}
+        return self._read_json(self.manifest_file)
+
+    def current_version(self):
+        return self.manifest()["current"]
+
+    def current(self):
+        """Latest conference data, or None if the store is empty."""
+        if not self.exists():
+            return None
+        version = self.current_version()
+        if os.path.exists(self.current_file):
+            current = self._read_json(self.current_file)
+            if current["version"] == version:
+                return current["conferences"]
+        # current.json is behind the manifest (interrupted commit): rebuild it
+        return self._replay(version)
+
+    def as_of(self, version):
+        """Conference data as it was at `version` (None if out of range)."""
+        current = self.current_version()
+        if version < 1 or version > current:
+            return None
+        if version == current:
+            return self.current()
+        return self._replay(version)
+
+    def _replay(self, version):
+        checkpoints = sorted(
+            int(os.path.basename(p)[len("checkpoint_"):-len(".json")])
+            for p in glob.glob(os.path.join(self.root, "checkpoint_*.json"))
+        )
+        base = max(v for v in checkpoints if v <= version)
+        data = self._read_json(self._checkpoint_file(base))
+        pending = []
+        with open(self.changes_file, "r", encoding="utf-8") as f:
+            for line in f:
+                rec = json.loads(line)
+                if rec["version"] <= base:
+                    continue
+                if rec["version"] > version:
+                    break
+                pending.append(rec)
+        return apply_records(data, pending)
+
+    def version_info(self, version):
+        for info in self.manifest()["versions"]:
+            if info["version"] == version:
+                return info
+        return None
+
+    # ---- writing ----
+    def commit(self, new_data, date=None, imported=None):
+        """
+        Record new_data as the next version. Returns the version, or None if nothing changed.
+        `imported` ({file name: sha256}) is remembered in the manifest by import_files.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        manifest = self.manifest()
+        old_data = self.current() if manifest["current"] else {}
+        records = diff_records(old_data, new_data)
+        if imported:
+            manifest.setdefault("imported", {}).update(imported)
+        if manifest["current"] and not records:
+            if imported:
+                self._write_json(self.manifest_file, manifest)
+            return None
+
+        version = manifest["current"] + 1
+        with open(self.changes_file, "a+", encoding="utf-8") as f:
+            # Drop records left behind by a run that crashed before updating the manifest
+            f.truncate(manifest.get("changes_bytes", 0))
+            for rec in records:
+                f.write(json.dumps({"version": version, **rec}, ensure_ascii=False) + "\n")
+            f.flush()
+            changes_bytes = f.tell()
+        if version == 1 or version % CHECKPOINT_EVERY == 0:
+            self._write_json(self._checkpoint_file(version), new_data)
+
+        manifest["versions"].append({
+            "version": version,
+            "date": date or datetime.today().strftime("%Y_%m_%d"),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "changes": len(records),
+        })
+        manifest["current"] = version
+        manifest["changes_bytes"] = changes_bytes
+        # The manifest write is the commit point; current.json is a cache of it
+        self._write_json(self.manifest_file, manifest)
+        self._write_json(self.current_file, {"version": version, "conferences": new_data})
+        return version
+
+    def import_files(self, pattern=LEGACY_GLOB):
+        """Commit conference_data/*.json files that are new or edited since their last import, oldest first."""
+        files = sorted(glob.glob(pattern))
+        manifest = self.manifest()
+        if self.exists() and "imported" not in manifest:
+            # Store created before imports were tracked: the files it holds are already in it
+            manifest["imported"] = {os.path.basename(p): _file_hash(p) for p in files}
+            self._write_json(self.manifest_file, manifest)
+            return self.current_version()
+
+        imported = manifest.get("imported", {})
+        count = 0
+        for path in files:
+            name, digest = os.path.basename(path), _file_hash(path)
+            if imported.get(name) == digest:
+                continue
+            date = os.path.splitext(name)[0]
+            self.commit(self._read_json(path), date=date, imported={name: digest})
+            count += 1
+        if count:
+            print(f"[i] Imported {count} conference_data file(s) into {self.root}")
+        return self.current_version()
+
+    def export(self, pattern=LEGACY_GLOB, date=None):
+        """Write the current version to a dated conference_data file for editing. Returns its path."""
+        path = os.path.join(os.path.dirname(pattern), (date or datetime.today().strftime("%Y_%m_%d")) + ".json")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._write_json(path, self.current() or {})
+        return path
+
+
+if __name__ == "__main__":
+    store = ConferenceStore()
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "export":
+        print(f"✅ Wrote version {store.current_version()} to {store.export()}")
+    elif command == "import":
+        print(f"✅ Conference store at version {store.import_files()}")
+    else:
+        print("usage: python -m source.conference_store export|import")
@@ -0,0 +1,74 @@
+"""
+Minimal cron expressions for popo_bot's scheduled jobs.
+
+    "minute hour day-of-month month day-of-week"   e.g. "0 9 * * 1" (Mondays 9:00)
+
+Each field accepts *, numbers, ranges (a-b), steps (*/n, a-b/n) and lists (a,b).
+Day of week is 0-6 with Sunday = 0 (7 is also Sunday). As in cron, when both
+day fields are restricted a day matching either one runs.
+"""
+
+from datetime import datetime, timedelta
+
+FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+MAX_DAYS_AHEAD = 366 * 5  # "0 0 29 2 *" needs up to 4 years
+
+
+def parse_field(field: str, lo: int, hi: int) -> set:
+    values = set()
+    for part in field.split(","):
+        spec, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if spec == "*":
+            start, end = lo, hi
+        elif "-" in spec:
+            start, end = (int(x) for x in spec.split("-", 1))
+        else:
+            start = end = int(spec)
+            if step != 1:
+                end = hi
+        if start < lo or end > hi or start > end or step < 1:
+            raise ValueError(f"Invalid cron field {field!r} (allowed {lo}-{hi})")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+
+    def __init__(self, expr: str):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expr!r}")
+        self.expr = expr
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            parse_field(f, lo, hi) for f, (lo, hi) in zip(fields, FIELD_RANGES)
+        )
+        self.weekdays = {d % 7 for d in weekdays}
+        self.days_restricted = fields[2] != "*"
+        self.weekdays_restricted = fields[4] != "*"
+
+    def __repr__(self):
+        return f"CronSchedule({self.expr!r})"
+
+    def day_matches(self, day) -> bool:
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays  # Python Monday=0 → cron Monday=1
+        if self.days_restricted and self.weekdays_restricted:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+
+    def next_after(self, after: datetime, tz) -> datetime:
+        """First matching minute strictly after `after`, as an aware datetime in pytz timezone `tz`."""
+        local = after.astimezone(tz).replace(tzinfo=None, second=0, microsecond=0) + timedelta(minutes=1)
+        day = local.date()
+        for _ in range(MAX_DAYS_AHEAD):
+            if self.day_matches(day):
+                for hour in sorted(self.hours):
+                    for minute in sorted(self.minutes):
+                        candidate = datetime(day.year, day.month, day.day, hour, minute)
+                        if candidate >= local:
+                            return tz.localize(candidate)
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression never matches: {self.expr!r}")
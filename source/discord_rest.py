@@ -0,0 +1,371 @@
+"""
+Minimal async Discord REST client for the cron-style scripts.
+
+The one-shot jobs only read and write a handful of resources, so they talk to
+the HTTP API directly instead of opening a gateway session:
+
+    scheduled events   list / create / edit
+    channels           fetch, message history, send, delete message, create forum thread
+    current user       the bot itself and its guilds
+
+One aiohttp session is shared per client. Requests are serialized per
+rate-limit bucket (learned from the X-RateLimit-* headers) and wait out
+429s, including global ones. The Rest* objects expose the same attributes and
+coroutines the job functions use on discord.py objects, so those functions
+accept either.
+
+Set DISCORD_API_BASE to point at a local stand-in (see discord_standin_server.py).
+
+webhook_send() is the non-blocking way to post to a channel webhook from any
+coroutine (the bot's jobs included); it needs no bot token.
+"""
+
+import os
+import time
+import base64
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+import aiohttp
+import discord
+
+DISCORD_API_BASE = os.getenv("DISCORD_API_BASE", "https://discord.com/api/v10")
+REST_TIMEOUT = 15       # seconds per request
+REST_MAX_RETRIES = 5    # 429 / 5xx retries per request
+WEBHOOK_TIMEOUT = 10    # seconds per webhook post
+USER_AGENT = "DiscordBot (psychometricians_discord, 1.0)"
+
+
+class DiscordHTTPError(Exception):
+
+    def __init__(self, status: int, method: str, path: str, text: str):
+        super().__init__(f"{method} {path} → {status}: {text[:200]}")
+        self.status = status
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _image_data(image: bytes) -> str:
+    mime = "image/png" if image.startswith(b"\x89PNG") else "image/gif" if image[:3] == b"GIF" else "image/jpeg"
+    return f"data:{mime};base64,{base64.b64encode(image).decode('ascii')}"
+
+
+# ============================================================
+#                        REST CLIENT
+# ============================================================
+
+class DiscordREST:
+
+    def __init__(self, token: str, base_url: str = DISCORD_API_BASE):
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.route_buckets = {}                      # "METHOD route" -> bucket hash from Discord
+        self.bucket_resets = {}                      # bucket key -> monotonic time it refills (when exhausted)
+        self.bucket_locks = defaultdict(asyncio.Lock)
+        self.global_reset = 0.0
+        self.calls = defaultdict(int)                # "METHOD route" -> requests sent
+        self.rate_limit_hits = 0
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def open(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                headers={"Authorization": f"Bot {self.token}", "User-Agent": USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=REST_TIMEOUT),
+            )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def request(self, method: str, route: str, major=None, json=None, params=None, **path_params):
+        """
+        Call `route` (e.g. "/channels/{channel_id}/messages") with its path parameters filled in.
+        `major` is the resource the bucket is scoped to (channel or guild id).
+        """
+        await self.open()
+        path = route.format(**path_params)
+        route_key = f"{method} {route}"
+        bucket = (self.route_buckets.get(route_key, route_key), major)
+
+        async with self.bucket_locks[bucket]:
+            for attempt in range(REST_MAX_RETRIES):
+                now = time.monotonic()
+                wait = max(self.global_reset, self.bucket_resets.get(bucket, 0.0)) - now
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                self.calls[route_key] += 1
+                async with self.session.request(method, self.base_url + path, json=json, params=params) as resp:
+                    headers = resp.headers
+                    if "X-RateLimit-Bucket" in headers:
+                        self.route_buckets[route_key] = headers["X-RateLimit-Bucket"]
+                    if headers.get("X-RateLimit-Remaining") == "0":
+                        self.bucket_resets[bucket] = time.monotonic() + float(headers.get("X-RateLimit-Reset-After", 1))
+
+                    if resp.status == 429:
+                        self.rate_limit_hits += 1
+                        data = await resp.json(content_type=None)
+                        retry_after = float(data.get("retry_after", 1))
+                        if data.get("global") or headers.get("X-RateLimit-Global"):
+                            self.global_reset = time.monotonic() + retry_after
+                        else:
+                            self.bucket_resets[bucket] = time.monotonic() + retry_after
+                        continue
+                    if resp.status >= 500 and attempt < REST_MAX_RETRIES - 1:
+                        await asyncio.sleep(2 ** attempt)
+                        continue
+                    if resp.status >= 400:
+                        raise DiscordHTTPError(resp.status, method, path, await resp.text())
+                    if resp.status == 204:
+                        return None
+                    return await resp.json(content_type=None)
+        raise DiscordHTTPError(429, method, path, "rate limited too many times")
+
+    # ---- endpoints ----
+    async def fetch_current_user(self) -> "RestUser":
+        return RestUser(await self.request("GET", "/users/@me"))
+
+    async def fetch_guilds(self):
+        data = await self.request("GET", "/users/@me/guilds")
+        return [RestGuild(self, g) for g in data]
+
+    async def fetch_channel(self, channel_id: int) -> "RestChannel":
+        data = await self.request("GET", "/channels/{channel_id}", major=channel_id, channel_id=channel_id)
+        return RestChannel(self, data)
+
+    async def list_scheduled_events(self, guild_id: int):
+        data = await self.request("GET", "/guilds/{guild_id}/scheduled-events", major=guild_id, guild_id=guild_id)
+        return [RestScheduledEvent(self, e) for e in data]
+
+    async def create_scheduled_event(self, guild_id: int, payload: dict):
+        data = await self.request("POST", "/guilds/{guild_id}/scheduled-events", major=guild_id,
+                                  json=payload, guild_id=guild_id)
+        return RestScheduledEvent(self, data)
+
+    async def edit_scheduled_event(self, guild_id: int, event_id: int, payload: dict):
+        data = await self.request("PATCH", "/guilds/{guild_id}/scheduled-events/{event_id}", major=guild_id,
+                                  json=payload, guild_id=guild_id, event_id=event_id)
+        return RestScheduledEvent(self, data)
+
+    async def channel_messages(self, channel_id: int, limit: int = 100, before: int = None):
+        params = {"limit": str(limit)}
+        if before:
+            params["before"] = str(before)
+        data = await self.request("GET", "/channels/{channel_id}/messages", major=channel_id,
+                                  params=params, channel_id=channel_id)
+        return [RestMessage(self, m) for m in data]
+
+    async def send_message(self, channel_id: int, content: str, allowed_mentions: dict = None):
+        payload = {"content": content}
+        if allowed_mentions is not None:
+            payload["allowed_mentions"] = allowed_mentions
+        data = await self.request("POST", "/channels/{channel_id}/messages", major=channel_id,
+                                  json=payload, channel_id=channel_id)
+        return RestMessage(self, data)
+
+    async def delete_message(self, channel_id: int, message_id: int):
+        await self.request("DELETE", "/channels/{channel_id}/messages/{message_id}", major=channel_id,
+                           channel_id=channel_id, message_id=message_id)
+
+    async def create_forum_thread(self, channel_id: int, name: str, content: str, applied_tags=()):
+        payload = {"name": name, "message": {"content": content}, "applied_tags": [str(t) for t in applied_tags]}
+        return await self.request("POST", "/channels/{channel_id}/threads", major=channel_id,
+                                  json=payload, channel_id=channel_id)
+
+
+# ============================================================
+#                          WEBHOOKS
+# ============================================================
+
+async def webhook_send(url: str, content: str, allowed_mentions: dict = None,
+                       session: aiohttp.ClientSession = None) -> bool:
+    """
+    Post `content` to a webhook. Waits out 429s, prints and returns False on any
+    other failure (like the old requests-based helpers), never raises.
+    Pass `session` to reuse one connection pool across several sends.
+    """
+    if not url:
+        print("Missing DISCORD_WEBHOOK in environment.")
+        return False
+    if session is None:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=WEBHOOK_TIMEOUT)) as own:
+            return await webhook_send(url, content, allowed_mentions, own)
+
+    payload = {"content": content}
+    if allowed_mentions is not None:
+        payload["allowed_mentions"] = allowed_mentions
+    try:
+        for _ in range(REST_MAX_RETRIES):
+            async with session.post(url, json=payload, headers={"User-Agent": USER_AGENT},
+                                    timeout=aiohttp.ClientTimeout(total=WEBHOOK_TIMEOUT)) as resp:
+                if resp.status == 429:
+                    data = await resp.json(content_type=None)
+                    await asyncio.sleep(float(data.get("retry_after", 1)))
+                    continue
+                # Discord webhook success is usually 204 No Content (sometimes 200)
+                if resp.status not in (200, 204):
+                    print(f"Webhook failed: {resp.status} {await resp.text()}")
+                    return False
+                return True
+        print("Webhook failed: rate limited too many times")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Webhook failed: {e!r}")
+    return False
+
+
+# ============================================================
+#            discord.py-shaped objects for the jobs
+# ============================================================
+
+class RestUser:
+
+    def __init__(self, data: dict):
+        self.id = int(data["id"])
+        self.name = data.get("username", "")
+
+    def __eq__(self, other):
+        return getattr(other, "id", None) == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def mention(self):
+        return f"<@{self.id}>"
+
+
+class RestMessage:
+
+    def __init__(self, api: DiscordREST, data: dict):
+        self.api = api
+        self.id = int(data["id"])
+        self.channel_id = int(data["channel_id"])
+        self.content = data.get("content", "")
+        self.author = RestUser(data["author"]) if data.get("author") else None
+
+    async def delete(self):
+        await self.api.delete_message(self.channel_id, self.id)
+
+
+class RestForumTag:
+
+    def __init__(self, data: dict):
+        self.id = int(data["id"])
+        self.name = data.get("name", "")
+
+
+class RestChannel:
+
+    def __init__(self, api: DiscordREST, data: dict):
+        self.api = api
+        self.id = int(data["id"])
+        self.name = data.get("name", "")
+        self.type = discord.ChannelType(data.get("type", 0))
+        self.available_tags = [RestForumTag(t) for t in data.get("available_tags", [])]
+
+    def __str__(self):
+        return self.name
+
+    async def history(self, limit: int = 100):
+        """Newest first, paged 100 at a time like discord.py's TextChannel.history."""
+        before = None
+        while limit > 0:
+            page = await self.api.channel_messages(self.id, min(limit, 100), before)
+            for msg in page:
+                yield msg
+            if len(page) < min(limit, 100):
+                return
+            limit -= len(page)
+            before = page[-1].id
+
+    async def send(self, content: str, allowed_mentions: discord.AllowedMentions = None):
+        return await self.api.send_message(
+            self.id, content, allowed_mentions.to_dict() if allowed_mentions is not None else None
+        )
+
+    async def create_thread(self, name: str, content: str, applied_tags=()):
+        return await self.api.create_forum_thread(self.id, name, content, [t.id for t in applied_tags])
+
+
+class RestScheduledEvent:
+
+    def __init__(self, api: DiscordREST, data: dict):
+        self.api = api
+        self.id = int(data["id"])
+        self.guild_id = int(data["guild_id"])
+        self.name = data.get("name", "")
+        self.description = data.get("description")
+        self.start_time = _parse_time(data.get("scheduled_start_time"))
+        self.end_time = _parse_time(data.get("scheduled_end_time"))
+        self.status = discord.EventStatus(data.get("status", 1))
+        self.entity_type = discord.EntityType(data.get("entity_type", 3))
+
+    @property
+    def url(self):
+        return f"https://discord.com/events/{self.guild_id}/{self.id}"
+
+    async def edit(self, start_time: datetime = None, end_time: datetime = None, description: str = None, name: str = None):
+        payload = {}
+        if name is not None:
+            payload["name"] = name
+        if start_time is not None:
+            payload["scheduled_start_time"] = start_time.isoformat()
+        if end_time is not None:
+            payload["scheduled_end_time"] = end_time.isoformat()
+        if description is not None:
+            payload["description"] = description
+        return await self.api.edit_scheduled_event(self.guild_id, self.id, payload)
+
+
+class RestGuild:
+
+    def __init__(self, api: DiscordREST, data: dict):
+        self.api = api
+        self.id = int(data["id"])
+        self.name = data.get("name", "")
+
+    def get_channel(self, channel_id: int):
+        return None  # no cache without a gateway; callers fall back to fetch_channel
+
+    async def fetch_channel(self, channel_id: int) -> RestChannel:
+        return await self.api.fetch_channel(channel_id)
+
+    async def fetch_scheduled_events(self):
+        return await self.api.list_scheduled_events(self.id)
+
+    async def create_scheduled_event(self, name: str, start_time: datetime, end_time: datetime = None,
+                                     description: str = None, privacy_level=discord.PrivacyLevel.guild_only,
+                                     entity_type=discord.EntityType.external, location: str = None,
+                                     channel=None, image: bytes = None):
+        payload = {
+            "name": name,
+            "scheduled_start_time": start_time.isoformat(),
+            "privacy_level": privacy_level.value,
+            "entity_type": entity_type.value,
+        }
+        if end_time is not None:
+            payload["scheduled_end_time"] = end_time.isoformat()
+        if description is not None:
+            payload["description"] = description
+        if location is not None:
+            payload["entity_metadata"] = {"location": location}
+        if channel is not None:
+            payload["channel_id"] = str(channel.id)
+        if image is not None:
+            payload["image"] = _image_data(image)
+        return await self.api.create_scheduled_event(self.id, payload)
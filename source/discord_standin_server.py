@@ -0,0 +1,189 @@
+"""
+Local stand-in for the parts of the Discord REST API used by discord_rest.py,
+for dry runs of the cron scripts without touching the real server.
+
+    python -m source.discord_standin_server --port 8766 --rate-limit 5
+    DISCORD_API_BASE=http://127.0.0.1:8766/api/v10 python -m source.popo_bot_conference_dates
+
+Keeps one guild with its scheduled events, channels, messages and forum threads
+in memory. Each bucket (route + channel/guild) allows --rate-limit requests per
+second and answers 429 beyond that, with the same X-RateLimit-* headers Discord sends.
+"""
+
+import re
+import json
+import time
+import argparse
+import itertools
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+GUILD_ID = "100"
+BOT_USER = {"id": "1", "username": "popo-standin", "bot": True}
+
+
+class StandInState:
+
+    def __init__(self, channels=None):
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1000)
+        self.events = {}
+        self.messages = {}  # channel id -> [message, ...] oldest first
+        self.threads = []
+        self.channels = channels or {
+            "200": {"id": "200", "type": 0, "name": "general"},
+            "201": {"id": "201", "type": 2, "name": "voice"},
+            "202": {"id": "202", "type": 15, "name": "positions",
+                    "available_tags": [{"id": "1447846201201393738", "name": "job"},
+                                       {"id": "1447846351156150283", "name": "internship"}]},
+        }
+        self.windows = {}   # bucket -> (window start, count)
+
+    def new_id(self):
+        return str(next(self.ids))
+
+    def allow(self, bucket, limit):
+        """(allowed, remaining, reset_after) for a fixed one-second window per bucket."""
+        now = time.monotonic()
+        start, count = self.windows.get(bucket, (now, 0))
+        if now - start >= 1.0:
+            start, count = now, 0
+        if count >= limit:
+            return False, 0, 1.0 - (now - start)
+        self.windows[bucket] = (start, count + 1)
+        return True, limit - count - 1, 1.0 - (now - start)
+
+
+ROUTES = [
+    ("GET", re.compile(r"/users/@me$"), "me"),
+    ("GET", re.compile(r"/users/@me/guilds$"), "guilds"),
+    ("GET", re.compile(r"/guilds/(\d+)/scheduled-events$"), "list_events"),
+    ("POST", re.compile(r"/guilds/(\d+)/scheduled-events$"), "create_event"),
+    ("PATCH", re.compile(r"/guilds/(\d+)/scheduled-events/(\d+)$"), "edit_event"),
+    ("GET", re.compile(r"/channels/(\d+)$"), "channel"),
+    ("GET", re.compile(r"/channels/(\d+)/messages$"), "messages"),
+    ("POST", re.compile(r"/channels/(\d+)/messages$"), "send"),
+    ("DELETE", re.compile(r"/channels/(\d+)/messages/(\d+)$"), "delete"),
+    ("POST", re.compile(r"/channels/(\d+)/threads$"), "thread"),
+]
+
+
+def make_handler(state: StandInState, rate_limit: int, delay: float):
+
+    class StandInHandler(BaseHTTPRequestHandler):
+
+        def _send(self, status, payload=None, headers=None):
+            data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            if payload is not None:
+                self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _handle(self):
+            path, _, query = self.path.partition("?")
+            path = re.sub(r"^/api/v\d+", "", path)
+            params = dict(p.split("=", 1) for p in query.split("&") if "=" in p)
+            length = int(self.headers.get("Content-Length", 0) or 0)
+            body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            time.sleep(delay)
+
+            for method, pattern, name in ROUTES:
+                m = pattern.match(path)
+                if method == self.command and m:
+                    break
+            else:
+                self._send(404, {"message": "404: Not Found", "code": 0})
+                return
+
+            bucket = f"{name}:{m.group(1) if m.groups() else ''}"
+            with state.lock:
+                allowed, remaining, reset_after = state.allow(bucket, rate_limit)
+            headers = {"X-RateLimit-Bucket": name, "X-RateLimit-Limit": str(rate_limit),
+                       "X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset-After": f"{reset_after:.3f}"}
+            if not allowed:
+                self._send(429, {"message": "You are being rate limited.", "retry_after": round(reset_after, 3),
+                                 "global": False}, headers)
+                return
+
+            with state.lock:
+                status, payload = getattr(self, "route_" + name)(*m.groups(), body=body, params=params)
+            self._send(status, payload, headers)
+
+        # ---- routes ----
+        def route_me(self, body, params):
+            return 200, BOT_USER
+
+        def route_guilds(self, body, params):
+            return 200, [{"id": GUILD_ID, "name": "Stand-in Guild"}]
+
+        def route_list_events(self, guild_id, body, params):
+            return 200, list(state.events.values())
+
+        def route_create_event(self, guild_id, body, params):
+            event = {"id": state.new_id(), "guild_id": guild_id, "status": 1, "description": None,
+                     "scheduled_end_time": None, **body}
+            event.pop("image", None)
+            state.events[event["id"]] = event
+            return 200, event
+
+        def route_edit_event(self, guild_id, event_id, body, params):
+            if event_id not in state.events:
+                return 404, {"message": "Unknown Guild Scheduled Event", "code": 10070}
+            state.events[event_id].update(body)
+            return 200, state.events[event_id]
+
+        def route_channel(self, channel_id, body, params):
+            if channel_id not in state.channels:
+                return 404, {"message": "Unknown Channel", "code": 10003}
+            return 200, state.channels[channel_id]
+
+        def route_messages(self, channel_id, body, params):
+            newest_first = list(reversed(state.messages.get(channel_id, [])))
+            if "before" in params:
+                newest_first = [m for m in newest_first if int(m["id"]) < int(params["before"])]
+            return 200, newest_first[:int(params.get("limit", 50))]
+
+        def route_send(self, channel_id, body, params):
+            msg = {"id": state.new_id(), "channel_id": channel_id, "author": BOT_USER,
+                   "content": body.get("content", ""), "timestamp": datetime.now(timezone.utc).isoformat()}
+            state.messages.setdefault(channel_id, []).append(msg)
+            return 200, msg
+
+        def route_delete(self, channel_id, message_id, body, params):
+            state.messages[channel_id] = [m for m in state.messages.get(channel_id, []) if m["id"] != message_id]
+            return 204, None
+
+        def route_thread(self, channel_id, body, params):
+            thread = {"id": state.new_id(), "parent_id": channel_id, "type": 11, "name": body.get("name"),
+                      "applied_tags": body.get("applied_tags", [])}
+            state.threads.append({**thread, "message": body.get("message", {})})
+            return 201, thread
+
+        do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+        def log_message(self, fmt, *args):
+            print(f"[stand-in] {self.command} {self.path} {args[1] if len(args) > 1 else ''}")
+
+    return StandInHandler
+
+
+def serve(port: int = 8766, rate_limit: int = 5, delay: float = 0.0, state: StandInState = None):
+    state = state or StandInState()
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state, rate_limit, delay))
+    server.state = state
+    print(f"✅ Discord stand-in listening on http://127.0.0.1:{port}/api/v10")
+    return server
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--rate-limit", type=int, default=5, help="requests per second per bucket")
+    ap.add_argument("--delay", type=float, default=0.0)
+    args = ap.parse_args()
+    serve(args.port, args.rate_limit, args.delay).serve_forever()
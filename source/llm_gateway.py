@@ -0,0 +1,277 @@
+"""
+One gateway for every OpenAI call in this repo.
+
+- Persistent response cache (SQLite) keyed by model + prompt hash, with TTL,
+  so identical re-runs cost nothing.
+- Global concurrency limit shared by all threads in the process.
+- Retries with jittered exponential backoff on the flex tier, escalating to the
+  default tier once the flex budget of the deadline is used up.
+- Per-caller latency / token / cost counters (printed at exit).
+
+Set OPENAI_BASE_URL to point at a local stand-in server (see llm_standin_server.py).
+"""
+
+import os
+import json
+import time
+import atexit
+import random
+import hashlib
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import Optional
+from dotenv import load_dotenv
+
+# ---- Config ----
+load_dotenv()
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # e.g. http://127.0.0.1:8765/v1 for the stand-in
+LLM_CACHE_FILE = os.getenv("LLM_CACHE_FILE", "llm_cache.sqlite")
+LLM_CACHE_TTL = 7 * 24 * 3600           # seconds
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_DEADLINE = 300                       # seconds per call, all attempts included
+LLM_FLEX_SHARE = 0.6                     # share of the deadline spent on flex before escalating
+LLM_REQUEST_TIMEOUT = 120                # seconds per HTTP attempt
+BACKOFF_BASE = 2.0
+BACKOFF_CAP = 30.0
+# Errors that will not go away by retrying
+NON_RETRYABLE = ("AuthenticationError", "PermissionDeniedError", "NotFoundError",
+                 "BadRequestError", "UnprocessableEntityError")
+
+# USD per 1M tokens (input, output) on the default tier; flex is half price.
+MODEL_PRICES = {
+    "gpt-5": (1.25, 10.00),
+    "gpt-5-mini": (0.25, 2.00),
+    "gpt-5-nano": (0.05, 0.40),
+}
+TIER_DISCOUNT = {"flex": 0.5, "default": 1.0}
+
+_client = None
+_client_lock = threading.Lock()
+_cache_lock = threading.Lock()
+_cache_conn = None
+_slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+
+_metrics_lock = threading.Lock()
+_metrics = defaultdict(lambda: {
+    "calls": 0, "cache_hits": 0, "errors": 0, "escalations": 0,
+    "latency_s": 0.0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0,
+})
+
+
+class LLMError(Exception):
+    """Raised when a call could not be completed before its deadline."""
+
+
+def get_client():
+    """Shared OpenAI client (created lazily so importing this module needs no key)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            from openai import OpenAI
+            _client = OpenAI(
+                api_key=OPENAI_API_KEY or "stand-in",
+                base_url=OPENAI_BASE_URL,
+                timeout=LLM_REQUEST_TIMEOUT,
+                max_retries=0,  # retries are handled here
+            )
+        return _client
+
+
+# ============================================================
+#                       RESPONSE CACHE
+# ============================================================
+
+def _cache():
+    global _cache_conn
+    if _cache_conn is None:
+        _cache_conn = sqlite3.connect(LLM_CACHE_FILE, check_same_thread=False)
+        with _cache_conn:
+            _cache_conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, text TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            # Expired rows are skipped on read; drop them once per process so the file doesn't grow forever
+            _cache_conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - LLM_CACHE_TTL,))
+    return _cache_conn
+
+
+def cache_key(api: str, model: str, system: str, prompt: str) -> str:
+    payload = json.dumps([api, model, system, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_get(key: str, ttl: float = LLM_CACHE_TTL) -> Optional[str]:
+    with _cache_lock:
+        row = _cache().execute("SELECT text, created FROM responses WHERE key = ?", (key,)).fetchone()
+    if row and time.time() - row[1] <= ttl:
+        return row[0]
+    return None
+
+
+def cache_put(key: str, text: str):
+    with _cache_lock:
+        conn = _cache()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, text, created) VALUES (?, ?, ?)",
+                (key, text, time.time()),
+            )
+
+
+def cache_prune(ttl: float = LLM_CACHE_TTL) -> int:
+    """Delete expired cache rows. Returns the number removed."""
+    with _cache_lock:
+        conn = _cache()
+        with conn:
+            cur = conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - ttl,))
+    return cur.rowcount
+
+
+# ============================================================
+#                          METRICS
+# ============================================================
+
+def _record(caller: str, **values):
+    with _metrics_lock:
+        m = _metrics[caller]
+        for k, v in values.items():
+            m[k] += v
+
+
+def estimate_cost(model: str, tier: str, input_tokens: int, output_tokens: int) -> float:
+    price_in, price_out = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (input_tokens * price_in + output_tokens * price_out) / 1_000_000 * TIER_DISCOUNT.get(tier, 1.0)
+
+
+def get_metrics() -> dict:
+    with _metrics_lock:
+        return {caller: dict(m) for caller, m in _metrics.items()}
+
+
+def print_metrics():
+    metrics = get_metrics()
+    if not metrics:
+        return
+    print("[i] LLM usage by caller:")
+    for caller, m in sorted(metrics.items()):
+        print(
+            f"    {caller}: {m['calls']} call(s), {m['cache_hits']} cached, {m['errors']} error(s), "
+            f"{m['escalations']} escalated, {m['latency_s']:.1f}s, "
+            f"{m['input_tokens']} in / {m['output_tokens']} out tokens, ${m['cost_usd']:.4f}"
+        )
+
+
+atexit.register(print_metrics)
+
+
+# ============================================================
+#                           CALLS
+# ============================================================
+
+def _extract_text(api: str, resp) -> str:
+    if api == "chat":
+        return resp.choices[0].message.content or ""
+
+    parts = []
+    # Preferred: direct output_text if available
+    if getattr(resp, "output_text", None):
+        parts.append(resp.output_text)
+    # Fallback: loop through structured outputs
+    elif getattr(resp, "output", None):
+        for o in resp.output:
+            if getattr(o, "content", None):
+                for c in o.content:
+                    if c.type == "output_text":
+                        parts.append(c.text)
+    return "\n".join(parts).strip()
+
+
+def _usage(api: str, resp):
+    usage = getattr(resp, "usage", None)
+    if usage is None:
+        return 0, 0
+    if api == "chat":
+        return usage.prompt_tokens or 0, usage.completion_tokens or 0
+    return usage.input_tokens or 0, usage.output_tokens or 0
+
+
+def _create(api: str, model: str, system: str, prompt: str, tier: str, timeout: float):
+    client = get_client()
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": prompt},
+    ]
+    if api == "chat":
+        return client.chat.completions.create(
+            model=model, messages=messages, service_tier=tier, timeout=timeout,
+        )
+    return client.responses.create(
+        model=model, input=messages, service_tier=tier, timeout=timeout,
+    )
+
+
+def complete(
+    caller: str,
+    model: str,
+    system: str,
+    prompt: str,
+    api: str = "responses",
+    deadline: float = LLM_DEADLINE,
+    cache_ttl: float = LLM_CACHE_TTL,
+) -> str:
+    """
+    Return the model's text output for (system, prompt).
+    `api` is "responses" or "chat". Raises LLMError if every attempt fails before the deadline.
+    """
+    key = cache_key(api, model, system, prompt)
+    if cache_ttl > 0:
+        cached = cache_get(key, cache_ttl)
+        if cached is not None:
+            _record(caller, calls=1, cache_hits=1)
+            return cached
+
+    start = time.monotonic()
+    flex_until = start + deadline * LLM_FLEX_SHARE
+    give_up_at = start + deadline
+    tier = "flex"
+    attempt = 0
+    last_error = None
+
+    while True:
+        now = time.monotonic()
+        if now >= give_up_at:
+            break
+        if tier == "flex" and now >= flex_until:
+            print(f"[i] {caller}: flex budget used up, escalating to default tier")
+            tier = "default"
+            _record(caller, escalations=1)
+
+        attempt += 1
+        timeout = max(1.0, min(LLM_REQUEST_TIMEOUT, give_up_at - now))
+        t0 = time.monotonic()
+        try:
+            with _slots:
+                resp = _create(api, model, system, prompt, tier, timeout)
+            text = _extract_text(api, resp)
+            input_tokens, output_tokens = _usage(api, resp)
+            _record(
+                caller, calls=1, latency_s=time.monotonic() - t0,
+                input_tokens=input_tokens, output_tokens=output_tokens,
+                cost_usd=estimate_cost(model, tier, input_tokens, output_tokens),
+            )
+            if cache_ttl > 0 and text and text.strip():  # don't replay an empty reply for a week
+                cache_put(key, text)
+            return text
+        except Exception as e:
+            last_error = e
+            _record(caller, errors=1, latency_s=time.monotonic() - t0)
+            print(f"[warn] {caller}: attempt {attempt} ({tier}) failed: {e}")
+            if type(e).__name__ in NON_RETRYABLE:
+                break
+
+        # Full-jitter exponential backoff, never sleeping past the deadline
+        delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1)))
+        time.sleep(max(0.0, min(delay, give_up_at - time.monotonic())))
+
+    raise LLMError(f"{caller}: no response from {model} within {deadline}s ({last_error})")
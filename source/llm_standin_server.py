@@ -0,0 +1,100 @@
+"""
+Local stand-in for the OpenAI API, for dry runs of the scripts without cost.
+
+    python -m source.llm_standin_server --port 8765 --reply '{}'
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python -m source.conference_dates_to_discord
+
+Answers /v1/chat/completions and /v1/responses with a fixed reply and fake usage.
+"""
+
+import json
+import time
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(reply: str, delay: float):
+
+    class StandInHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)) or 0)
+            try:
+                request = json.loads(body or b"{}")
+            except ValueError:
+                request = {}
+            prompt_tokens = len(body) // 4
+            output_tokens = max(1, len(reply) // 4)
+            time.sleep(delay)
+
+            if self.path.endswith("/chat/completions"):
+                payload = {
+                    "id": "chatcmpl-standin",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model", "stand-in"),
+                    "choices": [{
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": reply},
+                    }],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": output_tokens,
+                        "total_tokens": prompt_tokens + output_tokens,
+                    },
+                }
+            elif self.path.endswith("/responses"):
+                payload = {
+                    "id": "resp-standin",
+                    "object": "response",
+                    "created_at": int(time.time()),
+                    "model": request.get("model", "stand-in"),
+                    "status": "completed",
+                    "output": [{
+                        "id": "msg-standin",
+                        "type": "message",
+                        "role": "assistant",
+                        "status": "completed",
+                        "content": [{"type": "output_text", "text": reply, "annotations": []}],
+                    }],
+                    "parallel_tool_calls": False,
+                    "tool_choice": "auto",
+                    "tools": [],
+                    "usage": {
+                        "input_tokens": prompt_tokens,
+                        "output_tokens": output_tokens,
+                        "total_tokens": prompt_tokens + output_tokens,
+                        "input_tokens_details": {"cached_tokens": 0},
+                        "output_tokens_details": {"reasoning_tokens": 0},
+                    },
+                }
+            else:
+                self.send_error(404)
+                return
+
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, fmt, *args):
+            print(f"[stand-in] {self.command} {self.path}")
+
+    return StandInHandler
+
+
+def serve(port: int = 8765, reply: str = "{}", delay: float = 0.0):
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(reply, delay))
+    print(f"✅ OpenAI stand-in listening on http://127.0.0.1:{port}/v1")
+    return server
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--reply", default="{}")
+    ap.add_argument("--delay", type=float, default=0.0)
+    args = ap.parse_args()
+    serve(args.port, args.reply, args.delay).serve_forever()
@@ -1,25 +1,15 @@
-import requests
+from source.discord_rest import webhook_send
 
-def monday_alerts_end(today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS):
+async def monday_alerts_end(today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS):
     """Send final Monday announcement via webhook."""
 
     if not today_is_monday:
         return
 
-    if not DISCORD_WEBHOOK_ANNOUNCEMENTS:
-        print("Missing DISCORD_WEBHOOK in environment.")
-        return
-
-    response = requests.post(
+    await webhook_send(
         DISCORD_WEBHOOK_ANNOUNCEMENTS,
-        json={
-            "content": "That's all the Monday announcements @everyone!\nHave a nice week! 😄",
-            "allowed_mentions": {
-                "parse": ["everyone"]  # 👈 REQUIRED
-            }
-        }
+        "That's all the Monday announcements @everyone!\nHave a nice week! 😄",
+        allowed_mentions={
+            "parse": ["everyone"]  # 👈 REQUIRED
+        },
     )
-
-    if response.status_code not in (200, 204):
-        print(f"Webhook failed: {response.status_code} {response.text}")
-
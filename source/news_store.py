@@ -0,0 +1,119 @@
+"""
+Local news article store for the Monday digest.
+A small SQLite file that the daily harvest appends to (deduped by link and
+normalized title) and that gpt_news reads its time windows from.
+"""
+
+import re
+import string
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional
+from dateutil import parser as dtparser
+
+NEWS_DB_FILE = "news_store.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    link TEXT NOT NULL,
+    norm_title TEXT NOT NULL,
+    title TEXT NOT NULL,
+    published TEXT,          -- ISO 8601 in UTC, so text order == time order
+    query TEXT,
+    first_seen TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_link ON articles(link);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_norm_title ON articles(norm_title);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def normalize_title(title: str) -> str:
+    # Lowercase + strip punctuation and whitespace
+    return re.sub(rf"[{re.escape(string.punctuation)}\s]+", "", title.lower())
+
+
+def to_utc_iso(published: Optional[str]) -> Optional[str]:
+    """Parse any RSS date string into a UTC ISO timestamp (None if unparsable)."""
+    if not published:
+        return None
+    try:
+        dt = dtparser.parse(published)
+    except Exception:
+        return None
+    # If parsed datetime has no tz (e.g., just a date), assume UTC midnight
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def connect(path: str = NEWS_DB_FILE) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def add_articles(conn: sqlite3.Connection, items: List[Dict[str, Any]]) -> int:
+    """Insert new articles, skipping ones already stored (same link or same normalized title)."""
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    rows = []
+    for it in items:
+        title = (it.get("title") or "").strip()
+        link = it.get("link") or ""
+        norm = normalize_title(title)
+        if not link or not norm:
+            continue
+        rows.append((link, norm, title, to_utc_iso(it.get("published")), it.get("query"), now))
+
+    with conn:
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO articles (link, norm_title, title, published, query, first_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        added = conn.total_changes - before
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_harvest', ?)", (now,)
+        )
+    return added
+
+
+def last_harvest(conn: sqlite3.Connection) -> Optional[datetime]:
+    row = conn.execute("SELECT value FROM meta WHERE key = 'last_harvest'").fetchone()
+    return datetime.fromisoformat(row["value"]) if row else None
+
+
+def query_window(
+    conn: sqlite3.Connection,
+    days: int,
+    exclude_days: int = 0,
+    limit: int = 2000,
+) -> List[Dict[str, Any]]:
+    """
+    Articles published in the past `days`, excluding the most recent `exclude_days`,
+    newest first. Same semantics as gpt_news' filter_by_window, but an index range scan.
+    """
+    now = datetime.now(timezone.utc)
+    since = (now - timedelta(days=days)).isoformat(timespec="seconds")
+    until = (now - timedelta(days=exclude_days)).isoformat(timespec="seconds") if exclude_days else None
+
+    sql = "SELECT title, link, published, query FROM articles WHERE published >= ?"
+    params: list = [since]
+    if until:
+        sql += " AND published < ?"
+        params.append(until)
+    sql += " ORDER BY published DESC LIMIT ?"
+    params.append(limit)
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def all_articles(conn: sqlite3.Connection, days: int = 365) -> List[Dict[str, Any]]:
+    """Everything from the past `days` (used for mapping titles back to links)."""
+    return query_window(conn, days, limit=-1)
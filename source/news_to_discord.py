@@ -11,6 +11,7 @@ import time
 import json
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
 import feedparser
 from dateutil import parser as dtparser
 import requests
@@ -18,13 +19,160 @@ import urllib.parse
 # from bs4 import BeautifulSoup  # already useful for cleaning
 from dotenv import load_dotenv
 import re
-import string
+from source import news_store
+from source import llm_gateway
+from source.title_index import TitleIndex
+from source.url_resolver import LinkResolver
 
 # -----------------------------
 # Load environment variables
 # -----------------------------
 load_dotenv()  # loads .env in the same directory
 
+# -----------------------------
+# Config
+# -----------------------------
+SEARCH_TERMS = [
+    '"educational assessment"',
+    '"standardized testing" legislation OR politics',
+    '"psychometrics"',
+    '"psychometrician"',
+    '"psychological assessment"',
+    '"educational measurement"',
+    # '"psychometrics career" OR "psychometricians job market"',
+    '"testing agency"',
+    '"assessment company"',
+    '"standardized assessment"',
+    # 'Department of education',
+    "NAEP assessment",
+    "PISA assessment",
+    '"acquisition" OR "merge" assessment company',
+    'No Child Left Behind',
+]
+
+GOOGLE_NEWS_RSS_TMPL = "https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
+MAX_ARTICLES_PER_WINDOW = 2000
+MAX_PER_QUERY = 999
+HTTP_TIMEOUT = 15
+
+# Windows are read from the local news store (filled by harvest_news_daily).
+# Monday only re-harvests when the last daily harvest is older than this.
+USE_NEWS_STORE = True
+NEWS_STORE_MAX_AGE = timedelta(hours=20)
+
+# Swap news.google.com redirect links for publisher URLs (cached across runs)
+RESOLVE_LINKS = True
+
+
+# -----------------------------
+# Harvest helpers
+# -----------------------------
+def fetch_rss_for_query(query: str):
+    """
+    Fetch RSS items from Google News for a given query.
+    Resolves each link to its final destination.
+    """
+    encoded_query = urllib.parse.quote_plus(query)
+    url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
+    feed = feedparser.parse(url)
+
+    items = []
+    for entry in feed.entries[:MAX_PER_QUERY]:
+        title = getattr(entry, "title", "").strip()
+        link = getattr(entry, "link", "")
+        # link = resolve_final_url(getattr(entry, "link", ""))
+        # Summary is actually the same as title. redundant.
+        # summary_raw = getattr(entry, "summary", "")
+        # summary = clean_summary(summary_raw)
+
+        # Try published date
+        published = None
+        for attr in ("published", "updated"):
+            if hasattr(entry, attr):
+                try:
+                    dt = dtparser.parse(getattr(entry, attr))
+                    published = dt.date().isoformat()  # YYYY-MM-DD only
+                    break
+                except Exception:
+                    pass
+
+
+        published = None
+        if hasattr(entry, "published"):
+            try:
+                published = dtparser.parse(entry.published).isoformat()
+            except Exception:
+                pass
+        elif hasattr(entry, "updated"):
+            try:
+                published = dtparser.parse(entry.updated).isoformat()
+            except Exception:
+                pass
+
+        items.append({
+            "title": title,
+            "link": link,
+            # "summary": summary,
+            "published": published,
+            "query": query,   # 👈 add back so payload has context
+        })
+    return items
+
+
+def harvest_articles(terms: List[str]) -> List[Dict[str, Any]]:
+    all_items = []
+    for q in terms:
+        try:
+            items = fetch_rss_for_query(q)
+            all_items.extend(items)
+            time.sleep(0.4)
+        except Exception as e:
+            print(f"[warn] RSS fetch failed for: {q} :: {e}", file=sys.stderr)
+
+    # Deduplicate by link or title
+    seen = set()
+    deduped = []
+    for it in all_items:
+        key = it.get("link") or it.get("title")
+        if key and key not in seen:
+            seen.add(key)
+            deduped.append(it)
+
+    # Sort by published date (newest first)
+    def sort_key(it):
+        pub = it.get("published")
+        if not pub:
+            return datetime.min  # put undated at the end
+        try:
+            return dtparser.parse(pub)
+        except Exception:
+            return datetime.min
+
+    deduped.sort(key=sort_key, reverse=True)
+    return deduped
+
+
+def harvest_news_daily():
+    """Daily harvest: append new Google News items to the local news store."""
+    print("[i] harvesting news into store…")
+    items = harvest_articles(SEARCH_TERMS)
+    conn = news_store.connect()
+    try:
+        added = news_store.add_articles(conn, items)
+    finally:
+        conn.close()
+    print(f"[ok] stored {added} new article(s) out of {len(items)} harvested")
+
+    if RESOLVE_LINKS:
+        # Warm the resolver cache so Monday's digest only needs lookups
+        resolver = LinkResolver()
+        try:
+            resolver.resolve(it["link"] for it in items)
+        finally:
+            resolver.close()
+    return added
+
+
 def gpt_news(today_is_monday, DISCORD_WEBHOOK_URL):
 
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -32,52 +180,26 @@ def gpt_news(today_is_monday, DISCORD_WEBHOOK_URL):
     # OPENAI_MODEL = "gpt-5-nano"
     OPENAI_MODEL = "gpt-5-mini"
 
-    if not OPENAI_API_KEY:
+    if not OPENAI_API_KEY and not llm_gateway.OPENAI_BASE_URL:
         print("ERROR: Please set OPENAI_API_KEY in your .env", file=sys.stderr)
         sys.exit(1)
 
-    # -----------------------------
-    # Config
-    # -----------------------------
-    SEARCH_TERMS = [
-        '"educational assessment"',
-        '"standardized testing" legislation OR politics',
-        '"psychometrics"',
-        '"psychometrician"',
-        '"psychological assessment"',
-        '"educational measurement"',
-        # '"psychometrics career" OR "psychometricians job market"',
-        '"testing agency"',
-        '"assessment company"',
-        '"standardized assessment"',
-        # 'Department of education',
-        "NAEP assessment",
-        "PISA assessment",
-        '"acquisition" OR "merge" assessment company',
-        'No Child Left Behind',
+    # Map-reduce summarization: each window is split into shards that are
+    # summarized concurrently, then reduced into one section per window.
+    USE_MAP_REDUCE = True
+    SHARD_SIZE = 150
+    MAX_PARALLEL_SHARDS = 6
+    NEWS_WINDOWS = [
+        # (payload key, heading, days, exclude_days)
+        ("last_7_days", "## :newspaper2: Past 7 Days", 7, 0),
+        ("last_60_days_excluding_past_7_days", "## :newspaper2: Past 60 Days", 60, 7),
+        ("last_365_days_excluding_past_60_days", "## :newspaper2: Past Year", 365, 60),
     ]
 
-    GOOGLE_NEWS_RSS_TMPL = "https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
-    MAX_ARTICLES_PER_WINDOW = 2000
-    MAX_PER_QUERY = 999
-    HTTP_TIMEOUT = 15
-
     # -----------------------------
     # Helpers
     # -----------------------------
 
-    # def resolve_final_url(url: str) -> str: # doesnt work right now.
-    #     """
-    #     Follow redirects and return the final destination URL.
-    #     Useful for Google News RSS or other aggregator links.
-    #     """
-    #     try:
-    #         resp = requests.head(url, allow_redirects=True, timeout=10)
-    #         return resp.url
-    #     except Exception as e:
-    #         print(f"[warn] Could not resolve {url}: {e}")
-    #         return url  # fallback to original
-
     # def clean_summary(summary: str) -> str:
     #     if not summary:
     #         return ""
@@ -85,91 +207,6 @@ def gpt_news(today_is_monday, DISCORD_WEBHOOK_URL):
     #     text = BeautifulSoup(summary, "html.parser").get_text(" ", strip=True)
     #     return text
 
-    def fetch_rss_for_query(query: str):
-        """
-        Fetch RSS items from Google News for a given query.
-        Resolves each link to its final destination.
-        """
-        encoded_query = urllib.parse.quote_plus(query)
-        url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
-        feed = feedparser.parse(url)
-
-        items = []
-        for entry in feed.entries[:MAX_PER_QUERY]:
-            title = getattr(entry, "title", "").strip()
-            link = getattr(entry, "link", "")
-            # link = resolve_final_url(getattr(entry, "link", ""))
-            # Summary is actually the same as title. redundant.
-            # summary_raw = getattr(entry, "summary", "")
-            # summary = clean_summary(summary_raw)
-
-            # Try published date
-            published = None
-            for attr in ("published", "updated"):
-                if hasattr(entry, attr):
-                    try:
-                        dt = dtparser.parse(getattr(entry, attr))
-                        published = dt.date().isoformat()  # YYYY-MM-DD only
-                        break
-                    except Exception:
-                        pass
-
-
-            published = None
-            if hasattr(entry, "published"):
-                try:
-                    published = dtparser.parse(entry.published).isoformat()
-                except Exception:
-                    pass
-            elif hasattr(entry, "updated"):
-                try:
-                    published = dtparser.parse(entry.updated).isoformat()
-                except Exception:
-                    pass
-
-            items.append({
-                "title": title,
-                "link": link,
-                # "summary": summary,
-                "published": published,
-                "query": query,   # 👈 add back so payload has context
-            })
-        return items
-
-
-    def harvest_articles(terms: List[str]) -> List[Dict[str, Any]]:
-        all_items = []
-        for q in terms:
-            try:
-                items = fetch_rss_for_query(q)
-                all_items.extend(items)
-                time.sleep(0.4)
-            except Exception as e:
-                print(f"[warn] RSS fetch failed for: {q} :: {e}", file=sys.stderr)
-
-        # Deduplicate by link or title
-        seen = set()
-        deduped = []
-        for it in all_items:
-            key = it.get("link") or it.get("title")
-            if key and key not in seen:
-                seen.add(key)
-                deduped.append(it)
-
-        # Sort by published date (newest first)
-        def sort_key(it):
-            pub = it.get("published")
-            if not pub:
-                return datetime.min  # put undated at the end
-            try:
-                return dtparser.parse(pub)
-            except Exception:
-                return datetime.min
-
-        deduped.sort(key=sort_key, reverse=True)
-        return deduped
-
-
     def filter_by_window(
         items: List[Dict[str, Any]],
         days: int,
@@ -229,13 +266,21 @@ def gpt_news(today_is_monday, DISCORD_WEBHOOK_URL):
         return {"window": window_name, "count": len(articles), "articles": articles}
 
 
+    SYSTEM_EDITOR = (
+        "You are a senior editor focusing on psychometrics, educational measurement, and psychological assessment news. "
+        "Prioritize: policy, legislation, politics, testing reforms, professional society updates, career news, "
+        "and media coverage. De-emphasize technical studies unless directly relevant. "
+    )
+
+    def create_response(model: str, system: str, user_input: Dict[str, Any]) -> str:
+        """Call the Responses API through the shared gateway and return the output text."""
+        return llm_gateway.complete(
+            "news_digest", model, system, json.dumps(user_input, ensure_ascii=False)
+        )
+
     def summarize_with_openai(model: str, windows_payload: Dict[str, Any]) -> str:
-        from openai import OpenAI
-        client = OpenAI(api_key=OPENAI_API_KEY)
         system = (
-            "You are a senior editor focusing on psychometrics, educational measurement, and psychological assessment news. "
-            "Prioritize: policy, legislation, politics, testing reforms, professional society updates, career news, "
-            "and media coverage. De-emphasize technical studies unless directly relevant. "
+            SYSTEM_EDITOR +
             "Summarize the important news and trends in a paragraph for each time window. "
             "Specify the country being discussed. Focus on United States but include some international news. "
             # "Many articles will be recent articles, so pay attention to the published dates and make sure your summary covers the entire timeframe."
@@ -258,50 +303,98 @@ def gpt_news(today_is_monday, DISCORD_WEBHOOK_URL):
             "task": "Summarize psychometrics/assessment-related news.",
             "windows": windows_payload,
         }
+        return create_response(model, system, user_input)
 
-        # Try up to 3 times on flex, then fallback to default
-        for attempt in range(3):
-            try:
-                print(f"[i] Attempt {attempt+1} with flex tier...")
-                resp = client.responses.create(
-                    model=model,
-                    input=[
-                        {"role": "system", "content": system},
-                        {"role": "user", "content": json.dumps(user_input, ensure_ascii=False)},
-                    ],
-                    # temperature=0.25, # gpt-5-nano/mini doesnt have temperature
-                    service_tier="flex",
-                )
-                break  # success
-            except Exception as e:
-                print(f"[warn] flex attempt {attempt+1} failed: {e}")
-                time.sleep(30)  # wait before retry
-        else:
-            # All flex attempts failed → fallback to default
-            print("[i] Falling back to default tier...")
-            resp = client.responses.create(
-                model=model,
-                input=[
-                    {"role": "system", "content": system},
-                    {"role": "user", "content": json.dumps(user_input, ensure_ascii=False)},
-                ],
-                # temperature=0.25, # gpt-5-nano/mini doesnt have temperature
-                service_tier="default",
-            )
-
-        # Extract text output
-        parts = []
-        # Preferred: direct output_text if available
-        if hasattr(resp, "output_text") and resp.output_text:
-            parts.append(resp.output_text)
-        # Fallback: loop through structured outputs
-        elif hasattr(resp, "output") and resp.output:
-            for o in resp.output:
-                if hasattr(o, "content") and o.content:
-                    for c in o.content:
-                        if c.type == "output_text":
-                            parts.append(c.text)
-        return "\n".join(parts).strip()
+    def summarize_shard(model: str, window_name: str, shard_no: int, n_shards: int,
+                        items: List[Dict[str, Any]]) -> str:
+        """Map step: condense one shard of a window into short notes plus candidate source titles."""
+        system = (
+            SYSTEM_EDITOR +
+            "You are given one part of a larger list of news articles. "
+            "Write up to 8 short bullet notes on the most important news and trends in this part, "
+            "specifying the country being discussed. "
+            "Then list up to 7 of the most important article titles, one per line, starting with '* '. "
+            "Keep the titles exactly unchanged. Use plain text only."
+        )
+        user_input = {
+            "task": f"Condense part {shard_no} of {n_shards} of the {window_name} news.",
+            "window": make_prompt_payload(window_name, items, False),
+        }
+        t0 = time.time()
+        notes = create_response(model, system, user_input)
+        print(f"[i] {window_name}: shard {shard_no}/{n_shards} ({len(items)} articles) took {time.time() - t0:.1f}s")
+        return notes
+
+    def reduce_window(model: str, window_name: str, heading: str, notes: List[str], count: int) -> str:
+        """Reduce step: merge shard notes into the final section for one window."""
+        system = (
+            SYSTEM_EDITOR +
+            "You are given notes written from several parts of a list of news articles for one time window. "
+            "Summarize the important news and trends in one paragraph. "
+            "Specify the country being discussed. Focus on United States but include some international news. "
+            "\n\n"
+            "Output format rules:\n"
+            "- Use plain text and copy the following heading:\n"
+            f"  {heading}\n"
+            "- Under the heading, write one summary paragraph.\n"
+            "- Under the summary paragraph, list 7 important sources from the notes in this format, "
+            "one line per source. Sources can come from different parts; never merge several sources "
+            "into one line. Keep the source title unchanged.\n"
+            " * Source Title\n"
+            " * Source Title\n"
+            " * Source Title\n"
+            " * Source Title\n"
+            " * Source Title\n"
+            " * Source Title\n"
+            " * Source Title\n"
+        )
+        user_input = {
+            "task": "Summarize psychometrics/assessment-related news.",
+            "window": window_name,
+            "article_count": count,
+            "notes": notes,
+        }
+        return create_response(model, system, user_input)
+
+    def summarize_map_reduce(model: str, windows: Dict[str, tuple]) -> str:
+        """
+        Summarize each window as map (shards in parallel) + reduce (one short call).
+        `windows` maps window name → (heading, items). Windows run in parallel and
+        share one bounded shard pool, so latency is about one shard + one reduce call.
+        """
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_SHARDS) as shard_pool:
+
+            def run_window(window_name: str, heading: str, items: List[Dict[str, Any]]) -> str:
+                if not items:
+                    return ""
+                shards = [items[i:i + SHARD_SIZE] for i in range(0, len(items), SHARD_SIZE)]
+                futures = [
+                    shard_pool.submit(summarize_shard, model, window_name, n, len(shards), shard)
+                    for n, shard in enumerate(shards, 1)
+                ]
+                notes = []
+                for fut in futures:
+                    try:
+                        notes.append(fut.result())
+                    except Exception as e:
+                        print(f"[warn] shard failed for {window_name}: {e}", file=sys.stderr)
+                if not notes:
+                    return ""
+                return reduce_window(model, window_name, heading, notes, len(items))
+
+            with ThreadPoolExecutor(max_workers=max(1, len(windows))) as window_pool:
+                futures = {
+                    name: window_pool.submit(run_window, name, heading, items)
+                    for name, (heading, items) in windows.items()
+                }
+                sections = []
+                for name, fut in futures.items():
+                    try:
+                        sections.append(fut.result())
+                    except Exception as e:
+                        print(f"[warn] summary failed for {name}: {e}", file=sys.stderr)
+
+        return "\n\n".join(sec for sec in sections if sec)
 
     def post_to_discord(webhook_url: str, content: str):
         MAX_LEN = 2000
@@ -358,18 +451,9 @@ def gpt_news(today_is_monday, DISCORD_WEBHOOK_URL):
         return re.sub(r'(?<!\n)\n?(## )', r'\n\n\1', text)
 
 
-    def normalize_title(title: str) -> str:
-        # Lowercase + strip punctuation and whitespace
-        return re.sub(rf"[{re.escape(string.punctuation)}\s]+", "", title.lower())
-
-    def attach_real_links(text: str, all_items: list[dict]) -> str:
-        # Build lookup table from normalized title → link
-        title_to_link = {
-            normalize_title(it["title"]): it["link"]
-            for it in all_items if it.get("title") and it.get("link")
-        }
-
+    def attach_real_links(text: str, index: TitleIndex) -> str:
         lines = []
+        n_exact = n_fuzzy = n_unresolved = 0
         for raw_line in text.splitlines():
             candidate = raw_line.strip()
             if not candidate:
@@ -383,19 +467,44 @@ def gpt_news(today_is_monday, DISCORD_WEBHOOK_URL):
             else:
                 visible_title = candidate.lstrip("-*• ").strip()
 
-            norm = normalize_title(visible_title)
-            link = title_to_link.get(norm)
+            # Only source list lines are fuzzy-matched; paragraphs need an exact hit
+            is_source_line = bool(linked) or candidate[0] in "-*•"
+            link, score = index.lookup(visible_title)
+            if link and score < 1.0 and not is_source_line:
+                link = None
 
             if link:
+                if score < 1.0:
+                    n_fuzzy += 1
+                else:
+                    n_exact += 1
                 # Ensure Discord-friendly link wrapping
                 lines.append(f"* [{visible_title}](<{link}>)")
             else:
+                if is_source_line:
+                    n_unresolved += 1
+                    print(f"[warn] no link for: {visible_title} (best score {score:.2f})")
                 # Keep line untouched if no match
                 lines.append(raw_line)
 
+        print(f"[i] links: {n_exact} exact, {n_fuzzy} fuzzy, {n_unresolved} unresolved")
         return "\n".join(lines)
 
 
+    def resolve_report_links(text: str) -> str:
+        """Replace redirect links in the report with their resolved targets."""
+        pattern = r'\]\(<(https?://news\.google\.com/[^>]+)>\)'
+        links = re.findall(pattern, text)
+        if not links:
+            return text
+        resolver = LinkResolver()
+        try:
+            finals = resolver.resolve(links)
+        finally:
+            resolver.close()
+        return re.sub(pattern, lambda m: f"](<{finals.get(m.group(1), m.group(1))}>)", text)
+
+
 # -----------------------------
 # Main
 # -----------------------------
@@ -405,8 +514,27 @@ def gpt_news(today_is_monday, DISCORD_WEBHOOK_URL):
         print("[i] Not Monday → skipping digest.")
         return
 
-    print("[i] harvesting news…")
-    all_items = harvest_articles(SEARCH_TERMS)
+    conn = None
+    if USE_NEWS_STORE:
+        conn = news_store.connect()
+        last = news_store.last_harvest(conn)
+        if last is None or datetime.now(timezone.utc) - last > NEWS_STORE_MAX_AGE:
+            print("[i] harvesting news…")
+            news_store.add_articles(conn, harvest_articles(SEARCH_TERMS))
+        else:
+            print(f"[i] using news store (last harvest {last:%Y-%m-%d %H:%M} UTC)")
+        all_items = news_store.all_articles(conn)
+    else:
+        print("[i] harvesting news…")
+        all_items = harvest_articles(SEARCH_TERMS)
+
+    # Built once: maps LLM-emitted titles back to harvested links
+    title_index = TitleIndex(all_items)
+
+    def get_window(days: int, exclude_days: int = 0) -> List[Dict[str, Any]]:
+        if conn is not None:
+            return news_store.query_window(conn, days, exclude_days, MAX_ARTICLES_PER_WINDOW)
+        return filter_by_window(all_items, days, exclude_days=exclude_days)
     # print(f"[i] harvested {len(all_items)} articles total:")
     # if all_items:
     #     print(all_items[0])
@@ -416,49 +544,63 @@ def gpt_news(today_is_monday, DISCORD_WEBHOOK_URL):
     #     json.dump(all_items, f, ensure_ascii=False, indent=2)
     # print("[i] wrote harvest_debug.json")
 
-    last_7 = filter_by_window(all_items, 7)
-    # last_60 = filter_by_window(all_items, 60, exclude_days=7)
-    # last_365 = filter_by_window(all_items, 365, exclude_days=60)
-
-    windows_payload = {
-        "last_7_days": make_prompt_payload("last_7_days", last_7, False),
-        # "last_60_days_excluding_past_7_days": make_prompt_payload("last_60_days_excluding_past_7_days", last_60, False),
-        # "last_365_days_excluding_past_60_days": make_prompt_payload("last_365_days_excluding_past_60_days", last_365, False),
-    }
-
-    # Debug by dumping json.
-    # with open("harvest_debug7.json", "w", encoding="utf-8") as f:
-    #     json.dump(last_7, f, ensure_ascii=False, indent=2)
-    print(f"{len(last_7)} articles in last 7 days")
-    # with open("harvest_debug60.json", "w", encoding="utf-8") as f:
-    #     json.dump(last_60, f, ensure_ascii=False, indent=2)
-    # print(f"{len(last_60)} articles in last 60 days")
-    # with open("harvest_debug365.json", "w", encoding="utf-8") as f:
-    #     json.dump(last_365, f, ensure_ascii=False, indent=2)
-    # print(f"{len(last_365)} articles in last 365 days")
-    with open("harvest_debugwindows_payload.json", "w", encoding="utf-8") as f:
-        json.dump(windows_payload, f, ensure_ascii=False, indent=2)
-    # print(f"written to harvest_debugwindows_payload.json")
-    # # Stop execution here
-    # raise SystemExit("[i] Stopping early for manual inspection")
-    # # raise
-
-    print("[i] summarizing with OpenAI…")
-    report = summarize_with_openai(OPENAI_MODEL, windows_payload)
+    if USE_MAP_REDUCE:
+        windows = {
+            name: (heading, get_window(days, exclude))
+            for name, heading, days, exclude in NEWS_WINDOWS
+        }
+        for name, (_, items) in windows.items():
+            print(f"{len(items)} articles in {name}")
+        n_articles = sum(len(items) for _, items in windows.values())
+
+        print("[i] summarizing with OpenAI (map-reduce)…")
+        t0 = time.time()
+        report = summarize_map_reduce(OPENAI_MODEL, windows)
+        print(f"[i] map-reduce summary took {time.time() - t0:.1f}s")
+    else:
+        last_7 = get_window(7)
+        # last_60 = filter_by_window(all_items, 60, exclude_days=7)
+        # last_365 = filter_by_window(all_items, 365, exclude_days=60)
+
+        windows_payload = {
+            "last_7_days": make_prompt_payload("last_7_days", last_7, False),
+            # "last_60_days_excluding_past_7_days": make_prompt_payload("last_60_days_excluding_past_7_days", last_60, False),
+            # "last_365_days_excluding_past_60_days": make_prompt_payload("last_365_days_excluding_past_60_days", last_365, False),
+        }
+
+        # Debug by dumping json.
+        # with open("harvest_debug7.json", "w", encoding="utf-8") as f:
+        #     json.dump(last_7, f, ensure_ascii=False, indent=2)
+        print(f"{len(last_7)} articles in last 7 days")
+        n_articles = len(last_7)
+        with open("harvest_debugwindows_payload.json", "w", encoding="utf-8") as f:
+            json.dump(windows_payload, f, ensure_ascii=False, indent=2)
+        # print(f"written to harvest_debugwindows_payload.json")
+        # # Stop execution here
+        # raise SystemExit("[i] Stopping early for manual inspection")
+        # # raise
+
+        print("[i] summarizing with OpenAI…")
+        report = summarize_with_openai(OPENAI_MODEL, windows_payload)
 
     # Clean spacing
     report = re.sub(r"\n\s*\n", "\n", report)
     report = ensure_blank_before_headers(report)
-    report = attach_real_links(report, all_items)
+    report = attach_real_links(report, title_index)
+    if RESOLVE_LINKS:
+        report = resolve_report_links(report)
 
     # # Fix link formatting
     # report = wrap_links_with_angle_brackets(report)
 
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
-    header = f"# Monday News Digest\nGenerated: {now}\nModel: {OPENAI_MODEL}\nSummarized: {len(last_7)} Articles"
+    header = f"# Monday News Digest\nGenerated: {now}\nModel: {OPENAI_MODEL}\nSummarized: {n_articles} Articles"
     # header = f"# Monday News Digest\n<@&1421877783012970556>\nGenerated: {now}\nModel: {OPENAI_MODEL}\nSummarized: {len(last_7) + len(last_60) + len(last_365)} Articles"
     report_txt = header + report
 
+    if conn is not None:
+        conn.close()
+
     if DISCORD_WEBHOOK_URL:
         try:
             post_to_discord(DISCORD_WEBHOOK_URL, report_txt)
@@ -468,5 +610,9 @@ def gpt_news(today_is_monday, DISCORD_WEBHOOK_URL):
 # if __name__ == "__main__":
 #     main()
 
+if __name__ == "__main__":
+    # Run daily (cron) to keep the news store current for the Monday digest
+    harvest_news_daily()
+
 
 
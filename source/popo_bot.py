@@ -4,7 +4,15 @@ import discord
 from discord.ext import commands, tasks
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from source.cron_schedule import CronSchedule
+from source.bot_metrics import Metrics, instrument_http, start_metrics_server
 import asyncio
+import atexit
+import heapq
+import itertools
+import json
+import time
+import pytz
 
 # ---- Load environment variables ----
 load_dotenv()
@@ -15,22 +23,121 @@ WELCOME_CHANNEL_ID = int(os.getenv("welcome_channel"))
 GENERAL_CHANNEL_ID = int(os.getenv("general_channel"))
 RESEARCH_CHANNEL_ID = int(os.getenv("daily_research_channel"))
 ANNOUNCEMENT_CHANNEL_ID = int(os.getenv("announcement_channel"))
+DISCORD_WEBHOOK_ANNOUNCEMENTS = os.getenv("DISCORD_WEBHOOK_ANNOUNCEMENTS")
+DISCORD_WEBHOOK_GENERAL_EVENT = os.getenv("DISCORD_WEBHOOK_GENERAL_EVENT")
+
+
+# ---- Metrics (always collected; served only when METRICS_PORT is set) ----
+METRICS_PORT = os.getenv("METRICS_PORT")
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+metrics = Metrics()
+metrics.histogram("loop_duration_seconds", "Time spent doing work in one loop iteration (sleep excluded)")
+metrics.histogram("timer_lag_seconds", "How late a timer fired relative to its deadline")
+metrics.histogram("event_loop_lag_seconds", "Extra delay of a 1 s asyncio sleep (event loop blocked)")
+metrics.histogram("rest_request_seconds", "Discord REST call latency by route")
+metrics.counter("rest_requests_total", "Discord REST calls by route and outcome (ok or HTTP status)")
+metrics.counter("rate_limit_hits_total", "429 responses from Discord")
+metrics.histogram("job_duration_seconds", "Scheduled job run time", buckets=(1, 5, 15, 30, 60, 120, 300, 600))
+metrics.counter("job_runs_total", "Scheduled job runs by outcome")
+metrics_runner = None
+
+
+class DeadlineHeap:
+    """
+    Min-heap of (when, seq, key) with one live deadline per key.
+    Rescheduling or cancelling a key only updates `due`; heap entries that no
+    longer match it are dropped when they reach the top, so every change is O(log n).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.heap = []
+        self.due = {}
+        self.seq = itertools.count()
+        self.changed = asyncio.Event()
+
+    def __len__(self):
+        return len(self.due)
+
+    def push(self, key, when):
+        self.due[key] = when
+        heapq.heappush(self.heap, (when, next(self.seq), key))
+        self.changed.set()
+
+    def cancel(self, key):
+        self.due.pop(key, None)
+
+    def _drop_stale(self):
+        while self.heap and self.due.get(self.heap[0][2]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+
+    def pop_due(self, now):
+        """Remove and return the keys whose deadline is at or before now."""
+        keys = []
+        self._drop_stale()
+        while self.heap and self.heap[0][0] <= now:
+            when, _, key = heapq.heappop(self.heap)
+            del self.due[key]
+            metrics.observe("timer_lag_seconds", (now - when).total_seconds(), timer=self.name)
+            keys.append(key)
+            self._drop_stale()
+        return keys
+
+    async def wait(self, max_sleep):
+        """Sleep until the next deadline, a schedule change, or max_sleep seconds."""
+        self._drop_stale()
+        timeout = max_sleep
+        if self.heap:
+            timeout = min(timeout, max(0.0, (self.heap[0][0] - discord.utils.utcnow()).total_seconds()))
+        try:
+            await asyncio.wait_for(self.changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
 
-# ---- Discord setup ----
-intents = discord.Intents.default()
-intents.message_content = True
-intents.voice_states = True
-intents.members = True
-intents.presences = True
-intents.guild_scheduled_events = True  # important for scheduled event hooks/cache
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+# ---- Features (each one decides which gateway intents are requested) ----
+ENABLE_WELCOME = os.getenv("ENABLE_WELCOME", "1") == "1"                  # greet new members (members intent)
+ENABLE_VOICE_LIMITS = os.getenv("ENABLE_VOICE_LIMITS", "1") == "1"        # disconnect after TOTAL_LIMIT (voice_states)
+ENABLE_IDLE_DISCONNECT = os.getenv("ENABLE_IDLE_DISCONNECT", "1") == "1"  # ...and idle users after IDLE_LIMIT (presences)
+ENABLE_MODERATION = os.getenv("ENABLE_MODERATION", "0") == "1"            # share-your-work moderation (message_content)
+
+
+def build_intents():
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.guild_scheduled_events = True  # important for scheduled event hooks/cache
+    intents.members = ENABLE_WELCOME
+    intents.voice_states = ENABLE_VOICE_LIMITS
+    # Presence updates are sent for every member of the guild; only subscribe when idle checks need them
+    intents.presences = ENABLE_VOICE_LIMITS and ENABLE_IDLE_DISCONNECT
+    intents.guild_messages = ENABLE_MODERATION
+    intents.message_content = ENABLE_MODERATION
+    return intents
+
+
+def build_member_cache_flags(intents):
+    """Cache only members who are in voice; everyone else is fetched when needed."""
+    flags = discord.MemberCacheFlags.none()
+    flags.voice = intents.voice_states
+    return flags
+
+
+# ---- Discord setup ----
+intents = build_intents()
+bot = commands.Bot(
+    command_prefix="!",
+    intents=intents,
+    member_cache_flags=build_member_cache_flags(intents),
+    chunk_guilds_at_startup=False,  # no full member list download at login
+)
+instrument_http(bot.http, metrics)
 
 # ---- Voice activity tracking ----
-voice_join_times = {}
-CHECK_INTERVAL = 60  # seconds
+voice_join_times = {}  # (guild id, member id) -> join time
 IDLE_LIMIT = timedelta(minutes=30)
 TOTAL_LIMIT = timedelta(minutes=180)
+VOICE_TIMER_MAX_SLEEP = 300  # seconds; re-check at least this often
+voice_deadlines = DeadlineHeap("voice")  # (guild id, member id) -> disconnect time
 
 # ---- Scheduled event tracking ----
 EVENT_REMINDER_WINDOW = timedelta(minutes=5)
@@ -41,6 +148,42 @@ reminded_event_ids = set()
 started_event_ids = set()
 ended_event_ids = set()
 
+# Scheduled events cache, kept current by gateway events; REST is only used to reconcile
+EVENT_RECONCILE_INTERVAL = 30  # minutes
+scheduled_events = {}  # event id -> discord.ScheduledEvent
+
+# Reminder / auto start / auto end timers
+EVENT_TIMER_MAX_SLEEP = 300  # seconds; re-check at least this often
+EVENT_ACTION_RETRY = timedelta(minutes=1)  # retry delay after a failed action
+event_timers = DeadlineHeap("events")  # (event id, action) -> when
+
+# ---- Outgoing message queue ----
+DISCORD_MAX_LEN = 2000
+SEND_INTERVAL = 1.0  # seconds between queued sends (Discord allows ~5 messages / 5 s per channel)
+REMINDER_MENTIONS = discord.AllowedMentions(everyone=False, roles=False, users=True)
+outgoing_messages = asyncio.Queue()  # (channel, content, allowed_mentions)
+background_tasks = set()
+
+# ---- Scheduled jobs (the former one-shot scripts), cron times in US/Eastern ----
+# Off by default: turn on only after removing the external cron entries for the same scripts,
+# or announcements (with their @everyone) go out twice
+RUN_SCHEDULED_JOBS = os.getenv("RUN_SCHEDULED_JOBS", "0") == "1"
+JOB_TIMEZONE = pytz.timezone("US/Eastern")
+JOB_SCHEDULES = {  # set a CRON_* variable to "off" to disable that job
+    "announcements": os.getenv("CRON_ANNOUNCEMENTS", "0 9 * * *"),
+    "create_events": os.getenv("CRON_CREATE_EVENTS", "0 8 * * *"),
+    "conference_dates": os.getenv("CRON_CONFERENCE_DATES", "30 8 * * *"),
+    "jobs_internships": os.getenv("CRON_JOBS_INTERNSHIPS", "0 */6 * * *"),
+}
+JOB_TIMER_MAX_SLEEP = 300  # seconds; re-check at least this often
+job_timers = DeadlineHeap("jobs")  # job name -> next run
+job_locks = {}               # job name -> asyncio.Lock, so a slow run is never overlapped
+
+# ---- Persisted state (survives restarts) ----
+STATE_FILE = os.getenv("POPO_STATE_FILE", "popo_bot_state.json")
+STATE_SAVE_INTERVAL = 5  # minutes
+state_loaded = False
+
 
 # ============================================================
 #                         BOT READY
@@ -50,14 +193,43 @@ ended_event_ids = set()
 async def on_ready():
     print(f"✅ Logged in as {bot.user}")
 
-    if not check_inactive_users.is_running():
+    global metrics_runner
+    if METRICS_PORT and metrics_runner is None:
+        metrics_runner = await start_metrics_server(metrics, int(METRICS_PORT), METRICS_HOST)
+        register_gauges()
+        event_loop_lag_probe.start()
+
+    global state_loaded
+    if not state_loaded:
+        load_state()
+        state_loaded = True
+
+    # Seed the event cache from the guild data the gateway already sent
+    for guild in bot.guilds:
+        for event in guild.scheduled_events:
+            remember_event(event)
+
+    if not reconcile_scheduled_events.is_running():
+        reconcile_scheduled_events.start()
+
+    await seed_voice_tracking()
+    prune_state()
+
+    if not save_state_loop.is_running():
+        save_state_loop.start()
+
+    if ENABLE_VOICE_LIMITS and not check_inactive_users.is_running():
         check_inactive_users.start()
 
-    if not event_reminder_loop.is_running():
-        event_reminder_loop.start()
+    if not event_action_loop.is_running():
+        event_action_loop.start()
+
+    if not message_sender_loop.is_running():
+        message_sender_loop.start()
 
-    if not voice_event_status_loop.is_running():
-        voice_event_status_loop.start()
+    if RUN_SCHEDULED_JOBS and not scheduled_jobs_loop.is_running():
+        schedule_jobs()
+        scheduled_jobs_loop.start()
 
 
 # ============================================================
@@ -67,6 +239,8 @@ async def on_ready():
 @bot.event
 async def on_member_join(member):
     """Prompt new members to introduce themselves and explore the server."""
+    if not ENABLE_WELCOME:
+        return
     await asyncio.sleep(5)
 
     intro_channel = bot.get_channel(INTRO_CHANNEL_ID)
@@ -89,6 +263,7 @@ async def on_member_join(member):
 # ============================================================
 #                    MESSAGE MODERATION
 # ============================================================
+# (set ENABLE_MODERATION=1 so the bot requests the message_content intent)
 #
 # @bot.event
 # async def on_message(message):
@@ -117,174 +292,518 @@ async def on_member_join(member):
 #                  VOICE ACTIVITY TRACKING
 # ============================================================
 
+def voice_deadline(member, join_time):
+    """When a member in voice should be disconnected: idle members after IDLE_LIMIT, everyone after TOTAL_LIMIT."""
+    if intents.presences and member.status == discord.Status.idle:
+        return join_time + IDLE_LIMIT
+    return join_time + TOTAL_LIMIT
+
+
+def track_voice(member, join_time=None):
+    key = (member.guild.id, member.id)
+    join_time = voice_join_times.setdefault(key, join_time or discord.utils.utcnow())
+    voice_deadlines.push(key, voice_deadline(member, join_time))
+
+
+def untrack_voice(key):
+    voice_join_times.pop(key, None)
+    voice_deadlines.cancel(key)
+
+
+async def resolve_voice_members(guild, user_ids):
+    """Members for voice users not in the cache: one gateway query per 100 ids, or REST without the members intent."""
+    members = []
+    if intents.members:
+        for i in range(0, len(user_ids), 100):
+            try:
+                members += await guild.query_members(user_ids=user_ids[i:i + 100], presences=intents.presences)
+            except Exception as e:
+                print(f"⚠️ Could not query voice members in {guild}: {e}")
+    else:
+        for user_id in user_ids:
+            try:
+                members.append(await guild.fetch_member(user_id))
+            except discord.HTTPException as e:
+                print(f"⚠️ Could not fetch voice member {user_id}: {e}")
+    return members
+
+
+async def seed_voice_tracking():
+    """Start tracking members already in voice (e.g. after a restart)."""
+    if not ENABLE_VOICE_LIMITS:
+        return
+    for guild in bot.guilds:
+        members, missing = [], []
+        for channel in list(guild.voice_channels) + list(guild.stage_channels):
+            for user_id in channel.voice_states:
+                member = guild.get_member(user_id)
+                if member is None:
+                    missing.append(user_id)
+                else:
+                    members.append(member)
+        if missing:
+            members += await resolve_voice_members(guild, missing)
+        for member in members:
+            if not member.bot:
+                track_voice(member)
+
+
 @bot.event
 async def on_voice_state_update(member, before, after):
-    """Track when users join or leave voice channels."""
-    if before.channel is None and after.channel is not None:
-        voice_join_times[member.id] = datetime.utcnow()
-    elif before.channel is not None and after.channel is None:
-        voice_join_times.pop(member.id, None)
+    """Track when users join, move between or leave voice channels."""
+    if member.bot:
+        return
+    if after.channel is None:
+        untrack_voice((member.guild.id, member.id))
+    elif before.channel is None:
+        untrack_voice((member.guild.id, member.id))
+        track_voice(member)
+    # A move between channels keeps the original join time
 
-@tasks.loop(seconds=CHECK_INTERVAL)
-async def check_inactive_users():
-    """Periodically disconnect idle or long-staying users."""
-    now = datetime.utcnow()
-    to_remove = []
 
-    for user_id, join_time in list(voice_join_times.items()):
-        member = bot.get_user(user_id)
-        if not member:
-            continue
+@bot.event
+async def on_presence_update(before, after):
+    """Going idle (or coming back) moves the member's disconnect deadline."""
+    key = (after.guild.id, after.id)
+    if before.status != after.status and key in voice_join_times:
+        track_voice(after)
+
 
-        if not member.voice or not member.voice.channel:
-            to_remove.append(user_id)
+@tasks.loop()
+async def check_inactive_users():
+    """Disconnect idle or long-staying users when their deadline comes up."""
+    voice_deadlines.changed.clear()
+    t0 = time.perf_counter()
+    now = discord.utils.utcnow()
+    for key in voice_deadlines.pop_due(now):
+        guild = bot.get_guild(key[0])
+        member = guild.get_member(key[1]) if guild else None
+        join_time = voice_join_times.get(key)  # gone if the member left or state was pruned meanwhile
+        if member is None or join_time is None or not member.voice or not member.voice.channel:
+            untrack_voice(key)
             continue
 
-        time_in_channel = now - join_time
+        deadline = voice_deadline(member, join_time)
+        if deadline > now:
+            # Status changed without a presence event reaching us; try again later
+            voice_deadlines.push(key, deadline)
+            continue
 
-        if member.status == discord.Status.idle and time_in_channel > IDLE_LIMIT:
+        if member.status == discord.Status.idle and now - join_time >= IDLE_LIMIT:
             try:
                 await member.move_to(None)
                 print(f"😴 Disconnected idle user {member.display_name}")
             except Exception as e:
                 print(f"⚠️ Could not disconnect idle user {member}: {e}")
-            to_remove.append(user_id)
-
-        elif time_in_channel > TOTAL_LIMIT:
+        else:
             try:
                 await member.move_to(None)
                 print(f"🕒 Disconnected {member.display_name} after 3 hours")
             except Exception as e:
                 print(f"⚠️ Could not disconnect long user {member}: {e}")
-            to_remove.append(user_id)
+        untrack_voice(key)
+
+    metrics.observe("loop_duration_seconds", time.perf_counter() - t0, loop="voice")
+    await voice_deadlines.wait(VOICE_TIMER_MAX_SLEEP)
+
+
+@check_inactive_users.before_loop
+async def before_check_inactive_users():
+    await bot.wait_until_ready()
 
-    for uid in to_remove:
-        voice_join_times.pop(uid, None)
 
 # ============================================================
-#                   5 Minute Event Reminder using "@"
+#                   Scheduled Event Cache
 # ============================================================
 
-async def get_all_scheduled_events():
-    """Fetch all scheduled events from all guilds the bot is in."""
+async def fetch_all_scheduled_events():
+    """Fetch all scheduled events from all guilds the bot is in (REST)."""
     all_events = []
+    complete = True
     for guild in bot.guilds:
         try:
             events = await guild.fetch_scheduled_events()
             all_events.extend(events)
         except Exception as e:
+            complete = False
             print(f"⚠️ Could not fetch scheduled events for guild {guild.id}: {e}")
-    return all_events
+    return all_events, complete
 
-@tasks.loop(seconds=30)
-async def event_reminder_loop():
-    now = discord.utils.utcnow()
-    announcement_channel = bot.get_channel(ANNOUNCEMENT_CHANNEL_ID)
 
+def remember_event(event):
+    scheduled_events[event.id] = event
+    if event.status in (discord.EventStatus.ended, discord.EventStatus.cancelled):
+        forget_event(event.id)
+    else:
+        schedule_event_actions(event)
+
+
+def forget_event(event_id):
+    scheduled_events.pop(event_id, None)
+    reminded_event_ids.discard(event_id)
+    started_event_ids.discard(event_id)
+    ended_event_ids.discard(event_id)
+    unschedule_event_actions(event_id)
+
+
+@bot.event
+async def on_scheduled_event_create(event):
+    remember_event(event)
+
+
+@bot.event
+async def on_scheduled_event_update(before, after):
+    remember_event(after)
+
+
+@bot.event
+async def on_scheduled_event_delete(event):
+    forget_event(event.id)
+
+
+@tasks.loop(minutes=EVENT_RECONCILE_INTERVAL)
+async def reconcile_scheduled_events():
+    """Replace the cache with a REST snapshot, in case a gateway event was missed (e.g. while disconnected)."""
+    t0 = time.perf_counter()
+    events, complete = await fetch_all_scheduled_events()
+    if complete:
+        # Keep the cache rather than dropping a guild's events on a failed fetch
+        fresh = {event.id for event in events}
+        for event_id in list(scheduled_events):
+            if event_id not in fresh:
+                forget_event(event_id)
+    for event in events:
+        remember_event(event)
+    metrics.observe("loop_duration_seconds", time.perf_counter() - t0, loop="reconcile")
+    print(f"🔄 Reconciled {len(events)} scheduled event(s)")
+
+
+@reconcile_scheduled_events.before_loop
+async def before_reconcile_scheduled_events():
+    await bot.wait_until_ready()
+
+
+# ============================================================
+#          Event Action Timers (reminder / start / end)
+# ============================================================
+
+def event_action_times(event):
+    """{action: when} still to do for an event, given its current status."""
+    times = {}
+    auto = event.entity_type in (discord.EntityType.voice, discord.EntityType.stage_instance)
+    if event.status == discord.EventStatus.scheduled and event.start_time is not None:
+        if event.id not in reminded_event_ids:
+            times["remind"] = event.start_time - EVENT_REMINDER_WINDOW
+        if auto and event.id not in started_event_ids:
+            times["start"] = event.start_time - EVENT_START_GRACE
+    elif event.status == discord.EventStatus.active and event.end_time is not None:
+        # If there is no end_time, skip ending
+        if auto and event.id not in ended_event_ids:
+            times["end"] = event.end_time - EVENT_END_GRACE
+    return times
+
+
+def schedule_event_actions(event):
+    unschedule_event_actions(event.id)
+    for action, when in event_action_times(event).items():
+        event_timers.push((event.id, action), when)
+
+
+def unschedule_event_actions(event_id):
+    for action in EVENT_ACTIONS:
+        event_timers.cancel((event_id, action))
+
+
+async def pack_mentions(header, users, max_len=DISCORD_MAX_LEN):
+    """Yield messages of at most max_len chars: header, then mentions, streamed as pages arrive."""
+    chunk = header
+    async for user in users:
+        mention = user.mention
+        if len(chunk) + 1 + len(mention) > max_len:
+            yield chunk
+            chunk = mention
+        else:
+            chunk += " " + mention
+    yield chunk
+
+
+async def deliver_event_reminder(channel, event):
+    try:
+        # Subscribers are paged from Discord 100 at a time; each full message is queued right away
+        async for content in pack_mentions(f"Event **{event.name}** is starting soon!", event.users(limit=None)):
+            await outgoing_messages.put((channel, content, REMINDER_MENTIONS))
+    except Exception as e:
+        print(f"⚠️ Could not list subscribers for event {event.name}: {e}")
+
+
+def run_in_background(coro):
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+
+async def send_event_reminder(event):
+    announcement_channel = bot.get_channel(ANNOUNCEMENT_CHANNEL_ID)
     if announcement_channel is None:
         print("⚠️ Announcement channel not found.")
         return
+    if event.start_time < discord.utils.utcnow():
+        return  # already started; a late reminder is just noise
 
-    events = await get_all_scheduled_events()
+    # Marked before delivery so a restart mid-way cannot send the reminder twice
+    reminded_event_ids.add(event.id)
+    run_in_background(deliver_event_reminder(announcement_channel, event))
+    print(f"🔔 Queued 5-minute reminder for event: {event.name}")
 
-    for event in events:
-        # Ignore events already reminded or not in scheduled state
-        if event.id in reminded_event_ids:
-            continue
-        if event.status != discord.EventStatus.scheduled:
-            continue
-        if event.start_time is None:
-            continue
 
-        time_until_start = event.start_time - now
+async def start_event(event):
+    await event.start()
+    started_event_ids.add(event.id)
+    print(f"▶️ Auto-started event: {event.name}")
 
-        # Trigger once when event is within the 5-minute window
-        if timedelta(0) <= time_until_start <= EVENT_REMINDER_WINDOW:
-            try:
-                mentions = []
 
-                # Best source of truth: fetch currently subscribed users from Discord
-                async for user in event.users(limit=None):
-                    mentions.append(user.mention)
+async def end_event(event):
+    await event.end()
+    ended_event_ids.add(event.id)
+    print(f"⏹️ Auto-ended event: {event.name}")
 
-                if mentions:
-                    mention_text = " ".join(mentions)
-                    msg = f"Event **{event.name}** is starting soon! {mention_text}"
-                else:
-                    msg = f"Event **{event.name}** is starting soon!"
 
-                await announcement_channel.send(msg)
-                reminded_event_ids.add(event.id)
-                print(f"🔔 Sent 5-minute reminder for event: {event.name}")
+EVENT_ACTIONS = {"remind": send_event_reminder, "start": start_event, "end": end_event}
 
-            except Exception as e:
-                print(f"⚠️ Could not send reminder for event {event.name}: {e}")
 
-    # cleanup old reminder ids
-    for event in events:
-        if event.status == discord.EventStatus.ended:
-            reminded_event_ids.discard(event.id)
+@tasks.loop()
+async def event_action_loop():
+    """Sleep until the next event action is due (or the schedule changes), then run what is due."""
+    event_timers.changed.clear()
+    t0 = time.perf_counter()
+    now = discord.utils.utcnow()
+    for event_id, action in event_timers.pop_due(now):
+        event = scheduled_events.get(event_id)
+        if event is None:
+            continue
+        try:
+            await EVENT_ACTIONS[action](event)
+        except Exception as e:
+            print(f"⚠️ Could not {action} event {event.name}: {e}")
+            event_timers.push((event_id, action), now + EVENT_ACTION_RETRY)
+        save_state()  # an action done but not saved would be repeated after a restart
+
+    metrics.observe("loop_duration_seconds", time.perf_counter() - t0, loop="events")
+    await event_timers.wait(EVENT_TIMER_MAX_SLEEP)
 
 
-@event_reminder_loop.before_loop
-async def before_event_reminder_loop():
+@event_action_loop.before_loop
+async def before_event_action_loop():
+    await bot.wait_until_ready()
+
+
+@tasks.loop()
+async def message_sender_loop():
+    """Send queued messages one at a time, spaced to stay under the channel rate limit."""
+    channel, content, allowed_mentions = await outgoing_messages.get()
+    t0 = time.perf_counter()
+    try:
+        # discord.py waits out any 429 itself; the spacing keeps us from hitting it
+        await channel.send(content, allowed_mentions=allowed_mentions)
+    except discord.HTTPException as e:
+        print(f"⚠️ Could not send message to {channel}: {e}")
+    metrics.observe("loop_duration_seconds", time.perf_counter() - t0, loop="sender")
+    await asyncio.sleep(SEND_INTERVAL)
+
+
+@message_sender_loop.before_loop
+async def before_message_sender_loop():
     await bot.wait_until_ready()
 
 
 # ============================================================
-#                   Voice Event Starter / Ender
+#                      SCHEDULED JOBS
 # ============================================================
 
-@tasks.loop(seconds=30)
-async def voice_event_status_loop():
+# The job modules are imported when a job runs, so their env vars (VOICE_CHANNEL_ID,
+# conference_dates_channel, position_channel) are only required with jobs enabled.
+
+async def job_announcements():
+    from source.popo_bot_event_alerts import send_daily_event_reminders
+    from source.popo_bot_conference_date_alerts import conference_alerts
+    from source.monday_alerts_end import monday_alerts_end
+
+    today_is_monday = datetime.now(JOB_TIMEZONE).weekday() == 0
+    guild = bot.guilds[0] if bot.guilds else None
+    # Same order as announcements_main, with events from the warm cache instead of a REST fetch
+    events = [e for e in scheduled_events.values() if guild and e.guild_id == guild.id]
+    await send_daily_event_reminders(
+        events, today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS, DISCORD_WEBHOOK_GENERAL_EVENT
+    )
+    await conference_alerts(today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS)
+    await monday_alerts_end(today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS)
+
+
+async def job_create_events():
+    from source.popo_bot_create_events import create_events
+    await create_events(bot.guilds[0] if bot.guilds else None)
+
+
+async def job_conference_dates():
+    from source.popo_bot_conference_dates import post_conference_dates, CHANNEL_ID
+    await post_conference_dates(bot.get_channel(CHANNEL_ID), bot.user)
+
+
+async def job_jobs_internships():
+    from source.popo_bot_create_jobs_internships import post_new_positions, FORUM_CHANNEL_ID
+    await post_new_positions(bot.get_channel(FORUM_CHANNEL_ID))
+
+
+JOBS = {
+    "announcements": job_announcements,
+    "create_events": job_create_events,
+    "conference_dates": job_conference_dates,
+    "jobs_internships": job_jobs_internships,
+}
+
+
+def schedule_jobs():
     now = discord.utils.utcnow()
-    events = await get_all_scheduled_events()
+    for name, expr in JOB_SCHEDULES.items():
+        if expr.strip().lower() == "off":
+            continue
+        schedule = CronSchedule(expr)
+        job_timers.push(name, schedule.next_after(now, JOB_TIMEZONE))
+        print(f"⏰ Job {name} ({expr}) next runs at {job_timers.due[name]}")
 
-    for event in events:
+
+async def run_job(name):
+    lock = job_locks.setdefault(name, asyncio.Lock())
+    if lock.locked():
+        print(f"⏭️ Job {name} is still running; skipping this run")
+        metrics.inc("job_runs_total", job=name, outcome="skipped")
+        return
+    async with lock:
+        t0 = time.monotonic()
+        outcome = "ok"
         try:
-            # Only auto-handle voice/stage events
-            if event.entity_type not in (discord.EntityType.voice, discord.EntityType.stage_instance):
-                continue
-
-            # Auto-start scheduled events
-            if (
-                event.status == discord.EventStatus.scheduled
-                and event.start_time is not None
-                and event.id not in started_event_ids
-                and now >= (event.start_time - EVENT_START_GRACE)
-            ):
-                await event.start()
-                started_event_ids.add(event.id)
-                print(f"▶️ Auto-started event: {event.name}")
-
-            # Auto-end active events
-            if (
-                event.status == discord.EventStatus.active
-                and event.end_time is not None
-                and event.id not in ended_event_ids
-                and now >= (event.end_time - EVENT_END_GRACE)
-            ):
-                await event.end()
-                ended_event_ids.add(event.id)
-                print(f"⏹️ Auto-ended event: {event.name}")
-
-            # If there is no end_time, skip ending
+            await JOBS[name]()
+            print(f"✅ Job {name} finished in {time.monotonic() - t0:.1f}s")
         except Exception as e:
-            print(f"⚠️ Could not update event status for {event.name}: {e}")
+            outcome = "error"
+            print(f"⚠️ Job {name} failed: {e}")
+        metrics.inc("job_runs_total", job=name, outcome=outcome)
+        metrics.observe("job_duration_seconds", time.monotonic() - t0, job=name)
 
-    # cleanup sets for ended events
-    for event in events:
-        if event.status == discord.EventStatus.ended:
-            reminded_event_ids.discard(event.id)
-            started_event_ids.discard(event.id)
-            ended_event_ids.discard(event.id)
+
+@tasks.loop()
+async def scheduled_jobs_loop():
+    """Start each job at its cron time; jobs run in the background so one slow job doesn't delay the others."""
+    job_timers.changed.clear()
+    t0 = time.perf_counter()
+    now = discord.utils.utcnow()
+    for name in job_timers.pop_due(now):
+        run_in_background(run_job(name))
+        job_timers.push(name, CronSchedule(JOB_SCHEDULES[name]).next_after(now, JOB_TIMEZONE))
+    metrics.observe("loop_duration_seconds", time.perf_counter() - t0, loop="jobs")
+    await job_timers.wait(JOB_TIMER_MAX_SLEEP)
 
 
-@voice_event_status_loop.before_loop
-async def before_voice_event_status_loop():
+@scheduled_jobs_loop.before_loop
+async def before_scheduled_jobs_loop():
     await bot.wait_until_ready()
 
 
+# ============================================================
+#                         METRICS
+# ============================================================
+
+def register_gauges():
+    """Gauges read live state at scrape time, so they cost nothing between scrapes."""
+    metrics.gauge("gateway_latency_seconds", "Heartbeat latency of the gateway connection", lambda: bot.latency)
+    metrics.gauge("guilds", "Guilds the bot is in", lambda: len(bot.guilds))
+    metrics.gauge("cached_members", "Members in the member cache",
+                  lambda: sum(len(g.members) for g in bot.guilds))
+    metrics.gauge("cached_users", "Users in the user cache", lambda: len(bot.users))
+    metrics.gauge("scheduled_events_cached", "Scheduled events in the gateway-fed cache",
+                  lambda: len(scheduled_events))
+    metrics.gauge("voice_users_tracked", "Members tracked for voice idle/total limits",
+                  lambda: len(voice_join_times))
+    metrics.gauge("timers_pending", "Pending deadlines per timer heap", lambda: {
+        (("timer", t.name),): len(t) for t in (voice_deadlines, event_timers, job_timers)
+    })
+    metrics.gauge("outgoing_messages_queued", "Messages waiting in the send queue",
+                  lambda: outgoing_messages.qsize())
+    metrics.gauge("jobs_running", "Scheduled jobs currently running",
+                  lambda: sum(1 for lock in job_locks.values() if lock.locked()))
+
+
+@tasks.loop()
+async def event_loop_lag_probe():
+    t0 = time.perf_counter()
+    await asyncio.sleep(1)
+    metrics.observe("event_loop_lag_seconds", max(0.0, time.perf_counter() - t0 - 1))
+
+
+# ============================================================
+#                     PERSISTED STATE
+# ============================================================
+
+def save_state():
+    """Write event ids and voice join times to STATE_FILE (atomically)."""
+    if not state_loaded:
+        return  # never loaded (login failed, or just imported): don't clobber the file with empty sets
+    state = {
+        "reminded_event_ids": sorted(reminded_event_ids),
+        "started_event_ids": sorted(started_event_ids),
+        "ended_event_ids": sorted(ended_event_ids),
+        "voice_join_times": {f"{g}:{m}": t.isoformat() for (g, m), t in voice_join_times.items()},
+    }
+    tmp = STATE_FILE + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=1)
+        os.replace(tmp, STATE_FILE)
+    except OSError as e:
+        print(f"⚠️ Could not save bot state: {e}")
+
+
+def load_state():
+    if not os.path.exists(STATE_FILE):
+        return
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not load bot state: {e}")
+        return
+    reminded_event_ids.update(state.get("reminded_event_ids", []))
+    started_event_ids.update(state.get("started_event_ids", []))
+    ended_event_ids.update(state.get("ended_event_ids", []))
+    for key, when in state.get("voice_join_times", {}).items():
+        guild_id, member_id = key.split(":")
+        voice_join_times.setdefault((int(guild_id), int(member_id)), datetime.fromisoformat(when))
+    print(f"📂 Loaded bot state from {STATE_FILE}")
+
+
+def prune_state():
+    """Drop ids of events that no longer exist and join times of members no longer in voice."""
+    for ids in (reminded_event_ids, started_event_ids, ended_event_ids):
+        ids.intersection_update(scheduled_events)
+    for key in list(voice_join_times):
+        if key not in voice_deadlines.due:
+            voice_join_times.pop(key, None)
+
+
+@tasks.loop(minutes=STATE_SAVE_INTERVAL)
+async def save_state_loop():
+    save_state()
+
+
+@save_state_loop.before_loop
+async def before_save_state_loop():
+    await bot.wait_until_ready()
+
+
+atexit.register(save_state)
+
+
 # ============================================================
 #                         RUN BOT
 # ============================================================
@@ -1,120 +1,97 @@
-import os
-import discord
-from discord.ext import commands
+import asyncio
+from bisect import bisect_right
+from itertools import accumulate
 from dotenv import load_dotenv
-from openai import OpenAI
-from datetime import datetime
+from datetime import datetime, date, timedelta
 from dateutil.relativedelta import relativedelta
-import requests
+import aiohttp
+from source.conference_format import format_conference_lines, split_message
+from source.conference_store import ConferenceStore
+from source.discord_rest import WEBHOOK_TIMEOUT, webhook_send
 
 # ---- Config ----
 load_dotenv()
 
-def conference_alerts(today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS):
-
-    TOKEN = os.getenv("popo_token")
-    CONFERENCE_CHANNEL_ID = int(os.getenv("conference_dates_channel"))
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    OPENAI_MODEL = "gpt-5-nano"
-
-    intents = discord.Intents.default()
-    intents.messages = True
-    intents.message_content = True
-    bot = commands.Bot(command_prefix="!", intents=intents)
-
-    client = OpenAI(api_key=OPENAI_API_KEY)
-
-    def webhook_send(content: str):
-        """Send a plain message to Discord via webhook."""
-        if not DISCORD_WEBHOOK_ANNOUNCEMENTS:
-            print("Missing DISCORD_WEBHOOK in environment.")
-            return
-
-        response = requests.post(
-            DISCORD_WEBHOOK_ANNOUNCEMENTS,
-            json={"content": content},
-            timeout=10,  # optional but recommended
-        )
-
-        # Discord webhook success is usually 204 No Content (sometimes 200)
-        if response.status_code not in (200, 204):
-            print(f"Webhook failed: {response.status_code} {response.text}")
-
-
-    async def fetch_latest_conference_messages(channel):
-        """Fetch the most recent message from the conference channel by the bot."""
-        messages = [msg async for msg in channel.history(limit=10)]
-        if not messages:
-            return None
-        # Take the most recent message
-        combined = "\n".join(reversed([msg.content for msg in messages]))
-        # Keep only lines that begin with "[" or "*"
-        filtered_lines = [
-            line for line in combined.splitlines()
-            if line.strip().startswith("[") or line.strip().startswith("*")
-        ]
-
-        return "\n".join(filtered_lines)
-
-    def ask_gpt_for_upcoming(text):
-        """Ask GPT-5-nano to extract conferences with dates in the next month."""
-        today = datetime.today().strftime("%B %d, %Y")
-
-        # Calculate the date one month from now
-        one_month_from_now = (datetime.today() + relativedelta(months=1)).strftime("%B %d, %Y")
-
-        prompt = f"""
-    Here is a list of conferences and their dates (conference dates and submission deadlines):
-    
-    {text}
-    
-    Please return only the conferences that have a conference date or submission deadline
-    between today and 1 month from now. 
-    Today's date is {today}.
-    The date 1 month from now is {one_month_from_now}. 
-    Include the name of the conference and its information without altering the text.
-    If none are upcoming within a month, say 'NA'
-        """
-
-        # return(prompt)
-        resp = client.responses.create(
-            model=OPENAI_MODEL,
-            input=[
-                {"role": "system", "content": "You are an assistant that extracts and formats conference dates."},
-                {"role": "user", "content": prompt}
-            ],
-            service_tier="flex"
-        )
-        return resp.output_text.strip()
-
-
-    @bot.event
-    async def on_ready():
-        # Monday-only guard
-        if not today_is_monday:  # Monday=0
-            print("[i] Not Monday → skipping alert.")
-            await bot.close()
-            return
-
-        print(f"✅ Logged in as {bot.user}")
-        conf_channel = bot.get_channel(CONFERENCE_CHANNEL_ID)
-
-        # Step 1: get latest conference dates message
-        latest_conf_text = await fetch_latest_conference_messages(conf_channel)
-        if not latest_conf_text:
-            # await gen_channel.send("⚠️ Could not fetch latest conference dates.")
-            summary = "Error"
-
-        else:
-            # Step 2: process with GPT
-            summary = ask_gpt_for_upcoming(latest_conf_text)
-        # print(summary)
-
-        # Step 3: send to general channel
-        if summary.strip().upper() != "NA":
-            webhook_send("### :calendar_spiral: Upcoming Conferences and Deadlines in the next 1 month\n" + summary)
-
-        await bot.close()
-
-    # Run!
-    bot.run(TOKEN)
+
+def parse_iso_date(value):
+    """'YYYY-MM-DD' → date, anything else ("unknown", "Closed", "") → None."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+class ConferenceIntervalIndex:
+    """
+    Conference dates and submission deadlines as [start, end] intervals, sorted by start.
+    A running max of the end dates lets a window query skip straight to the first
+    interval that can still overlap, and stop at the first one starting after the window.
+    """
+
+    def __init__(self, conference_data):
+        self.category_ranks = {category: i for i, category in enumerate(conference_data)}
+        intervals = []
+        for category, conferences in conference_data.items():
+            for order, conf in enumerate(conferences):
+                start = parse_iso_date(conf.get("start_date"))
+                end = parse_iso_date(conf.get("end_date")) or start
+                if start or end:
+                    intervals.append((start or end, max(end, start or end), category, order, conf))
+                deadline = parse_iso_date(conf.get("submission_deadline"))
+                if deadline:
+                    intervals.append((deadline, deadline, category, order, conf))
+        intervals.sort(key=lambda iv: iv[0])
+        self.intervals = intervals
+        self.starts = [iv[0] for iv in intervals]
+        self.max_ends = list(accumulate((iv[1] for iv in intervals), max))
+
+    def query(self, window_start: date, window_end: date):
+        """Conferences with any date or deadline in [window_start, window_end], in data-file order."""
+        first = bisect_right(self.max_ends, window_start - timedelta(days=1))
+        last = bisect_right(self.starts, window_end)
+        hits = {}
+        for start, end, category, order, conf in self.intervals[first:last]:
+            if end >= window_start:
+                hits[(category, order)] = conf
+        return [hits[k] for k in sorted(hits, key=lambda k: (self.category_ranks[k[0]], k[1]))]
+
+
+def load_latest_conference_data():
+    return ConferenceStore().current()
+
+
+def upcoming_conferences_text(conference_data, today=None, months=1):
+    """Markdown lines for conferences with a date or deadline between today and `months` from now."""
+    today = today or datetime.today().date()
+    index = ConferenceIntervalIndex(conference_data)
+    upcoming = index.query(today, today + relativedelta(months=months))
+    lines = []
+    for conf in upcoming:
+        lines.extend(format_conference_lines(conf))
+    return "\n".join(lines)
+
+
+async def conference_alerts(today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS):
+
+    # Monday-only guard
+    if not today_is_monday:  # Monday=0
+        print("[i] Not Monday → skipping alert.")
+        return
+
+    # Step 1: read the latest conference data
+    data = await asyncio.to_thread(load_latest_conference_data)
+    if not data:
+        print("⚠️ No conference data found in the conference store.")
+        return
+
+    # Step 2: conferences/deadlines within the next month
+    summary = upcoming_conferences_text(data)
+
+    # Step 3: send to announcements
+    if summary:
+        message = "### :calendar_spiral: Upcoming Conferences and Deadlines in the next 1 month\n" + summary
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=WEBHOOK_TIMEOUT)) as session:
+            for chunk in split_message(message):  # in order, so one after another
+                await webhook_send(DISCORD_WEBHOOK_ANNOUNCEMENTS, chunk, session=session)
+    else:
+        print("No conferences or deadlines in the next month.")
@@ -1,25 +1,23 @@
 import os
-import glob
-import discord
-from discord.ext import commands
+import asyncio
 from dotenv import load_dotenv
+from source.discord_rest import DiscordREST
+from source.conference_store import ConferenceStore
+from source.conference_format import convert_to_discord_markdown
 
 # ---- Config ----
 load_dotenv()
 TOKEN = os.getenv("popo_token")
 CHANNEL_ID = int(os.getenv("conference_dates_channel"))
-LOG_FILE = "conference_post_log.txt"  # remembers last posted file
-
-intents = discord.Intents.default()
-bot = commands.Bot(command_prefix="!", intents=intents)
+LOG_FILE = "conference_post_log.txt"  # remembers last posted version
 
 def get_latest_md():
-    """Find the newest .md file in conference_discord/"""
-    files = glob.glob("conference_discord/*.md")
-    if not files:
-        return None
-    latest = max(files, key=os.path.getmtime)
-    return latest
+    """Render the current conference store version. Returns (version label, markdown) or (None, None)."""
+    store = ConferenceStore()
+    data = store.current()
+    if not data:
+        return None, None
+    return f"v{store.current_version()}", convert_to_discord_markdown(data)
 
 def split_by_category(md_text):
     """Split markdown into chunks by ## headers."""
@@ -36,43 +34,34 @@ def split_by_category(md_text):
     return parts
 
 def get_last_posted():
-    """Read last posted file from log file."""
+    """Read last posted version from log file."""
     if not os.path.exists(LOG_FILE):
         return None
     with open(LOG_FILE, "r", encoding="utf-8") as f:
         return f.read().strip()
 
-def save_last_posted(filename):
-    """Save last posted file to log file."""
+def save_last_posted(version):
+    """Save last posted version to log file."""
     with open(LOG_FILE, "w", encoding="utf-8") as f:
-        f.write(filename)
-
-@bot.event
-async def on_ready():
-    print(f"✅ Logged in as {bot.user}")
-
-    channel = bot.get_channel(CHANNEL_ID)
-
-    # 1. Get latest file
-    latest_file = get_latest_md()
-    if not latest_file:
-        print("⚠️ No .md files found in conference_discord/")
-        await bot.close()
+        f.write(version)
+
+async def post_conference_dates(channel, bot_user):
+    """Replace the bot's posts in `channel` with the latest conference version, if not posted yet."""
+    # 1. Get latest version
+    latest_version, md_text = get_latest_md()
+    if not latest_version:
+        print("⚠️ No conference data in the conference store")
         return
 
     # 2. End if info has not changed
     last_posted = get_last_posted()
-    if last_posted == os.path.basename(latest_file):
-        print("Latest file already posted. Skipping.")
-        await bot.close()
+    if last_posted == latest_version:
+        print("Latest version already posted. Skipping.")
         return
 
-    with open(latest_file, "r", encoding="utf-8") as f:
-        md_text = f.read()
-
     # 3. Delete old posts
     async for msg in channel.history(limit=100):
-        if msg.author == bot.user:
+        if msg.author == bot_user:
             await msg.delete()
 
     # 4. Post new info
@@ -81,12 +70,16 @@ async def on_ready():
         if section.strip():
             await channel.send(section)
 
-    save_last_posted(os.path.basename(latest_file))
-    print(f"✅ Posted {latest_file} and updated log.")
-    await bot.close()
+    save_last_posted(latest_version)
+    print(f"✅ Posted conference data {latest_version} and updated log.")
+
+async def main():
+    # REST only, no gateway login
+    async with DiscordREST(TOKEN) as api:
+        await post_conference_dates(await api.fetch_channel(CHANNEL_ID), await api.fetch_current_user())
 
 if __name__ == "__main__":
-    bot.run(TOKEN)
+    asyncio.run(main())
 
 
 
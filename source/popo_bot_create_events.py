@@ -1,100 +1,96 @@
 import os
 import asyncio
 import discord
-from discord.ext import commands
 from dotenv import load_dotenv
-import requests
+import aiohttp
 from ics import Calendar
 from datetime import datetime, timedelta
 import pytz
 import re
+from source.discord_rest import DiscordREST, webhook_send
 
 # ---- Config ----
 load_dotenv()
 TOKEN = os.getenv("popo_token")
 DISCORD_WEBHOOK_ANNOUNCEMENTS = os.getenv("DISCORD_WEBHOOK_ANNOUNCEMENTS")
 
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
-intents.guilds = True
-bot = commands.Bot(command_prefix="!", intents=intents)
 VOICE_CHANNEL_ID = int(os.getenv("VOICE_CHANNEL_ID"))
 WEEKLY_VOICE_EVENT_NAME = "Weekly voice/video chat!"
 WEEKLY_TEXT_EVENT_NAME = "Weekly Text Chat!"
 
 # Currently creates only NCME events
 
-def webhook_send(content: str):
-    """Send a plain message to Discord via webhook (sync)."""
-    if not DISCORD_WEBHOOK_ANNOUNCEMENTS:
-        print("Missing DISCORD_WEBHOOK_ANNOUNCEMENTS in environment.")
-        return
-
-    resp = requests.post(DISCORD_WEBHOOK_ANNOUNCEMENTS, json={"content": content})
-    # Discord webhook success is usually 204 No Content (sometimes 200)
-    if resp.status_code not in (200, 204):
-        print(f"Webhook failed: {resp.status_code} {resp.text}")
-
-# ---- Download NCME ICS ----
-url = "https://ncme.org/ncme-events/list/?ical=1"
-ics_data = requests.get(url).text
-cal = Calendar(ics_data)
+NCME_ICS_URL = "https://ncme.org/ncme-events/list/?ical=1"
+HTTP_TIMEOUT = 20  # seconds per request
 
-# ---- Convert ICS events into Python dicts ----
-events = []
-utc = pytz.utc
-now = datetime.now(tz=utc)
-
-def shorten_url(url):
+async def shorten_url(url, session):
     api = "https://is.gd/create.php"
-    r = requests.get(api, params={"format": "simple", "url": url})
-    if r.status_code == 200:
-        return r.text.strip()
+    try:
+        async with session.get(api, params={"format": "simple", "url": url}) as r:
+            if r.status == 200:
+                return (await r.text()).strip()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Shortening {url} failed: {e!r}")
     return "https://ncme.org/events/webinars/"  # fallback
 
-for e in cal.events:
-    begin = e.begin.to(utc).datetime
-    end = e.end.to(utc).datetime
-
-    # --- 1. Skip events that already ended ---
-    if end < now:
-        continue
-
-    # --- 2. If already started, shift begin time to 15 minutes from now ---
-    if begin < now:
-        begin = now + timedelta(minutes=15)
-
-    # --- 3. Build raw description
-    raw_desc = (e.location or "") + "\n" + (e.description or "")
-    raw_desc = re.sub(r"\n+", "\n", raw_desc)
-    if len(raw_desc) > 997:  # 997 + "..." = 1000
-        raw_desc = raw_desc[:997] + "..."
-
-    # --- 4. Build URL
-    URL = getattr(e, "url", None) or (e.location or "")
-    if len(URL) > 99:
-        URL = shorten_url(URL)
-
-    # --- 5. Build Name
-    clean_name = ''.join(ch for ch in e.name if ch.isprintable()).strip()
-    clean_name = clean_name[:100].strip()
-
-    events.append({
-        "name": clean_name,
-        "begin": begin,
-        "end": end,
-        "description": raw_desc,
-        "url": URL
-    })
+# ---- Download NCME ICS and convert its events into Python dicts ----
+async def load_ncme_events():
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)) as session:
+        async with session.get(NCME_ICS_URL) as resp:
+            resp.raise_for_status()
+            ics_data = await resp.text()
+        cal = await asyncio.to_thread(Calendar, ics_data)  # parsing is CPU-bound
+        events = build_events(cal)
+
+        # --- 4b. Shorten the long URLs, all at once
+        long_urls = [ev for ev in events if len(ev["url"]) > 99]
+        short_urls = await asyncio.gather(*(shorten_url(ev["url"], session) for ev in long_urls))
+        for ev, url in zip(long_urls, short_urls):
+            ev["url"] = url
+    return events
+
+def build_events(cal):
+    """Upcoming events of a parsed ics Calendar as dicts (URLs not shortened yet)."""
+    events = []
+    utc = pytz.utc
+    now = datetime.now(tz=utc)
+
+    for e in cal.events:
+        begin = e.begin.to(utc).datetime
+        end = e.end.to(utc).datetime
+
+        # --- 1. Skip events that already ended ---
+        if end < now:
+            continue
+
+        # --- 2. If already started, shift begin time to 15 minutes from now ---
+        if begin < now:
+            begin = now + timedelta(minutes=15)
+
+        # --- 3. Build raw description
+        raw_desc = (e.location or "") + "\n" + (e.description or "")
+        raw_desc = re.sub(r"\n+", "\n", raw_desc)
+        if len(raw_desc) > 997:  # 997 + "..." = 1000
+            raw_desc = raw_desc[:997] + "..."
+
+        # --- 4. Build URL
+        URL = getattr(e, "url", None) or (e.location or "")  # shortened later if > 99 chars
+
+        # --- 5. Build Name
+        clean_name = ''.join(ch for ch in e.name if ch.isprintable()).strip()
+        clean_name = clean_name[:100].strip()
+
+        events.append({
+            "name": clean_name,
+            "begin": begin,
+            "end": end,
+            "description": raw_desc,
+            "url": URL
+        })
+    return events
 
 # ---- Scheduling Function ----
-async def schedule_events(events):
-    guild = bot.guilds[0] if bot.guilds else None
-    if guild is None:
-        print("No guild found. Bot may not be in the server yet.")
-        return
-
+async def schedule_events(guild, events):
     existing_events = await guild.fetch_scheduled_events()
     existing_by_name = {e.name: e for e in existing_events}
 
@@ -124,7 +120,7 @@ async def schedule_events(events):
                     f"## :date: **New NCME Event!**\n"
                     f"{created.url}"
                 )
-                webhook_send(msg)
+                await webhook_send(DISCORD_WEBHOOK_ANNOUNCEMENTS, msg)
                 await asyncio.sleep(0.3)
                 print("created")
 
@@ -167,15 +163,10 @@ async def schedule_events(events):
                 except Exception as e:
                     print(f"Error updating event {ev['name']}: {e}")
 
-async def schedule_weekly_voice_chat():
+async def schedule_weekly_voice_chat(guild):
     eastern = pytz.timezone("US/Eastern")
     utc = pytz.utc
 
-    guild = bot.guilds[0] if bot.guilds else None
-    if guild is None:
-        print("No guild found. Bot may not be in the server yet.")
-        return
-
     # Don't schedule if an event with the same name already exists
     existing_events = await guild.fetch_scheduled_events()
     if any(ev.name == WEEKLY_VOICE_EVENT_NAME for ev in existing_events):
@@ -211,7 +202,7 @@ async def schedule_weekly_voice_chat():
         image_bytes = f.read()
 
     try:
-        channel = bot.get_channel(VOICE_CHANNEL_ID)
+        channel = guild.get_channel(VOICE_CHANNEL_ID)
         if channel is None:
             channel = await guild.fetch_channel(VOICE_CHANNEL_ID)  # reliable for short-lived scripts
 
@@ -232,7 +223,7 @@ async def schedule_weekly_voice_chat():
             f"## :date: **New Voice Chat Event!**\n"
             f"{created.url}"
         )
-        webhook_send(msg)
+        await webhook_send(DISCORD_WEBHOOK_ANNOUNCEMENTS, msg)
         await asyncio.sleep(0.3)
         print("created Weekly voice chat")
     except Exception as e:
@@ -240,15 +231,10 @@ async def schedule_weekly_voice_chat():
 
 
 
-async def schedule_weekly_text_chat():
+async def schedule_weekly_text_chat(guild):
     eastern = pytz.timezone("US/Eastern")
     utc = pytz.utc
 
-    guild = bot.guilds[0] if bot.guilds else None
-    if guild is None:
-        print("No guild found. Bot may not be in the server yet.")
-        return
-
     # Don't schedule if an event with the same name already exists
     existing_events = await guild.fetch_scheduled_events()
     if any(ev.name == WEEKLY_TEXT_EVENT_NAME for ev in existing_events):
@@ -300,22 +286,29 @@ async def schedule_weekly_text_chat():
             f"## :date: **New Text Chat Event!**\n"
             f"{created.url}"
         )
-        webhook_send(msg)
+        await webhook_send(DISCORD_WEBHOOK_ANNOUNCEMENTS, msg)
         await asyncio.sleep(0.3)
         print("created Weekly Text chat")
     except Exception as e:
         print(f"Error creating weekly text chat: {e}")
 
 
-# ---- Bot Ready ----
-@bot.event
-async def on_ready():
-    print(f"Logged in as {bot.user} (ID: {bot.user.id})")
-    await asyncio.sleep(2)
-    await schedule_events(events)
-    await schedule_weekly_voice_chat()
-    await schedule_weekly_text_chat()
-    await bot.close()
-    print(f"Logged out bot")
+async def create_events(guild):
+    """Sync NCME events and create the weekly chats (also run as a popo_bot scheduled job)."""
+    if guild is None:
+        print("No guild found. Bot may not be in the server yet.")
+        return
+    events = await load_ncme_events()
+    await schedule_events(guild, events)
+    # The two weekly chats don't depend on each other
+    await asyncio.gather(schedule_weekly_voice_chat(guild), schedule_weekly_text_chat(guild))
+
+
+# ---- Run (REST only, no gateway login) ----
+async def main():
+    async with DiscordREST(TOKEN) as api:
+        guilds = await api.fetch_guilds()
+        await create_events(guilds[0] if guilds else None)
 
-bot.run(TOKEN)
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,11 +2,12 @@ import os
 import json
 import asyncio
 import discord
-from discord.ext import commands
+import aiohttp
 from dotenv import load_dotenv
 import feedparser
 import re
 from datetime import datetime
+from source.discord_rest import DiscordREST
 
 # ---------- CONFIG ----------
 load_dotenv()
@@ -15,6 +16,7 @@ TOKEN = os.getenv("popo_token")
 FORUM_CHANNEL_ID = int(os.getenv("position_channel"))
 
 POSTED_FILE = "posted_jobs.json"
+HTTP_TIMEOUT = 20  # seconds per feed download
 
 RSS_FEEDS = {
     "job": "https://ncme.org/?feed=job_feed&job_types&search_location&job_categories=professional-role&search_keywords",
@@ -26,11 +28,6 @@ FORUM_TAG_IDS = {
     "internship": 1447846351156150283,
 }
 
-# ---------- DISCORD ----------
-intents = discord.Intents.default()
-intents.guilds = True
-bot = commands.Bot(command_prefix="!", intents=intents)
-
 # ---------- UTIL ----------
 def load_posted():
     if os.path.exists(POSTED_FILE):
@@ -57,18 +54,23 @@ def clean_text(text, max_len=1900):
     return text[: max_len - 3] + "..." if len(text) > max_len else text
 
 # ---------- RSS ----------
-def fetch_rss(feed_url):
-    return feedparser.parse(feed_url).entries
+async def fetch_rss(feed_url, session):
+    """Download a feed without blocking the loop (feedparser's own fetch has no timeout)."""
+    try:
+        async with session.get(feed_url) as resp:
+            resp.raise_for_status()
+            body = await resp.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Fetching {feed_url} failed: {e!r}")
+        return []
+    return feedparser.parse(body).entries
 
 # ---------- MAIN ----------
-@bot.event
-async def on_ready():
-    print(f"Logged in as {bot.user}")
-
-    forum = bot.get_channel(FORUM_CHANNEL_ID)
-    if not isinstance(forum, discord.ForumChannel):
+async def post_new_positions(forum):
+    """Create a forum thread for every job/internship feed entry not posted yet."""
+    # discord.ForumChannel or a discord_rest.RestChannel of forum type
+    if getattr(forum, "type", None) != discord.ChannelType.forum:
         print("ERROR: Channel is not a forum channel.")
-        await bot.close()
         return
 
     # Map tag_id -> ForumTag object
@@ -77,8 +79,11 @@ async def on_ready():
     posted = load_posted()
     new_posted = set(posted)
 
-    for tag_type, feed_url in RSS_FEEDS.items():
-        entries = fetch_rss(feed_url)
+    # Both feeds download at once; posting below stays sequential
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)) as session:
+        feeds = await asyncio.gather(*(fetch_rss(url, session) for url in RSS_FEEDS.values()))
+
+    for tag_type, entries in zip(RSS_FEEDS, feeds):
         forum_tag = tag_map.get(FORUM_TAG_IDS[tag_type])
 
         if forum_tag is None:
@@ -112,7 +117,12 @@ async def on_ready():
                 print(f"Error posting {title}: {ex}")
 
     save_posted(new_posted)
-    await bot.close()
 
 # ---------- RUN ----------
-bot.run(TOKEN)
+async def main():
+    # REST only, no gateway login
+    async with DiscordREST(TOKEN) as api:
+        await post_new_positions(await api.fetch_channel(FORUM_CHANNEL_ID))
+
+if __name__ == "__main__":
+    asyncio.run(main())
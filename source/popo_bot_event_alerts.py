@@ -1,126 +1,83 @@
 import os
 import asyncio
-import discord
-from discord.ext import commands
 from dotenv import load_dotenv
 from datetime import datetime, timedelta, timezone
 import pytz  # pip install pytz
-import requests
+import aiohttp
+from source.discord_rest import DiscordREST, WEBHOOK_TIMEOUT, webhook_send
 
 
 # ---- Config ----
 load_dotenv()
 
-def event_alerts(today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS, DISCORD_WEBHOOK_GENERAL_EVENT):
-
-    TOKEN = os.getenv("popo_token")
-    intents = discord.Intents.default()
-    intents.message_content = True
-    intents.members = True  # if you want access to member info
-    intents.guilds = True   # always recommended
-    bot = commands.Bot(command_prefix="!", intents=intents)
-
-    def webhook_send(content: str):
-        """Send a plain message to Discord via webhook."""
-        if not DISCORD_WEBHOOK_ANNOUNCEMENTS:
-            print("Missing DISCORD_WEBHOOK in environment.")
-            return
-
-        response = requests.post(
-            DISCORD_WEBHOOK_ANNOUNCEMENTS,
-            json={"content": content},
-            timeout=10  # optional but recommended
+async def send_in_order(webhook_url, messages, session):
+    """Post messages to one webhook one after another, keeping their order."""
+    for content in messages:
+        await webhook_send(webhook_url, content, session=session)
+        await asyncio.sleep(.3)
+
+
+async def send_daily_event_reminders(events, today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS, DISCORD_WEBHOOK_GENERAL_EVENT):
+    """Send today's events (and this week's on Mondays) from a list of Discord scheduled events."""
+    eastern = pytz.timezone("US/Eastern")
+    today_et = datetime.now(eastern).date()
+    this_week_et = (datetime.now(eastern) + timedelta(days=7)).date()
+
+    todays_events = []
+    this_week_events = []
+
+    for event in events:
+        start_et = event.start_time.astimezone(eastern).date()
+        if start_et == today_et:
+            todays_events.append(event)
+        # starting after today, this week
+        elif start_et > today_et and start_et <= this_week_et:
+            this_week_events.append(event)
+
+    if not todays_events and not today_is_monday:
+        print("No Events Today. Today is not Monday")
+        return  # send nothing
+
+    announcements = []
+    general = []
+    if todays_events:
+        print("Events Today")
+        links = [e.url for e in todays_events if hasattr(e, "url")]
+        announcements += ["# :date: **Events Today!**", *links]
+        general += ["# :date: **Events Today!**", *links]
+
+    # Weekly event list sent only on Mondays
+    if this_week_events and today_is_monday:
+        print("Events next week and today is monday")
+        announcements += ["### :date: **Events This Week!**", *(e.url for e in this_week_events if hasattr(e, "url"))]
+
+    # The two channels are independent, so post to both at once
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=WEBHOOK_TIMEOUT)) as session:
+        await asyncio.gather(
+            send_in_order(DISCORD_WEBHOOK_ANNOUNCEMENTS, announcements, session),
+            send_in_order(DISCORD_WEBHOOK_GENERAL_EVENT, general, session),
         )
 
-        # Discord webhook success is usually 204 No Content (sometimes 200)
-        if response.status_code not in (200, 204):
-            print(f"Webhook failed: {response.status_code} {response.text}")
-
-    def webhook_send_general(content: str):
-        """Send a plain message to Discord via webhook."""
-        if not DISCORD_WEBHOOK_GENERAL_EVENT:
-            print("Missing DISCORD_WEBHOOK_GENERAL_EVENT in environment.")
-            return
 
-        response = requests.post(
-            DISCORD_WEBHOOK_GENERAL_EVENT,
-            json={"content": content},
-            timeout=10  # optional but recommended
-        )
+def event_alerts(today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS, DISCORD_WEBHOOK_GENERAL_EVENT):
+    """One-shot run over REST; the resident popo_bot runs send_daily_event_reminders as a job instead."""
 
-        # Discord webhook success is usually 204 No Content (sometimes 200)
-        if response.status_code not in (200, 204):
-            print(f"Webhook failed: {response.status_code} {response.text}")
-
-
-    async def send_daily_event_reminders():
-        """Your function that pulls Discord scheduled events and sends reminders."""
-        # Get the guild
-        guild = bot.guilds[0]
-
-        if guild is None:
-            print("Bot has no access to guild or guild ID is wrong.")
-            return
-
-        # Fetch scheduled events
-        events = await guild.fetch_scheduled_events()
-
-        eastern = pytz.timezone("US/Eastern")
-        today_et = datetime.now(eastern).date()
-        this_week_et = (datetime.now(eastern) + timedelta(days=7)).date()
-
-        todays_events = []
-        this_week_events = []
-
-        for event in events:
-            start_et = event.start_time.astimezone(eastern).date()
-            if start_et == today_et:
-                todays_events.append(event)
-            # starting after today, this week
-            elif start_et > today_et and start_et <= this_week_et:
-                this_week_events.append(event)
-
-        if not todays_events and not today_is_monday:
-            print("No Events Today. Today is not Monday")
-            return  # send nothing
-
-        if todays_events:
-            print("Events Today")
-            await asyncio.sleep(.3)
-            webhook_send("# :date: **Events Today!**")
-            webhook_send_general("# :date: **Events Today!**")
-            for e in todays_events:
-                if hasattr(e, "url"):
-                    event_link = e.url
-                    await asyncio.sleep(.3)
-                    webhook_send(event_link)
-                    webhook_send_general(event_link)
-
-        # Weekly event list sent only on Mondays
-        if this_week_events and today_is_monday:
-            print("Events next week and today is monday")
-            await asyncio.sleep(.3)
-            webhook_send("### :date: **Events This Week!**")
-            for e in this_week_events:
-                if hasattr(e, "url"):
-                    event_link = e.url
-                    await asyncio.sleep(.3)
-                    webhook_send(event_link)
-
-
-    @bot.event
-    async def on_ready():
-        print(f"Logged in as {bot.user} on {datetime.now(pytz.timezone('US/Eastern')).date()}")
-
-        # Wait briefly to ensure guild list is populated
-        await asyncio.sleep(2)
-
-        await send_daily_event_reminders()
-
-        # After sending, safely close the bot so the script exits
-        await bot.close()
-        print(f"Closing bot on {datetime.now(pytz.timezone('US/Eastern')).date()}")
+    TOKEN = os.getenv("popo_token")
 
+    async def run():
+        async with DiscordREST(TOKEN) as api:
+            # Get the guild
+            guilds = await api.fetch_guilds()
+            if not guilds:
+                print("Bot has no access to guild or guild ID is wrong.")
+                return
+
+            # Fetch scheduled events
+            events = await guilds[0].fetch_scheduled_events()
+            await send_daily_event_reminders(
+                events, today_is_monday, DISCORD_WEBHOOK_ANNOUNCEMENTS, DISCORD_WEBHOOK_GENERAL_EVENT
+            )
+
+    print(f"Checking events on {datetime.now(pytz.timezone('US/Eastern')).date()}")
     # Run!
-    bot.run(TOKEN)
-    
\ No newline at end of file
+    asyncio.run(run())
@@ -0,0 +1,146 @@
+"""
+Content-addressed snapshot store for scraped conference pages.
+
+    <root>/index.json                 {key: {"hash": ..., "history": [[hash, iso time], ...]}}
+    <root>/objects/ab/abcdef....gz    gzip'd page text, one file per distinct content
+
+"Unchanged?" is one hash comparison against the index. Identical pages
+(e.g. the same site listed under two URLs) share one object, and each key
+keeps a bounded history; objects no longer referenced are garbage collected.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import glob
+from datetime import datetime, timedelta
+
+MAX_HISTORY = 10            # versions kept per key
+RETENTION = timedelta(days=365)  # older versions are dropped (the latest is always kept)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+class SnapshotStore:
+
+    def __init__(self, root: str):
+        self.root = root
+        self.index_file = os.path.join(root, "index.json")
+        self.objects_dir = os.path.join(root, "objects")
+        self._index = None
+        self._dirty = False
+
+    # ---- index ----
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            os.makedirs(self.objects_dir, exist_ok=True)
+            if os.path.exists(self.index_file):
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            else:
+                self._index = {}
+            self.migrate_legacy()
+        return self._index
+
+    def save(self):
+        """Write the index (atomically) and drop unreferenced objects."""
+        if not self._dirty:
+            return
+        tmp = self.index_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.index_file)
+        self._dirty = False
+        self.gc()
+
+    # ---- objects ----
+    def _object_path(self, h: str) -> str:
+        return os.path.join(self.objects_dir, h[:2], h + ".gz")
+
+    def _write_object(self, h: str, text: str):
+        path = self._object_path(h)
+        if os.path.exists(path):
+            return  # deduplicated
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(path + ".tmp", path)
+
+    def read_object(self, h: str) -> str:
+        with gzip.open(self._object_path(h), "rt", encoding="utf-8") as f:
+            return f.read()
+
+    # ---- public API ----
+    def current_hash(self, key: str):
+        entry = self.index.get(key)
+        return entry["hash"] if entry else None
+
+    def is_unchanged(self, key: str, text: str) -> bool:
+        return self.current_hash(key) == content_hash(text)
+
+    def put(self, key: str, text: str, when: datetime = None) -> bool:
+        """Record `text` as the latest version of `key`. Returns True if it changed."""
+        h = content_hash(text)
+        entry = self.index.setdefault(key, {"hash": None, "history": []})
+        if entry["hash"] == h:
+            return False
+        self._write_object(h, text)
+        when = when or datetime.now()
+        entry["hash"] = h
+        entry["history"].append([h, when.isoformat(timespec="seconds")])
+        self._trim(entry, when)
+        self._dirty = True
+        return True
+
+    def get(self, key: str, version: int = -1):
+        """Text of a stored version (-1 = latest, -2 = previous, ...), or None."""
+        entry = self.index.get(key)
+        if not entry or not entry["history"]:
+            return None
+        try:
+            h = entry["history"][version][0]
+        except IndexError:
+            return None
+        return self.read_object(h)
+
+    def history(self, key: str):
+        """[(hash, datetime), ...] oldest first."""
+        entry = self.index.get(key)
+        if not entry:
+            return []
+        return [(h, datetime.fromisoformat(t)) for h, t in entry["history"]]
+
+    # ---- retention ----
+    def _trim(self, entry: dict, now: datetime):
+        history = entry["history"][-MAX_HISTORY:]
+        cutoff = (now - RETENTION).isoformat(timespec="seconds")
+        entry["history"] = [v for v in history[:-1] if v[1] >= cutoff] + history[-1:]
+
+    def gc(self) -> int:
+        """Delete objects that no history entry references. Returns the number removed."""
+        referenced = {h for entry in self.index.values() for h, _ in entry["history"]}
+        removed = 0
+        for path in glob.glob(os.path.join(self.objects_dir, "*", "*.gz")):
+            if os.path.basename(path)[:-3] not in referenced:
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def migrate_legacy(self):
+        """Import old plain-text <key>.txt snapshots from the root folder, then remove them."""
+        legacy = glob.glob(os.path.join(self.root, "*.txt"))
+        for path in legacy:
+            key = os.path.basename(path)[:-4]
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            if key not in self._index:
+                self.put(key, text, when=datetime.fromtimestamp(os.path.getmtime(path)))
+        if legacy:
+            self.save()
+            for path in legacy:
+                os.remove(path)
+            print(f"[i] Migrated {len(legacy)} legacy snapshot(s) into {self.root}")
@@ -0,0 +1,94 @@
+"""
+Approximate title → link lookup for mapping LLM-emitted source titles back to articles.
+
+Titles are indexed by character trigrams in an inverted index. A lookup only
+walks the postings of the query's few rarest trigrams to collect candidates,
+then scores them with the Dice similarity of their trigram sets, so it stays
+sub-millisecond with thousands of titles.
+"""
+
+import re
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Tuple
+
+GRAM_SIZE = 3
+DEFAULT_THRESHOLD = 0.7  # Dice similarity of trigram sets
+CANDIDATE_GRAMS = 8      # rarest query trigrams used to collect candidates
+
+_non_alnum = re.compile(r"[^0-9a-z]+")
+
+
+def clean_title(title: str) -> str:
+    """Lowercase, punctuation → single spaces."""
+    return _non_alnum.sub(" ", title.lower()).strip()
+
+
+def trigrams(text: str) -> frozenset:
+    padded = f" {text} "
+    return frozenset(padded[i:i + GRAM_SIZE] for i in range(len(padded) - GRAM_SIZE + 1))
+
+
+def title_variants(title: str) -> List[str]:
+    """The full title, plus the headline without a trailing " - Publisher" (Google News style)."""
+    variants = [title]
+    head, sep, _ = title.rpartition(" - ")
+    if sep and head.strip():
+        variants.append(head.strip())
+    return variants
+
+
+class TitleIndex:
+    """Exact + fuzzy lookup from a (possibly edited) title to an article link."""
+
+    def __init__(self, items: List[Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.exact: Dict[str, int] = {}
+        self.links: List[str] = []
+        self.grams: List[frozenset] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+
+        for it in items:
+            title, link = it.get("title"), it.get("link")
+            if not title or not link:
+                continue
+            for variant in title_variants(title):
+                key = clean_title(variant)
+                if not key or key in self.exact:
+                    continue
+                doc_id = len(self.links)
+                self.exact[key] = doc_id
+                self.links.append(link)
+                grams = trigrams(key)
+                self.grams.append(grams)
+                for g in grams:
+                    self.postings[g].append(doc_id)
+
+    def __len__(self):
+        return len(self.links)
+
+    def lookup(self, title: str) -> Tuple[Optional[str], float]:
+        """Return (link, similarity) of the best match, or (None, best score) below the threshold."""
+        key = clean_title(title)
+        if not key:
+            return None, 0.0
+        doc_id = self.exact.get(key)
+        if doc_id is not None:
+            return self.links[doc_id], 1.0
+
+        q = trigrams(key)
+        # Rare trigrams identify a title; common ones ("the", "ing") would only add noise
+        ranked = sorted((len(self.postings[g]), g) for g in q if g in self.postings)
+        candidates = set()
+        for _, g in ranked[:CANDIDATE_GRAMS]:
+            candidates.update(self.postings[g])
+
+        best_id, best_score = None, 0.0
+        for doc_id in candidates:
+            d = self.grams[doc_id]
+            score = 2 * len(q & d) / (len(q) + len(d))
+            if score > best_score:
+                best_id, best_score = doc_id, score
+
+        if best_id is not None and best_score >= self.threshold:
+            return self.links[best_id], best_score
+        return None, best_score
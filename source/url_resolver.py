@@ -0,0 +1,163 @@
+"""
+Resolve Google News redirect links to real publisher URLs.
+
+Links are expanded concurrently on a bounded thread pool with a per-host
+limit, and every resolved target goes into a persistent SQLite cache, so an
+article is resolved once across all runs. Links that could not be resolved are
+cached too (as an empty target) and only retried after FAILED_RETRY_AFTER.
+Pass `fetch=` (e.g. from make_standin_fetch) to run without the network.
+"""
+
+import re
+import base64
+import sqlite3
+import threading
+import time
+import urllib.parse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+import requests
+
+RESOLVED_DB_FILE = "resolved_links.sqlite"
+MAX_WORKERS = 16
+PER_HOST_LIMIT = 4
+HTTP_TIMEOUT = 10
+FAILED_RETRY_AFTER = 3 * 24 * 3600  # seconds before an unresolvable link is tried again
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 " +
+                  "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
+}
+REDIRECT_HOSTS = {"news.google.com"}
+
+_href_attr = re.compile(r'data-n-au="([^"]+)"|<a[^>]+href="(https?://(?!news\.google\.com)[^"]+)"')
+_url_in_bytes = re.compile(rb"https?://[\x21-\x7e]+")
+
+
+def needs_resolving(url: str) -> bool:
+    return urllib.parse.urlsplit(url).hostname in REDIRECT_HOSTS
+
+
+def decode_article_id(url: str) -> Optional[str]:
+    """Older Google News article ids (CBMi…) are base64 protobufs that embed the target URL."""
+    path = urllib.parse.urlsplit(url).path
+    article_id = path.rsplit("/", 1)[-1]
+    try:
+        raw = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+    except Exception:
+        return None
+    m = _url_in_bytes.search(raw)
+    return m.group(0).decode("ascii") if m else None
+
+
+def http_fetch(url: str, session: requests.Session = None) -> Optional[str]:
+    """Follow redirects (HEAD, then GET for JS/HTML redirect pages). None if unresolved."""
+    session = session or requests
+    resp = session.head(url, headers=HEADERS, allow_redirects=True, timeout=HTTP_TIMEOUT)
+    if not needs_resolving(resp.url):
+        return resp.url
+
+    decoded = decode_article_id(url)
+    if decoded:
+        return decoded
+
+    resp = session.get(url, headers=HEADERS, allow_redirects=True, timeout=HTTP_TIMEOUT)
+    if not needs_resolving(resp.url):
+        return resp.url
+    m = _href_attr.search(resp.text)
+    if m:
+        return m.group(1) or m.group(2)
+    return None
+
+
+def make_standin_fetch(mapping: Dict[str, str], delay: float = 0.0) -> Callable[[str], Optional[str]]:
+    """Fetch function backed by a dict, for dry runs and tests."""
+    def fetch(url: str) -> Optional[str]:
+        time.sleep(delay)
+        return mapping.get(url)
+    return fetch
+
+
+class LinkResolver:
+    """Concurrent, cached redirect resolution."""
+
+    def __init__(self, path: str = RESOLVED_DB_FILE, fetch: Callable[[str], Optional[str]] = None,
+                 max_workers: int = MAX_WORKERS, per_host_limit: int = PER_HOST_LIMIT):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS links (url TEXT PRIMARY KEY, final TEXT NOT NULL, resolved REAL NOT NULL)"
+        )
+        self.lock = threading.Lock()
+        self.max_workers = max_workers
+        self.host_slots = defaultdict(lambda: threading.BoundedSemaphore(per_host_limit))
+        self.host_slots_lock = threading.Lock()
+        if fetch is None:
+            session = requests.Session()
+            fetch = lambda url: http_fetch(url, session)
+        self.fetch = fetch
+
+    def close(self):
+        self.conn.close()
+
+    def cached(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Cached targets; recent failures map to the URL itself, expired ones are left out."""
+        urls = list(urls)
+        found = {}
+        retry_before = time.time() - FAILED_RETRY_AFTER
+        with self.lock:
+            # Chunked IN (...) lookups stay under SQLite's parameter limit
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for url, final, resolved in self.conn.execute(
+                    f"SELECT url, final, resolved FROM links WHERE url IN ({marks})", chunk
+                ):
+                    if final:
+                        found[url] = final
+                    elif resolved > retry_before:
+                        found[url] = url
+        return found
+
+    def _slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urllib.parse.urlsplit(url).hostname or ""
+        with self.host_slots_lock:
+            return self.host_slots[host]
+
+    def _resolve_one(self, url: str) -> Optional[str]:
+        with self._slot(url):
+            try:
+                return self.fetch(url)
+            except Exception as e:
+                print(f"[warn] Could not resolve {url}: {e}")
+                return None
+
+    def resolve(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Map each redirect URL to its final destination (unresolved URLs map to themselves)."""
+        urls = list(dict.fromkeys(u for u in urls if u))
+        pending = [u for u in urls if needs_resolving(u)]
+        result = {u: u for u in urls}
+        found = self.cached(pending)
+        result.update(found)
+        todo = [u for u in pending if u not in found]
+        if not todo:
+            return result
+
+        t0 = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            finals = list(pool.map(self._resolve_one, todo))
+
+        now = time.time()
+        rows = [(u, f or "", now) for u, f in zip(todo, finals)]  # "" = failed, retried after FAILED_RETRY_AFTER
+        with self.lock:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO links (url, final, resolved) VALUES (?, ?, ?)", rows
+                )
+        resolved = 0
+        for u, f in zip(todo, finals):
+            if f:
+                result[u] = f
+                resolved += 1
+        print(f"[i] resolved {resolved}/{len(todo)} new link(s) in {time.time() - t0:.1f}s "
+              f"({len(found)} cached)")
+        return result
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+import pytest
+
+from source import conference_dates_to_discord
+from source.conference_dates_to_discord import (
+    POLL_MAX_DAYS, POLL_UNKNOWN_MAX_DAYS, DeadPage, PollScheduler, check_dead,
+)
+
+
+def response(url, history=()):
+    return SimpleNamespace(status_code=200, url=url, history=list(history))
+
+
+@pytest.mark.parametrize("url", ["https://conf.org/index.html", "https://conf.org/home/"])
+def test_page_served_at_homepage_path_is_live(url):
+    check_dead(url, response(url))
+    check_dead(url, response(url, history=["http→https"]))
+
+
+def test_redirect_to_homepage_is_dead():
+    with pytest.raises(DeadPage):
+        check_dead("https://conf.org/2027/", response("https://conf.org/", history=["301"]))
+
+
+class NoHistory:
+    def history(self, key):
+        return []
+
+
+def test_poll_interval_is_short_when_no_future_date_is_known(tmp_path):
+    scheduler = PollScheduler(str(tmp_path / "poll_schedule.json"), store=NoHistory())
+    scheduler.state["key"] = {"backoff_days": POLL_MAX_DAYS}
+    past_edition = {"start_date": "2020-04-01", "submission_deadline": "unknown"}
+    assert scheduler.interval_days("key", past_edition) == POLL_UNKNOWN_MAX_DAYS
+
+
+def test_gpt_results_for_same_named_conferences_stay_apart(monkeypatch):
+    monkeypatch.setattr(conference_dates_to_discord, "call_gpt", lambda info, system, prompt: {"location": prompt})
+    jobs = {("Meetings", 0, "Summit"): ({}, "", "Paris"), ("Meetings", 1, "Summit"): ({}, "", "Oslo")}
+    results = conference_dates_to_discord.run_gpt_jobs(jobs, max_workers=2)
+    assert results == {("Meetings", 0, "Summit"): {"location": "Paris"}, ("Meetings", 1, "Summit"): {"location": "Oslo"}}
@@ -0,0 +1,16 @@
+from datetime import date
+
+from source.conference_extractor import extract_conference_fields, find_locations
+
+
+def test_country_location_does_not_swallow_lowercase_words():
+    text = "The 2027 conference will be held in Lisbon, Portugal on 8-11 June 2027."
+    assert [loc for _, loc in find_locations(text)] == ["Lisbon, Portugal"]
+
+    fields, _ = extract_conference_fields([text], [2027], {}, today=date(2026, 10, 1))
+    assert fields["location"] == "Lisbon, Portugal"
+    assert (fields["start_date"], fields["end_date"]) == ("2027-06-08", "2027-06-11")
+
+
+def test_country_name_is_case_insensitive():
+    assert [loc for _, loc in find_locations("Join us in Paris, FRANCE.")] == ["Paris, France"]
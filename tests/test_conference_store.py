@@ -0,0 +1,41 @@
+import json
+
+from source.conference_store import ConferenceStore
+
+
+def write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_import_commits_new_and_edited_files(tmp_path):
+    data_dir = tmp_path / "conference_data"
+    data_dir.mkdir()
+    pattern = str(data_dir / "20*.json")
+    store = ConferenceStore(str(tmp_path / "store"))
+
+    write(data_dir / "2026_01_01.json", {"Meetings": [{"name": "NCME", "location": "unknown"}]})
+    assert store.import_files(pattern) == 1
+    assert store.import_files(pattern) == 1  # nothing new
+
+    # Edit workflow: export the current version, change it, import it
+    path = store.export(pattern, date="2026_02_01")
+    edited = json.load(open(path, encoding="utf-8"))
+    edited["Meetings"].append({"name": "IMPS", "location": "Lisbon, Portugal"})
+    write(data_dir / "2026_02_01.json", edited)
+
+    assert store.import_files(pattern) == 2
+    assert store.current() == edited
+    assert store._replay(2) == edited
+    assert store.as_of(1) == {"Meetings": [{"name": "NCME", "location": "unknown"}]}
+
+
+def test_store_from_before_import_tracking_is_not_reimported(tmp_path):
+    data_dir = tmp_path / "conference_data"
+    data_dir.mkdir()
+    pattern = str(data_dir / "20*.json")
+    write(data_dir / "2025_01_01.json", {"Meetings": [{"name": "Old"}]})
+    store = ConferenceStore(str(tmp_path / "store"))
+    store.commit({"Meetings": [{"name": "Crawled"}]})
+
+    assert store.import_files(pattern) == 1
+    assert store.current() == {"Meetings": [{"name": "Crawled"}]}
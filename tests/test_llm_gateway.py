@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+import pytest
+
+from source import llm_gateway
+
+
+class BadRequestError(Exception):
+    """Same class name as openai.BadRequestError, which is all the gateway looks at."""
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_gateway, "LLM_CACHE_FILE", str(tmp_path / "llm_cache.sqlite"))
+    monkeypatch.setattr(llm_gateway, "_cache_conn", None)
+    monkeypatch.setattr(llm_gateway.time, "sleep", lambda s: None)
+
+
+def test_bad_request_is_not_retried(monkeypatch):
+    calls = []
+
+    def create(api, model, system, prompt, tier, timeout):
+        calls.append(tier)
+        raise BadRequestError("context too long")
+
+    monkeypatch.setattr(llm_gateway, "_create", create)
+    with pytest.raises(llm_gateway.LLMError):
+        llm_gateway.complete("test", "model", "system", "prompt", api="chat", deadline=5)
+    assert calls == ["flex"]
+
+
+def test_empty_reply_is_not_cached(monkeypatch):
+    replies = iter(["", "answer"])
+
+    def create(api, model, system, prompt, tier, timeout):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=next(replies)))], usage=None)
+
+    monkeypatch.setattr(llm_gateway, "_create", create)
+    assert llm_gateway.complete("test", "model", "system", "prompt", api="chat") == ""
+    assert llm_gateway.complete("test", "model", "system", "prompt", api="chat") == "answer"
+    assert llm_gateway.complete("test", "model", "system", "prompt", api="chat") == "answer"
+
+
+def test_expired_rows_are_pruned_when_the_cache_opens(monkeypatch):
+    llm_gateway.cache_put("old", "stale")
+    llm_gateway.cache_put("new", "fresh")
+    conn = llm_gateway._cache()
+    with conn:
+        conn.execute("UPDATE responses SET created = ? WHERE key = 'old'", (0,))
+    conn.close()
+
+    monkeypatch.setattr(llm_gateway, "_cache_conn", None)
+    rows = llm_gateway._cache().execute("SELECT key FROM responses").fetchall()
+    assert rows == [("new",)]
@@ -0,0 +1,37 @@
+import os
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+BOT_ENV = {
+    "popo_token": "test",
+    "share_your_work_channel": "1",
+    "introduce_yourself_channel": "2",
+    "welcome_channel": "3",
+    "general_channel": "4",
+    "daily_research_channel": "5",
+    "announcement_channel": "6",
+}
+
+
+def test_import_leaves_state_file_alone(tmp_path):
+    state_file = tmp_path / "popo_bot_state.json"
+    state = {
+        "reminded_event_ids": [123],
+        "started_event_ids": [],
+        "ended_event_ids": [],
+        "voice_join_times": {"10:20": "2026-01-01T12:00:00+00:00"},
+    }
+    state_file.write_text(json.dumps(state), encoding="utf-8")
+    before = state_file.read_bytes()
+
+    # atexit hooks only run when the interpreter exits, so import in a child process
+    env = {**os.environ, **BOT_ENV, "POPO_STATE_FILE": str(state_file)}
+    result = subprocess.run([sys.executable, "-c", "import source.popo_bot"], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert state_file.read_bytes() == before
@@ -0,0 +1,27 @@
+from source.title_index import TitleIndex
+
+ITEMS = [
+    {"title": "States Rethink Standardized Testing After Pandemic - The Times", "link": "https://a.example/1"},
+    {"title": "New Psychometric Model Improves Adaptive Tests", "link": "https://a.example/2"},
+    {"title": "College Board Announces Digital SAT Changes", "link": "https://a.example/3"},
+]
+
+
+def test_exact_match_ignores_case_punctuation_and_publisher():
+    index = TitleIndex(ITEMS)
+    assert index.lookup("states rethink standardized testing after pandemic!") == ("https://a.example/1", 1.0)
+    assert index.lookup(ITEMS[2]["title"]) == ("https://a.example/3", 1.0)
+
+
+def test_fuzzy_match_above_threshold():
+    index = TitleIndex(ITEMS)
+    link, score = index.lookup("New Psychometric Model Improves Adaptive Testing")
+    assert link == "https://a.example/2"
+    assert 0.7 <= score < 1.0
+
+
+def test_miss_below_threshold():
+    index = TitleIndex(ITEMS)
+    link, score = index.lookup("New Adaptive Model for Reading Tests")
+    assert link is None
+    assert score < 0.7
@@ -0,0 +1,43 @@
+from source import url_resolver
+from source.url_resolver import LinkResolver, make_standin_fetch
+
+GOOD = "https://news.google.com/rss/articles/good"
+BAD = "https://news.google.com/rss/articles/bad"
+PLAIN = "https://example.org/story"
+
+
+def counting_fetch(calls):
+    fetch = make_standin_fetch({GOOD: "https://publisher.org/story"})
+
+    def counted(url):
+        calls.append(url)
+        return fetch(url)
+    return counted
+
+
+def test_links_are_resolved_once_across_resolvers(tmp_path):
+    db = str(tmp_path / "resolved_links.sqlite")
+    calls = []
+
+    first = LinkResolver(db, fetch=counting_fetch(calls))
+    assert first.resolve([GOOD, BAD, PLAIN]) == {GOOD: "https://publisher.org/story", BAD: BAD, PLAIN: PLAIN}
+    first.close()
+    assert sorted(calls) == [BAD, GOOD]
+
+    # A new run: both the success and the failure come from the cache
+    second = LinkResolver(db, fetch=counting_fetch(calls))
+    assert second.resolve([GOOD, BAD]) == {GOOD: "https://publisher.org/story", BAD: BAD}
+    second.close()
+    assert sorted(calls) == [BAD, GOOD]
+
+
+def test_failures_are_retried_after_expiry(tmp_path, monkeypatch):
+    db = str(tmp_path / "resolved_links.sqlite")
+    calls = []
+    resolver = LinkResolver(db, fetch=counting_fetch(calls))
+    resolver.resolve([BAD])
+
+    monkeypatch.setattr(url_resolver, "FAILED_RETRY_AFTER", -1)
+    resolver.resolve([BAD])
+    resolver.close()
+    assert calls == [BAD, BAD]